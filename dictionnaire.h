@@ -0,0 +1,147 @@
+// Dictionnaire de compression des histoires (voir fabrique/dictionnaire.py)
+// Généré par python histoires.py --dictionnaire : ne pas modifier à la main,
+// mais le régénérer quand la grammaire change
+
+const unsigned int idDictionnaire = 0x5884;
+const byte nbMots = 126;
+
+const char texteMots[] PROGMEM =
+    ". Un jour,"
+    "C'est l'histoire"
+    "Dans une galaxie lointaine, tres lointaine, il existait"
+    " elles"
+    " qui"
+    ", et"
+    "Il y a fort longtemps, il etait"
+    " avaient"
+    " aiguilles a tricoter"
+    "Au temps jadis, il y avait"
+    " ils"
+    " une"
+    " ornithorynques"
+    "Autrefois, il etait"
+    " des"
+    " elle"
+    "Jadis, il y avait"
+    " de"
+    " amphigouris"
+    " y laisserent leurs"
+    " echalas"
+    " etourneaux"
+    " aubergines"
+    " aiguille a tricoter"
+    "Il etait une fois"
+    " entre quatre planches"
+    "C'est l'histoire d'"
+    " pousserent leur dernier rale"
+    " un"
+    " avait"
+    " patibulaires"
+    " aphelies"
+    " partirent les pieds devant"
+    " passerent l'arme a gauche"
+    " quarante-douze"
+    " enzymes"
+    " taciturnes"
+    " ornithorynque"
+    " cent dix-huit"
+    " quarante-deux"
+    " il"
+    " ressemblerent"
+    " trouze mille"
+    " accoucherent"
+    " casserent leur pipe"
+    " patibulaire"
+    " desobeirent"
+    " survecurent"
+    " allerent ad padres"
+    " pauvres"
+    " simples"
+    " amphigouri"
+    " heriterent"
+    " s'ablutionnerent"
+    " branquignols"
+    " topinambours"
+    " derelictions"
+    " ratatouilles"
+    " tristes"
+    " aubergine"
+    " etourneau"
+    " taciturne"
+    " vingt-six"
+    " desenchanterent"
+    " rendirent l'ame"
+    " aux"
+    " coquelicots"
+    " baguenauderent"
+    " glouglouterent"
+    " lantiponnerent"
+    " curieux"
+    " quatorze"
+    " reverent"
+    " cassoulets"
+    " varicelles"
+    " meteorites"
+    " soliloquerent"
+    " s'eteignirent"
+    " abasourdies"
+    " aphelie"
+    " flagornerent"
+    " persiflerent"
+    " y laissa ses"
+    " houseaux"
+    " calancherent"
+    " succomberent"
+    " trepasserent"
+    " cachalots"
+    " parpaings"
+    " tabourets"
+    " lentilles"
+    " mangroves"
+    " pauvre"
+    " simple"
+    " desobeissaient"
+    " nouvelles"
+    " ressemble"
+    " abasourdis"
+    " partit les pieds devant"
+    " poussa son dernier rale"
+    " ressemblaient"
+    " pleutres"
+    " melopees"
+    " syzygies"
+    " passa l'arme a gauche"
+    " guetres"
+    " enzyme"
+    " triste"
+    " treize"
+    " nouveaux"
+    " curieuses"
+    " bleuterent"
+    ", et elles"
+    ", et ils"
+    " accouchaient"
+    " accouche"
+    ". Un jour, elles"
+    ". Un jour, ils"
+    " clamserent"
+    " claquerent"
+    " sortirent entre quatre planches"
+    " d'"
+    " a"
+    " topinambour"
+    " branquignol"
+    " dereliction";
+const unsigned int debutsMots[] PROGMEM = {
+    0, 10, 26, 81, 87, 91, 95, 126, 134, 155, 181, 185,
+    189, 204, 223, 227, 232, 249, 252, 264, 283, 291, 302, 313,
+    333, 350, 372, 391, 420, 423, 429, 442, 451, 478, 504, 519,
+    527, 538, 552, 566, 580, 583, 597, 610, 623, 643, 655, 667,
+    679, 698, 706, 714, 725, 736, 753, 766, 779, 792, 805, 813,
+    823, 833, 843, 853, 869, 885, 889, 901, 916, 931, 946, 954,
+    963, 972, 983, 994, 1005, 1019, 1033, 1045, 1053, 1066, 1079, 1092,
+    1101, 1114, 1127, 1140, 1150, 1160, 1170, 1180, 1190, 1197, 1204, 1219,
+    1229, 1239, 1250, 1274, 1298, 1312, 1321, 1330, 1339, 1361, 1369, 1376,
+    1383, 1390, 1399, 1409, 1420, 1430, 1438, 1451, 1460, 1476, 1490, 1501,
+    1512, 1544, 1547, 1549, 1561, 1573, 1585,
+};
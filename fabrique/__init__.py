@@ -0,0 +1,62 @@
+# coding: utf-8
+
+"""
+La Petite Fabrique a histoires
+Génération d'histoires très courtes affichées sur une écran relié à une Arduino
+
+L'import du paquet n'ouvre aucun port et ne lit pas la ligne de commande.
+Les sous-modules ne sont chargés qu'à la première utilisation d'un de leurs
+noms, et la grammaire n'est compilée qu'à la première histoire demandée :
+import fabrique puis fabrique.lancement() ne coûtent que quelques
+millisecondes. La ligne de commande est dans fabrique.cli (python -m
+fabrique ou python histoires.py).
+"""
+
+import importlib
+
+# Nom public -> sous-module qui le définit
+_EXPORTS = {
+    "HISTOIRES": "grammaire",
+    "GrammaireCompilee": "moteur",
+    "choisir_grammaire": "moteur",
+    "corrections": "moteur",
+    "generation": "moteur",
+    "grammaire_compilee": "moteur",
+    "grammaire_source": "moteur",
+    "installer_grammaire": "moteur",
+    "installer_profil": "moteur",
+    "lancement": "moteur",
+    "denombrement": "lot",
+    "ecrire_lot": "lot",
+    "generer_lot": "lot",
+    "generer_tranche": "lot",
+    "EmpreintesExactes": "uniques",
+    "FiltreBloom": "uniques",
+    "HistoiresUniques": "uniques",
+    "ecrire_uniques": "uniques",
+    "empreinte": "uniques",
+    "ReserveHistoires": "reserve",
+    "AnalyseGrammaire": "analyse",
+    "convertir_lcd": "ecran",
+    "trames": "ecran",
+    "Dictionnaire": "dictionnaire",
+    "deriver_dictionnaire": "dictionnaire",
+    "charger_grammaire": "chargement",
+    "ecrire_grammaire": "chargement",
+    "SurveillanceGrammaire": "surveillance",
+    "Profil": "profilage",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(nom):
+    if nom not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nom!r}")
+    valeur = getattr(importlib.import_module(f".{_EXPORTS[nom]}", __name__), nom)
+    globals()[nom] = valeur
+    return valeur
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,11 @@
+# coding: utf-8
+
+"""
+Lancement par python -m fabrique
+"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,435 @@
+# coding: utf-8
+
+"""
+Analyse statique d'une grammaire
+
+L'analyse parcourt la grammaire une seule fois, avant toute génération, et
+relève ce qui ne se verrait sinon qu'à l'usage, sous forme d'histoires
+bizarres ou d'erreurs au milieu d'une session :
+- règles inaccessibles depuis la racine ;
+- références à des règles qui n'existent pas (textes écrits comme des noms
+  de règles, en majuscules avec des soulignés) ;
+- cycles de règles, qui rendent les histoires infiniment longues ;
+- alternatives vides, et modèles qui peuvent produire une histoire vide ;
+- chaînes collées faute de virgule dans le source Python de la grammaire ;
+- longueurs minimale et maximale des histoires, en octets, après les
+  corrections typographiques.
+
+Les longueurs sont gardées dans la grammaire compilée (et son cache) : la
+génération s'en sert sans les recalculer.
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import re
+
+# Texte écrit comme un nom de règle (INTRO_GEN, SN_SNG_MASC...)
+_NOM_REGLE = re.compile(r"[A-Z][A-Z0-9]*(?:_[A-Z0-9]+)+")
+
+
+# Moulinettes
+# ==============================================================================
+
+# Longueurs des textes produits
+# ------------------------------------------------------------------------------
+
+# Les longueurs d'un noeud sont décrites par un couple (vide, etats) :
+# - vide indique si le noeud peut ne rien produire ;
+# - etats associe à (debut_colle, fin_collee) les longueurs minimale et
+#   maximale des textes non vides, en octets. Un texte dont le début est
+#   collé commence par une virgule ou un point ; un texte dont la fin est
+#   collée finit par une apostrophe. corrections() retire l'espace placée
+#   entre deux textes quand l'un ou l'autre est collé.
+
+_VIDE = (True, {})
+
+
+def _fusion(etats, etat, minimum, maximum):
+    if etat in etats:
+        ancien_min, ancien_max = etats[etat]
+        etats[etat] = (min(ancien_min, minimum), max(ancien_max, maximum))
+    else:
+        etats[etat] = (minimum, maximum)
+
+
+def _terminal(texte):
+    if not texte:
+        return _VIDE
+    corrige = texte.replace("' ", "'").replace(" ,", ",").replace(" .", ".")
+    n = len(corrige.encode())
+    return (False, {(texte[0] in ",.", texte[-1] == "'"): (n, n)})
+
+
+def _sequence(parties):
+    vide, etats = _VIDE
+    for partie_vide, partie in parties:
+        nouveaux = {}
+        # Une partie vide est sautée par le " ".join de la génération
+        if vide:
+            for etat, (minimum, maximum) in partie.items():
+                _fusion(nouveaux, etat, minimum, maximum)
+        if partie_vide:
+            for etat, (minimum, maximum) in etats.items():
+                _fusion(nouveaux, etat, minimum, maximum)
+        for (debut, fin), (min_a, max_a) in etats.items():
+            for (debut_b, fin_b), (min_b, max_b) in partie.items():
+                espace = 0 if fin or debut_b else 1
+                _fusion(nouveaux, (debut, fin_b), min_a + min_b + espace, max_a + max_b + espace)
+        vide = vide and partie_vide
+        etats = nouveaux
+    return (vide, etats)
+
+
+def _choix(options):
+    vide = False
+    etats = {}
+    for option_vide, option in options:
+        vide = vide or option_vide
+        for etat, (minimum, maximum) in option.items():
+            _fusion(etats, etat, minimum, maximum)
+    return (vide, etats)
+
+
+def _references(alternative, grammaire):
+    if isinstance(alternative, list):
+        for element in alternative:
+            yield from _references(element, grammaire)
+    elif alternative in grammaire:
+        yield alternative
+
+
+def _cycles(grammaire, regles):
+    '''
+    Composantes fortement connexes cycliques (algorithme de Tarjan, sans
+    recursion pour les longues chaines de regles)
+    '''
+
+    index = {}
+    bas = {}
+    pile = []
+    sur_pile = set()
+    cycles = []
+
+    for depart in regles:
+        if depart in index:
+            continue
+        travail = [(depart, iter({r: None for a in grammaire[depart] for r in _references(a, grammaire)}))]
+        index[depart] = bas[depart] = len(index)
+        pile.append(depart)
+        sur_pile.add(depart)
+        while travail:
+            regle, suivantes = travail[-1]
+            for suivante in suivantes:
+                if suivante not in index:
+                    index[suivante] = bas[suivante] = len(index)
+                    pile.append(suivante)
+                    sur_pile.add(suivante)
+                    travail.append((suivante, iter({r: None for a in grammaire[suivante]
+                                                    for r in _references(a, grammaire)})))
+                    break
+                if suivante in sur_pile:
+                    bas[regle] = min(bas[regle], index[suivante])
+            else:
+                travail.pop()
+                if travail:
+                    parent = travail[-1][0]
+                    bas[parent] = min(bas[parent], bas[regle])
+                if bas[regle] == index[regle]:
+                    composante = []
+                    while True:
+                        r = pile.pop()
+                        sur_pile.discard(r)
+                        composante.append(r)
+                        if r == regle:
+                            break
+                    boucle = any(regle in _references(a, grammaire) for a in grammaire[regle])
+                    if len(composante) > 1 or boucle:
+                        cycles.append(sorted(composante))
+
+    return cycles
+
+
+def _resumes(grammaire, cycles=None):
+    '''
+    Longueurs (vide, etats) de chaque regle, None pour les regles prises
+    dans un cycle ou qui en dependent
+    '''
+
+    if cycles is None:
+        cycles = _cycles(grammaire, list(grammaire))
+    cycliques = {r for cycle in cycles for r in cycle}
+    resumes = {}
+
+    # Parcours en profondeur : chaque règle est résumée après toutes celles
+    # qu'elle utilise
+    for depart in grammaire:
+        if depart in resumes:
+            continue
+        vues = {depart}
+        travail = [(depart, (r for a in grammaire[depart] for r in _references(a, grammaire)))]
+        while travail:
+            regle, suivantes = travail[-1]
+            for suivante in suivantes:
+                if suivante not in resumes and suivante not in vues:
+                    vues.add(suivante)
+                    travail.append((suivante, (r for a in grammaire[suivante] for r in _references(a, grammaire))))
+                    break
+            else:
+                travail.pop()
+                if regle in cycliques:
+                    resumes[regle] = None
+                else:
+                    options = [_resume(a, grammaire, resumes) for a in grammaire[regle]]
+                    resumes[regle] = None if None in options else _choix(options)
+
+    return resumes
+
+
+def _resume(alternative, grammaire, resumes):
+    if isinstance(alternative, list):
+        parties = [_resume(e, grammaire, resumes) for e in alternative]
+        return None if None in parties else _sequence(parties)
+    elif alternative in grammaire:
+        return resumes.get(alternative)
+    else:
+        return _terminal(alternative)
+
+
+def _bornes(resume):
+    if resume is None:
+        return None
+    vide, etats = resume
+    if not etats:
+        return (0, 0)
+    minimum = 0 if vide else min(m for m, _ in etats.values())
+    return (minimum, max(m for _, m in etats.values()))
+
+
+def longueurs(grammaire):
+    '''
+    Longueurs minimale et maximale du texte produit par chaque regle
+
+    Parametres
+    ----------
+    grammaire: dict
+               Grammaire au format de HISTOIRES
+
+    Retourne
+    --------
+    longueurs: dict
+               Pour chaque regle, (minimum, maximum) en octets du texte
+               apres corrections(), sans le point final ; None pour une
+               regle prise dans un cycle ou qui en depend
+    '''
+
+    resumes = _resumes(grammaire)
+    return {regle: _bornes(resumes[regle]) for regle in grammaire}
+
+
+# Chaînes collées dans le source Python
+# ------------------------------------------------------------------------------
+
+def concatenations_implicites(chemin):
+    '''
+    Chaines litterales collees faute de virgule dans un fichier Python
+
+    En Python, "pauvre" "" est une seule chaine : dans une liste
+    d'alternatives, l'oubli de la virgule fait disparaitre une alternative
+    sans aucune erreur.
+
+    Parametres
+    ----------
+    chemin: string
+            Fichier Python a examiner
+
+    Retourne
+    --------
+    concatenations: list
+                    (ligne, texte) de chaque chaine collee a la precedente
+    '''
+
+    # Import tardif : seule l'analyse du source Python en a besoin
+    import tokenize
+
+    ignores = {tokenize.NL, tokenize.NEWLINE, tokenize.COMMENT, tokenize.INDENT, tokenize.DEDENT}
+    concatenations = []
+    precedent = None
+    with open(chemin, "rb") as fichier:
+        for jeton in tokenize.tokenize(fichier.readline):
+            if jeton.type in ignores:
+                continue
+            if jeton.type == tokenize.STRING and precedent is not None and precedent.type == tokenize.STRING:
+                concatenations.append((jeton.start[0], f"{precedent.string} {jeton.string}"))
+            precedent = jeton
+    return concatenations
+
+
+# Analyse complète
+# ------------------------------------------------------------------------------
+
+class AnalyseGrammaire:
+    '''
+    Analyse statique d'une grammaire, calculee une fois pour toutes
+
+    Parametres
+    ----------
+    grammaire: dict
+               Grammaire au format de HISTOIRES
+    racine: string
+            Regle dont partent les histoires
+    source: string
+            Fichier Python definissant la grammaire, pour y chercher les
+            chaines collees (None pour ne pas le lire)
+    '''
+
+    def __init__(self, grammaire, racine="AVENTURES", source=None):
+        self.racine = racine
+        self.nb_regles = len(grammaire)
+
+        # Règles accessibles depuis la racine
+        accessibles = set()
+        if racine in grammaire:
+            a_voir = [racine]
+            accessibles.add(racine)
+            while a_voir:
+                for alternative in grammaire[a_voir.pop()]:
+                    for regle in _references(alternative, grammaire):
+                        if regle not in accessibles:
+                            accessibles.add(regle)
+                            a_voir.append(regle)
+        self.inaccessibles = [r for r in grammaire if r not in accessibles]
+
+        self.indefinies = []
+        self.vides = []
+        self.sans_alternative = []
+        self.nues = []
+        for regle, alternatives in grammaire.items():
+            if not alternatives:
+                self.sans_alternative.append(regle)
+            for i, alternative in enumerate(alternatives):
+                if alternative == "":
+                    self.vides.append((regle, i))
+                elif isinstance(alternative, str) and alternative in grammaire:
+                    # Référence écrite sans crochets : même effet que [REGLE]
+                    self.nues.append((regle, i))
+                textes = alternative if isinstance(alternative, list) else [alternative]
+                for texte in textes:
+                    if isinstance(texte, str) and texte not in grammaire and _NOM_REGLE.fullmatch(texte):
+                        self.indefinies.append((regle, texte))
+
+        cycles = _cycles(grammaire, list(grammaire))
+        self.cycles = [c for c in cycles if accessibles.intersection(c)]
+        resumes = _resumes(grammaire, cycles)
+        self.longueurs = {regle: _bornes(resumes[regle]) for regle in grammaire}
+
+        # Longueur de chaque modèle de la racine, point final compris
+        self.modeles = []
+        self.modeles_vides = []
+        for i, modele in enumerate(grammaire.get(racine, [])):
+            bornes = _bornes(_resume(modele, grammaire, resumes))
+            if bornes is not None and bornes[0] == 0:
+                self.modeles_vides.append(i)
+            self.modeles.append(None if bornes is None else (bornes[0] + 1, bornes[1] + 1))
+
+        bornes = self.longueurs.get(racine)
+        self.longueur_min = None if bornes is None else bornes[0] + 1
+        self.longueur_max = None if bornes is None else bornes[1] + 1
+
+        self.concatenations = concatenations_implicites(source) if source else []
+
+    def erreurs(self):
+        '''
+        Problemes qui empechent de generer des histoires correctes
+
+        Retourne
+        --------
+        erreurs: list
+                 Messages d'erreur (liste vide si la grammaire est saine)
+        '''
+
+        erreurs = []
+        if self.racine not in self.longueurs:
+            erreurs.append(f"règle {self.racine} absente")
+        for regle in self.sans_alternative:
+            erreurs.append(f"règle {regle} sans alternative")
+        for cycle in self.cycles:
+            erreurs.append(f"cycle entre les règles {', '.join(cycle)}, histoires infinies")
+        for i in self.modeles_vides:
+            erreurs.append(f"le modèle {i} de {self.racine} peut produire une histoire vide")
+        return erreurs
+
+    def avertissements(self):
+        '''
+        Problemes qui n'empechent pas la generation mais trahissent
+        probablement une erreur dans la grammaire
+
+        Retourne
+        --------
+        avertissements: list
+                        Messages d'avertissement
+        '''
+
+        avertissements = []
+        for ligne, texte in self.concatenations:
+            avertissements.append(f"ligne {ligne} : chaînes collées faute de virgule : {texte}")
+        for regle, texte in self.indefinies:
+            avertissements.append(f"{regle} : {texte} ressemble à une règle mais n'est pas défini")
+        for regle in self.inaccessibles:
+            avertissements.append(f"règle {regle} inaccessible depuis {self.racine}")
+        return avertissements
+
+    def rapport(self):
+        '''
+        Rapport complet de l'analyse
+
+        Retourne
+        --------
+        rapport: string
+                 Texte a afficher
+        '''
+
+        lignes = [f"Règles : {self.nb_regles}, modèles de {self.racine} : {len(self.modeles)}"]
+        if self.longueur_max is not None:
+            lignes.append(f"Longueur des histoires : {self.longueur_min} à {self.longueur_max} octets")
+            bornes = [b for b in self.modeles if b is not None]
+            if bornes:
+                plus_long = max(range(len(self.modeles)), key=lambda i: -1 if self.modeles[i] is None else self.modeles[i][1])
+                lignes.append(f"Modèle le plus long : {plus_long} ({self.modeles[plus_long][1]} octets)")
+        if self.vides:
+            regles = sorted({r for r, _ in self.vides})
+            lignes.append(f"Alternatives vides : {len(self.vides)} ({', '.join(regles)})")
+        if self.nues:
+            regles = sorted({r for r, _ in self.nues})
+            lignes.append(f"Références écrites sans crochets : {len(self.nues)} ({', '.join(regles)})")
+        for message in self.avertissements():
+            lignes.append(f"Attention, {message}")
+        for message in self.erreurs():
+            lignes.append(f"Erreur, {message}")
+        return "\n".join(lignes)
+
+
+def verifier(grammaire, racine="AVENTURES"):
+    '''
+    Analyse une grammaire et la refuse si elle ne peut pas produire
+    d'histoires correctes
+
+    Parametres
+    ----------
+    grammaire: dict
+               Grammaire au format de HISTOIRES
+    racine: string
+            Regle dont partent les histoires
+
+    Retourne
+    --------
+    analyse: AnalyseGrammaire
+             Analyse de la grammaire, sans erreur
+    '''
+
+    analyse = AnalyseGrammaire(grammaire, racine)
+    erreurs = analyse.erreurs()
+    if erreurs:
+        raise ValueError(f"Grammaire invalide : {' ; '.join(erreurs)}")
+    return analyse
@@ -0,0 +1,266 @@
+# coding: utf-8
+
+"""
+Cache sur disque des grammaires compilées
+
+Les tables d'une grammaire compilée sont écrites avec marshal dans un fichier
+dont le nom contient l'empreinte de la source de la grammaire. Tant que la
+source ne change pas, chaque processus relit ces tables au lieu de
+recompiler ; dès qu'elle change, l'empreinte change et les anciennes tables
+sont remplacées.
+
+Les grammaires chargées depuis des fichiers (voir fabrique.chargement) sont
+mises en cache de la même façon, avec l'empreinte du contenu des fichiers.
+
+Le dossier du cache est ~/.cache/petite-fabrique (ou $XDG_CACHE_HOME), ou
+celui donné par la variable d'environnement FABRIQUE_CACHE. Le cache est
+désactivé si FABRIQUE_CACHE est vide.
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import hashlib
+import marshal
+import os
+import sys
+
+from .moteur import GrammaireCompilee
+
+
+# Moulinettes
+# ==============================================================================
+
+# À incrémenter à chaque changement du format de GrammaireCompilee.tables()
+VERSION_TABLES = 2
+
+
+# Emplacement et clé du cache
+# ------------------------------------------------------------------------------
+
+def dossier_cache():
+    '''
+    Dossier du cache
+
+    Retourne
+    --------
+    dossier: string
+             Chemin du dossier, ou None si le cache est desactive
+    '''
+
+    dossier = os.environ.get("FABRIQUE_CACHE")
+    if dossier is not None:
+        return dossier or None
+
+    racine = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(racine, "petite-fabrique")
+
+
+def empreinte_source(source):
+    '''
+    Empreinte de la source d'une grammaire
+
+    Parametres
+    ----------
+    source: bytes or dict
+            Contenu du fichier source de la grammaire, ou la grammaire
+            elle-meme
+
+    Retourne
+    --------
+    empreinte: string
+               Empreinte hexadecimale, qui tient aussi compte du format des
+               tables et de la version de marshal
+    '''
+
+    if not isinstance(source, bytes):
+        import json
+        source = json.dumps(source, ensure_ascii=False, sort_keys=True).encode()
+
+    h = hashlib.sha256(source)
+    h.update(f"tables {VERSION_TABLES} marshal {marshal.version} python {sys.version_info[:2]}".encode())
+    return h.hexdigest()
+
+
+# Lecture et écriture
+# ------------------------------------------------------------------------------
+
+def lire(chemin):
+    '''
+    Lit une grammaire compilee dans le cache
+
+    Parametres
+    ----------
+    chemin: string
+            Fichier du cache
+
+    Retourne
+    --------
+    grammaire: GrammaireCompilee
+               Grammaire relue, ou None si le fichier est absent ou illisible
+    '''
+
+    try:
+        # Lecture d'un bloc : marshal.load() sur le fichier lit par petits
+        # morceaux et s'avère bien plus lent
+        with open(chemin, "rb") as fichier:
+            return GrammaireCompilee.depuis_tables(marshal.loads(fichier.read()))
+    except (OSError, EOFError, ValueError, TypeError, KeyError):
+        return None
+
+
+def ecrire(chemin, grammaire):
+    '''
+    Écrit une grammaire compilee dans le cache
+
+    Le fichier est ecrit a cote puis renomme, pour qu'un processus lisant le
+    cache en meme temps ne voie jamais un fichier a moitie ecrit. Les
+    erreurs d'ecriture sont ignorees : le cache n'est qu'une optimisation.
+
+    Parametres
+    ----------
+    chemin: string
+            Fichier du cache
+    grammaire: GrammaireCompilee
+               Grammaire a ecrire
+    '''
+
+    # Import tardif : tempfile est coûteux à importer et ne sert qu'ici
+    import tempfile
+
+    dossier = os.path.dirname(chemin)
+    try:
+        os.makedirs(dossier, exist_ok=True)
+        descripteur, temporaire = tempfile.mkstemp(dir=dossier, suffix=".tmp")
+        with os.fdopen(descripteur, "wb") as fichier:
+            marshal.dump(grammaire.tables(), fichier)
+        os.replace(temporaire, chemin)
+    except OSError:
+        return
+
+    # Les tables des versions précédentes de la même grammaire ne serviront plus
+    prefixe = os.path.basename(chemin).rsplit("-", 1)[0] + "-"
+    for nom in os.listdir(dossier):
+        ancien = os.path.join(dossier, nom)
+        if nom.startswith(prefixe) and nom.endswith(".marshal") and ancien != chemin:
+            try:
+                os.remove(ancien)
+            except OSError:
+                pass
+
+
+def compiler(grammaire):
+    '''
+    Analyse puis compile une grammaire
+
+    Une grammaire en cache a deja passe l'analyse : elle n'est faite qu'une
+    fois par version de la grammaire, et jamais pendant la generation.
+
+    Parametres
+    ----------
+    grammaire: dict
+               Grammaire au format de HISTOIRES
+
+    Retourne
+    --------
+    grammaire: GrammaireCompilee
+               Grammaire compilee, avec les longueurs de l'analyse
+    '''
+
+    # Import tardif : l'analyse ne sert qu'en l'absence de cache
+    from .analyse import verifier
+
+    analyse = verifier(grammaire)
+    return GrammaireCompilee(grammaire, analyse.longueurs)
+
+
+def charger(nom, source, grammaire):
+    '''
+    Grammaire compilee, lue dans le cache ou compilee puis mise en cache
+
+    Parametres
+    ----------
+    nom: string
+         Nom de la grammaire, qui prefixe les fichiers du cache
+    source: bytes or dict
+            Source de la grammaire, dont l'empreinte sert de cle
+    grammaire: function
+               Fonction sans argument renvoyant la grammaire (dict), appelee
+               seulement s'il faut compiler
+
+    Retourne
+    --------
+    grammaire: GrammaireCompilee
+               Grammaire compilee
+    '''
+
+    dossier = dossier_cache()
+    if dossier is None:
+        return compiler(grammaire())
+
+    chemin = os.path.join(dossier, f"{nom}-{empreinte_source(source)}.marshal")
+    compilee = lire(chemin)
+    if compilee is None:
+        compilee = compiler(grammaire())
+        ecrire(chemin, compilee)
+    return compilee
+
+
+def grammaire_histoires():
+    '''
+    Grammaire HISTOIRES compilee, par le cache
+
+    La cle est l'empreinte du fichier grammaire.py : si le cache est a jour,
+    ce module n'est meme pas importe.
+
+    Retourne
+    --------
+    grammaire: GrammaireCompilee
+               Grammaire compilee
+    '''
+
+    def histoires():
+        from .grammaire import HISTOIRES
+        return HISTOIRES
+
+    with open(os.path.join(os.path.dirname(__file__), "grammaire.py"), "rb") as fichier:
+        source = fichier.read()
+
+    return charger("histoires", source, histoires)
+
+
+def grammaire_fichiers(fichiers):
+    '''
+    Grammaire chargee depuis des fichiers puis compilee, par le cache
+
+    La cle est l'empreinte du contenu des fichiers, lus par morceaux : ils
+    ne sont analyses que si le cache n'est pas a jour.
+
+    Parametres
+    ----------
+    fichiers: list
+              Fichiers de grammaire (voir fabrique.chargement)
+
+    Retourne
+    --------
+    grammaire: GrammaireCompilee
+               Grammaire compilee
+    '''
+
+    from .chargement import TAILLE_MORCEAU, charger_grammaire
+
+    h = hashlib.sha256()
+    for chemin in fichiers:
+        h.update(f"{os.path.basename(chemin)}\0".encode())
+        with open(chemin, "rb") as fichier:
+            for morceau in iter(lambda: fichier.read(TAILLE_MORCEAU), b""):
+                h.update(morceau)
+        h.update(b"\0")
+
+    # Un préfixe par ensemble de fichiers, pour que les tables d'une autre
+    # grammaire ne soient pas effacées à l'écriture
+    chemins = "\0".join(os.path.abspath(f) for f in fichiers)
+    nom = "fichiers-" + hashlib.sha256(chemins.encode()).hexdigest()[:16]
+
+    return charger(nom, h.digest(), lambda: charger_grammaire(*fichiers))
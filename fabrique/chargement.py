@@ -0,0 +1,356 @@
+# coding: utf-8
+
+"""
+Chargement de grammaires depuis des fichiers
+
+Deux formats sont acceptés, choisis selon l'extension du fichier :
+
+- JSON (.json) : un objet dont chaque clé est une règle et chaque valeur la
+  liste de ses alternatives, exactement comme le dictionnaire HISTOIRES ;
+
+- texte (toute autre extension), un petit sous-ensemble de YAML :
+
+    # Commentaire
+    INTRO_GEN:
+      - Il etait une fois
+      - "texte entre guillemets, pour les espaces en bord ou le texte vide"
+      - [INTRO_PLU_CON, SN_PLU, qui, ". Un jour, ils"]
+
+  Une alternative entre crochets est une séquence, dont les éléments qui
+  contiennent une virgule ou un crochet sont écrits entre guillemets ; les
+  chaînes entre guillemets sont lues comme en JSON, les autres alternatives
+  sont prises telles quelles.
+
+Comme dans HISTOIRES, une alternative qui porte le nom d'une règle désigne
+cette règle. Les fichiers sont lus par morceaux et chaque alternative est
+vérifiée dès sa lecture : la mémoire occupée est celle de la grammaire
+finale, plus un tampon de taille fixe, quelle que soit la taille des listes
+de vocabulaire. Plusieurs fichiers partagent un seul espace de noms ; une
+règle définie dans plusieurs fichiers réunit toutes leurs alternatives.
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import json
+import os
+import sys
+
+
+# Moulinettes
+# ==============================================================================
+
+# Taille des morceaux lus dans les fichiers JSON
+TAILLE_MORCEAU = 1 << 16
+
+
+# Vérification des alternatives
+# ------------------------------------------------------------------------------
+
+def _alternative(valeur, position):
+    '''
+    Verifie une alternative lue dans un fichier
+
+    Parametres
+    ----------
+    valeur: string or list
+            Alternative decodee
+    position: string
+              Fichier et ligne, pour les messages d'erreur
+
+    Retourne
+    --------
+    alternative: string or list
+                 La meme alternative, dont les elements des sequences sont
+                 internes (ce sont surtout des noms de regles, repetes des
+                 milliers de fois)
+    '''
+
+    if isinstance(valeur, str):
+        return valeur
+    if isinstance(valeur, list):
+        return [sys.intern(v) if isinstance(v, str) else _alternative(v, position) for v in valeur]
+    raise ValueError(f"{position} : alternative invalide {valeur!r}, "
+                     "une chaîne ou une liste de chaînes est attendue")
+
+
+def _ajouter(grammaire, regle, position):
+    # Une règle déjà définie (dans ce fichier ou un autre) est complétée
+    if not regle:
+        raise ValueError(f"{position} : nom de règle vide")
+    return grammaire.setdefault(sys.intern(regle), [])
+
+
+# Format JSON
+# ------------------------------------------------------------------------------
+
+class _FluxJSON:
+    '''
+    Lecteur JSON incremental : le fichier est lu par morceaux et les valeurs
+    sont decodees une a une avec json.JSONDecoder.raw_decode
+
+    Parametres
+    ----------
+    fichier: file
+             Flux texte a lire
+    nom: string
+         Nom du fichier, pour les messages d'erreur
+    '''
+
+    def __init__(self, fichier, nom):
+        self.fichier = fichier
+        self.nom = nom
+        self.texte = ""
+        self.pos = 0
+        # Lignes comptées jusqu'à la position compte du tampon
+        self.lignes = 0
+        self.compte = 0
+        self.decodeur = json.JSONDecoder()
+
+    def position(self):
+        self.lignes += self.texte.count("\n", self.compte, self.pos)
+        self.compte = self.pos
+        return f"{self.nom}:{self.lignes + 1}"
+
+    def _remplir(self):
+        morceau = self.fichier.read(TAILLE_MORCEAU)
+        if not morceau:
+            return False
+        # Seule la fin non lue du tampon est gardée
+        self.lignes += self.texte.count("\n", self.compte, self.pos)
+        self.texte = self.texte[self.pos:] + morceau
+        self.pos = self.compte = 0
+        return True
+
+    def caractere(self):
+        '''
+        Prochain caractere significatif, sans le consommer ("" en fin de fichier)
+        '''
+
+        while True:
+            n = len(self.texte)
+            while self.pos < n and self.texte[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < n:
+                return self.texte[self.pos]
+            if not self._remplir():
+                return ""
+
+    def attendre(self, attendus):
+        c = self.caractere()
+        if c == "" or c not in attendus:
+            trouve = repr(c) if c else "la fin du fichier"
+            raise ValueError(f"{self.position()} : {' ou '.join(map(repr, attendus))} attendu, {trouve} trouvé")
+        self.pos += 1
+        return c
+
+    def valeur(self):
+        '''
+        Decode la prochaine valeur JSON complete
+        '''
+
+        self.caractere()
+        while True:
+            try:
+                valeur, fin = self.decodeur.raw_decode(self.texte, self.pos)
+            except json.JSONDecodeError as erreur:
+                # La valeur est peut-être coupée par la fin du tampon
+                if self._remplir():
+                    continue
+                raise ValueError(f"{self.position()} : JSON invalide ({erreur.msg})") from None
+            # Un nombre ou un mot coupé en fin de tampon se décode quand même :
+            # on ne l'accepte que suivi d'autre chose
+            if fin == len(self.texte) and not isinstance(valeur, (str, list, dict)) and self._remplir():
+                continue
+            self.pos = fin
+            return valeur
+
+
+def _lire_json(fichier, nom, grammaire):
+    flux = _FluxJSON(fichier, nom)
+
+    flux.attendre("{")
+    if flux.caractere() == "}":
+        flux.pos += 1
+    else:
+        while True:
+            position = flux.position()
+            regle = flux.valeur()
+            if not isinstance(regle, str):
+                raise ValueError(f"{position} : nom de règle attendu, {regle!r} trouvé")
+            alternatives = _ajouter(grammaire, regle, position)
+            flux.attendre(":")
+
+            # Les alternatives sont lues une à une : une liste de vocabulaire
+            # n'est jamais décodée d'un bloc
+            flux.attendre("[")
+            if flux.caractere() == "]":
+                flux.pos += 1
+            else:
+                while True:
+                    valeur = flux.valeur()
+                    # Les mots, de loin les plus nombreux, sont acceptés
+                    # tels quels
+                    if not isinstance(valeur, str):
+                        valeur = _alternative(valeur, flux.position())
+                    alternatives.append(valeur)
+                    if flux.attendre(",]") == "]":
+                        break
+
+            if flux.attendre(",}") == "}":
+                break
+
+    if flux.caractere():
+        raise ValueError(f"{flux.position()} : texte inattendu après la grammaire")
+
+
+# Format texte
+# ------------------------------------------------------------------------------
+
+_decodeur = json.JSONDecoder()
+
+
+def _sequence(texte, position):
+    '''
+    Lit une sequence ecrite entre crochets, comme en YAML : les elements sont
+    separes par des virgules, et ceux qui contiennent une virgule ou un
+    crochet sont ecrits entre guillemets
+    '''
+
+    elements = []
+    pos = 1
+    while True:
+        while texte[pos:pos + 1] == " ":
+            pos += 1
+        guillemets = texte[pos:pos + 1] == '"'
+        if guillemets:
+            try:
+                element, pos = _decodeur.raw_decode(texte, pos)
+            except json.JSONDecodeError as erreur:
+                raise ValueError(f"{position} : chaîne invalide ({erreur.msg})") from None
+        else:
+            fin = min(i for i in (texte.find(",", pos), texte.find("]", pos), len(texte)) if i >= 0)
+            element = texte[pos:fin].strip()
+            pos = fin
+        while texte[pos:pos + 1] == " ":
+            pos += 1
+
+        separateur = texte[pos:pos + 1]
+        if separateur == "]" and not elements and not guillemets and element == "":
+            pos += 1
+            break
+        if element == "" and not guillemets:
+            raise ValueError(f"{position} : élément vide dans {texte!r} (écrire \"\" pour un texte vide)")
+        elements.append(sys.intern(element))
+        pos += 1
+        if separateur == "]":
+            break
+        if separateur != ",":
+            raise ValueError(f"{position} : ',' ou ']' attendu dans {texte!r}")
+
+    if texte[pos:].strip():
+        raise ValueError(f"{position} : texte inattendu après la séquence {texte!r}")
+    return elements
+
+
+def _lire_texte(fichier, nom, grammaire):
+    alternatives = None
+
+    for numero, ligne in enumerate(fichier, 1):
+        position = f"{nom}:{numero}"
+        contenu = ligne.strip()
+
+        if not contenu or contenu.startswith("#"):
+            continue
+
+        if contenu.startswith("-"):
+            if alternatives is None:
+                raise ValueError(f"{position} : alternative en dehors de toute règle")
+            texte = contenu[1:].strip()
+            if texte.startswith("["):
+                alternatives.append(_sequence(texte, position))
+            elif texte.startswith('"'):
+                try:
+                    valeur = json.loads(texte)
+                except json.JSONDecodeError as erreur:
+                    raise ValueError(f"{position} : chaîne invalide ({erreur.msg})") from None
+                alternatives.append(_alternative(valeur, position))
+            else:
+                alternatives.append(texte)
+        elif contenu.endswith(":") and ligne[0] not in " \t":
+            alternatives = _ajouter(grammaire, contenu[:-1].strip(), position)
+        else:
+            raise ValueError(f"{position} : ligne incomprise {contenu!r} "
+                             "(attendu : « REGLE: » ou « - alternative »)")
+
+
+# Chargement
+# ------------------------------------------------------------------------------
+
+def charger_grammaire(*fichiers, racine="AVENTURES"):
+    '''
+    Charge une grammaire depuis un ou plusieurs fichiers
+
+    Parametres
+    ----------
+    fichiers: string
+              Chemins des fichiers, JSON (.json) ou texte ; leurs regles sont
+              reunies dans une seule grammaire
+    racine: string
+            Regle qui doit etre definie (None pour ne pas verifier)
+
+    Retourne
+    --------
+    grammaire: dict
+               Grammaire au meme format que HISTOIRES, utilisable par
+               generation() et GrammaireCompilee
+    '''
+
+    grammaire = {}
+
+    for chemin in fichiers:
+        lire = _lire_json if os.path.splitext(chemin)[1].lower() == ".json" else _lire_texte
+        with open(chemin, encoding="utf-8") as fichier:
+            lire(fichier, chemin, grammaire)
+
+    vides = [regle for regle, alternatives in grammaire.items() if not alternatives]
+    if vides:
+        raise ValueError(f"Règles sans alternative : {', '.join(vides)}")
+    if racine is not None and racine not in grammaire:
+        raise ValueError(f"Règle {racine} absente de {', '.join(fichiers)}")
+
+    return grammaire
+
+
+def ecrire_grammaire(grammaire, sortie):
+    '''
+    Écrit une grammaire au format texte
+
+    Parametres
+    ----------
+    grammaire: dict
+               Grammaire a ecrire (par exemple HISTOIRES)
+    sortie: file
+            Flux texte dans lequel ecrire
+    '''
+
+    def element(texte, reserves):
+        # Le texte libre ne doit ni contenir de caractère réservé ni perdre
+        # d'espaces à la relecture
+        if (texte and texte == texte.strip() and texte[0] not in '"[#-'
+                and not any(c in texte for c in reserves)):
+            return texte
+        return json.dumps(texte, ensure_ascii=False)
+
+    for regle, alternatives in grammaire.items():
+        print(f"{regle}:", file=sortie)
+        for alternative in alternatives:
+            if isinstance(alternative, str):
+                texte = element(alternative, "")
+            elif all(isinstance(e, str) for e in alternative):
+                texte = "[" + ", ".join(element(e, ",]") for e in alternative) + "]"
+            else:
+                texte = json.dumps(alternative, ensure_ascii=False)
+            print(f"  - {texte}", file=sortie)
+        print(file=sortie)
@@ -0,0 +1,390 @@
+# coding: utf-8
+
+"""
+Ligne de commande de la petite fabrique à histoires
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import argparse
+import os
+import sys
+
+from .lot import denombrement, ecrire_lot, taille_tampon
+from .moteur import choisir_grammaire, grammaire_compilee, grammaire_source, lancement
+
+
+# Programme principal
+# ==============================================================================
+
+def main(argv=None):
+    '''
+    Point d'entree de la ligne de commande
+
+    Parametres
+    ----------
+    argv: list
+          Arguments de la ligne de commande (par defaut sys.argv[1:])
+
+    Retourne
+    --------
+    code: int
+          Code de retour du programme
+    '''
+
+
+    # Arguments
+    # --------------------------------------------------------------------------
+
+    parser = argparse.ArgumentParser(description="Connexion avec la carte Arduino")
+    parser.add_argument("--port", "-p",
+                        action="append", metavar="port",
+                        help="Port sur lequel se trouve votre carte Arduino, à répéter pour servir plusieurs cartes ; "
+                             "les motifs comme '/dev/ttyACM*' sont acceptés (default: '/dev/ttyACM0')")
+    parser.add_argument("--usb",
+                        action="append", metavar="VID[:PID]",
+                        help="Sert aussi les cartes USB ayant ces identifiants de fabricant et de produit, en "
+                             "hexadécimal (par exemple 2341:0043 pour une Arduino Uno), où qu'elles soient branchées ; "
+                             "à répéter pour plusieurs modèles")
+    parser.add_argument("--grammaire", "-g",
+                        action="append", metavar="fichier",
+                        help="Fichier de grammaire (JSON ou texte) à utiliser à la place de la grammaire intégrée, "
+                             "à répéter pour réunir plusieurs fichiers")
+    parser.add_argument("--batch", "-b",
+                        type=int, metavar="N",
+                        help="Génère N histoires hors ligne, sans se connecter à Arduino")
+    parser.add_argument("--output", "-o",
+                        metavar="fichier",
+                        help="Fichier dans lequel écrire le lot (default: sortie standard)")
+    parser.add_argument("--workers", "-w",
+                        type=int, default=1, metavar="N",
+                        help="Nombre de processus pour générer le lot, 0 pour un par cœur (default: 1)")
+    parser.add_argument("--seed", "-s",
+                        type=int, metavar="graine",
+                        help="Graine du générateur aléatoire pour un lot reproductible")
+    parser.add_argument("--uniforme", "-u",
+                        action="store_true",
+                        help="Tire les histoires uniformément parmi toutes les histoires possibles")
+    parser.add_argument("--uniques",
+                        action="store_true",
+                        help="Ne produit jamais deux fois la même histoire (empreintes de 64 bits)")
+    parser.add_argument("--bloom",
+                        type=float, metavar="taux",
+                        help="Comme --uniques, avec un filtre de Bloom de taille fixe et ce taux de faux positifs")
+    parser.add_argument("--capacite",
+                        type=int, metavar="N",
+                        help="Nombre d'histoires que le filtre de Bloom doit retenir (default: taille du lot ou 1000000)")
+    parser.add_argument("--affichage",
+                        choices=["trames", "texte"], default="trames",
+                        help="Envoie à Arduino l'histoire découpée en trames de l'écran, au rythme du défilement, "
+                             "ou le texte brut pour les anciens croquis qui le font défiler eux-mêmes (default: trames)")
+    parser.add_argument("--compression",
+                        action="store_true",
+                        help="Envoie chaque histoire codée d'un seul paquet aux cartes dont le croquis a le "
+                             "dictionnaire de la grammaire (voir --dictionnaire), que la carte fait défiler elle-même")
+    parser.add_argument("--dictionnaire",
+                        metavar="fichier",
+                        help="Écrit le dictionnaire de la grammaire pour le croquis (dictionnaire.h) et quitte")
+    parser.add_argument("--baud",
+                        type=int, default=115200, metavar="bauds",
+                        help="Vitesse négociée avec Arduino après la connexion, qui démarre à 9600 bauds "
+                             "(default: 115200)")
+    parser.add_argument("--delai-ecriture",
+                        type=float, metavar="secondes",
+                        help="Abandonne une carte dont le port n'accepte plus d'octets pendant ce délai "
+                             "(default: attente sans limite)")
+    parser.add_argument("--metriques",
+                        metavar="[adresse:]port",
+                        help="Avec Arduino, sert les métriques au format Prometheus sur http://adresse:port/metrics "
+                             "(adresse par défaut : 127.0.0.1)")
+    parser.add_argument("--fichier-metriques",
+                        metavar="fichier",
+                        help="Avec Arduino, réécrit les métriques toutes les 15 secondes dans ce fichier "
+                             "(collecteur textfile de node_exporter)")
+    parser.add_argument("--serve",
+                        metavar="[adresse:]port",
+                        help="Sert les histoires en HTTP (GET /histoire, GET /histoires?n=N&seed=S) au lieu de se "
+                             "connecter à Arduino (adresse par défaut : 127.0.0.1)")
+    parser.add_argument("--reserve", "-r",
+                        type=int, default=8, metavar="N",
+                        help="Nombre d'histoires générées à l'avance pour Arduino (default: 8)")
+    parser.add_argument("--cadence", "-c",
+                        type=float, metavar="N",
+                        help="Nombre maximal d'histoires générées par seconde pour remplir la réserve (default: sans limite)")
+    parser.add_argument("--recharger",
+                        type=float, nargs="?", const=1.0, metavar="secondes",
+                        help="Avec Arduino, recharge la grammaire dès que ses fichiers changent, "
+                             "en les vérifiant toutes les N secondes (default: 1)")
+    parser.add_argument("--debut", "-d",
+                        type=int, metavar="K",
+                        help="Avec --batch, écrit les histoires numérotées K à K+N-1 au lieu d'histoires aléatoires")
+    parser.add_argument("--analyse",
+                        action="store_true",
+                        help="Analyse la grammaire (règles inaccessibles, cycles, longueurs des histoires...) et quitte")
+    parser.add_argument("--denombrement",
+                        action="store_true",
+                        help="Affiche le nombre d'histoires possibles par modèle et quitte")
+    parser.add_argument("--profil",
+                        nargs="?", const="", metavar="fichier",
+                        help="Profile la génération (règles développées, durées, choix des alternatives, "
+                             "profondeur, tailles) : résumé à la fin, et profil complet en JSON dans le fichier")
+    args = parser.parse_args(argv)
+
+    if args.workers < 0:
+        parser.error("--workers doit être positif ou nul")
+    if args.bloom is not None:
+        if not 0 < args.bloom < 1:
+            parser.error("--bloom doit être strictement compris entre 0 et 1")
+        args.uniques = True
+    if args.uniques and (args.workers != 1 or args.debut is not None):
+        parser.error("--uniques et --bloom ne se combinent ni avec --workers ni avec --debut")
+    if args.debut is not None and args.uniforme:
+        parser.error("--debut ne se combine pas avec --uniforme : les histoires numérotées ne sont pas tirées")
+    if args.serve and args.uniques:
+        parser.error("--serve ne se combine pas avec --uniques")
+    if args.profil is not None and args.batch is not None and (args.workers != 1 or args.debut is not None):
+        parser.error("--profil ne se combine ni avec --workers ni avec --debut")
+
+    if args.analyse:
+        from .analyse import AnalyseGrammaire
+
+        if args.grammaire:
+            choisir_grammaire(args.grammaire)
+            source = None
+        else:
+            # Le source Python est lu pour y trouver les virgules oubliées
+            source = os.path.join(os.path.dirname(__file__), "grammaire.py")
+        try:
+            analyse = AnalyseGrammaire(grammaire_source(), source=source)
+        except (OSError, ValueError) as erreur:
+            parser.error(str(erreur))
+        print(analyse.rapport())
+        return 1 if analyse.erreurs() else 0
+
+    if args.grammaire:
+        choisir_grammaire(args.grammaire)
+        try:
+            # Vérifie les fichiers tout de suite plutôt qu'à la première histoire
+            grammaire_compilee()
+        except (OSError, ValueError) as erreur:
+            parser.error(str(erreur))
+
+    if args.batch is not None and args.debut is not None:
+        try:
+            total = grammaire_compilee().compter()
+        except ValueError as erreur:
+            parser.error(str(erreur))
+        if not 0 <= args.debut < total:
+            parser.error(f"--debut doit être compris entre 0 et {total - 1}")
+
+    if args.dictionnaire:
+        from .dictionnaire import deriver_dictionnaire
+
+        with open(args.dictionnaire, "w", encoding="utf-8", newline="\r\n") as sortie:
+            sortie.write(deriver_dictionnaire(grammaire_compilee()).entete())
+        return 0
+
+    profil = None
+    if args.profil is not None:
+        from .moteur import installer_profil
+        from .profilage import Profil
+
+        profil = Profil()
+        installer_profil(profil)
+
+    def terminer_profil():
+        if profil is None:
+            return
+        print(profil.rapport(), file=sys.stderr)
+        if args.profil:
+            import json
+
+            with open(args.profil, "w") as sortie:
+                json.dump(profil.exporter(), sortie, indent=1)
+
+    def histoires_uniques(session=0):
+        from .uniques import EmpreintesExactes, FiltreBloom, HistoiresUniques
+
+        # Chaque nouvelle session a sa propre graine, dérivée de --seed comme
+        # celles des tranches d'un lot : elle ne rejoue pas la précédente
+        seed = args.seed
+        if session and seed is not None:
+            seed = f"{seed}/{session}"
+
+        if args.bloom is None:
+            memoire = EmpreintesExactes()
+        else:
+            capacite = args.capacite
+            if capacite is None:
+                capacite = args.batch if args.batch is not None else 1000000
+            memoire = FiltreBloom(capacite, args.bloom)
+        return HistoiresUniques(memoire, seed, args.uniforme)
+
+    # Génération en lot
+    # --------------------------------------------------------------------------
+
+    if args.denombrement:
+        denombrement()
+        return 0
+
+    if args.batch is not None and args.uniques:
+        from .uniques import ecrire_uniques
+
+        uniques = histoires_uniques()
+        if args.output:
+            with open(args.output, "wb", buffering=taille_tampon()) as sortie:
+                ecrire_uniques(args.batch, sortie, uniques)
+        else:
+            ecrire_uniques(args.batch, sys.stdout.buffer, uniques)
+            sys.stdout.flush()
+        print(uniques.rapport(), file=sys.stderr)
+        terminer_profil()
+        return 0
+
+    if args.batch is not None:
+        if args.output:
+            with open(args.output, "wb", buffering=taille_tampon()) as sortie:
+                ecrire_lot(args.batch, sortie, args.seed, args.workers, args.debut, args.uniforme)
+        else:
+            ecrire_lot(args.batch, sys.stdout.buffer, args.seed, args.workers, args.debut, args.uniforme)
+            sys.stdout.flush()
+        terminer_profil()
+        return 0
+
+    # Service HTTP
+    # --------------------------------------------------------------------------
+
+    if args.serve:
+        from .reserve import ReserveHistoires
+        from .service import ServiceHistoires
+
+        reserve = ReserveHistoires(lambda: lancement(args.uniforme), args.reserve, args.cadence).demarrer()
+        adresse, _, port = args.serve.rpartition(":")
+        try:
+            service = ServiceHistoires((adresse or "127.0.0.1", int(port)), reserve, args.uniforme)
+        except (OSError, ValueError) as erreur:
+            parser.error(f"--serve {args.serve} : {erreur}")
+        print(f"Histoires sur http://{service.server_address[0]}:{service.server_address[1]}/histoire", flush=True)
+        try:
+            service.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            service.server_close()
+            terminer_profil()
+        return 0
+
+    # Connexion à Arduino
+    # --------------------------------------------------------------------------
+
+    # Imports tardifs : la génération en lot n'a besoin ni de pyserial ni
+    # d'asyncio
+    import asyncio
+    import serial
+
+    from .connexions import GestionnaireCartes, lire_usb
+    from .ecran import convertir_lcd, trames
+    from .protocole import VITESSE_INITIALE
+    from .reserve import ReserveHistoires
+
+    try:
+        usb = [lire_usb(texte) for texte in args.usb or ()]
+    except ValueError as erreur:
+        parser.error(str(erreur))
+
+    def ouvrir(port):
+        return serial.Serial(port, VITESSE_INITIALE, timeout=None, write_timeout=args.delai_ecriture)
+
+    # Les cartes sont connectées, et reconnectées après une coupure, au fil
+    # de leur apparition
+    gestionnaire = GestionnaireCartes(ouvrir, args.port or ([] if usb else ["/dev/ttyACM0"]), usb)
+    cartes = gestionnaire.cartes
+
+    # Communication avec Arduino
+    # --------------------------------------------------------------------------
+
+    uniques = histoires_uniques() if args.uniques else None
+    sessions = 0
+
+    def generer():
+        nonlocal uniques, sessions
+
+        if uniques is None:
+            return lancement(args.uniforme)
+
+        histoire = uniques.histoire()
+        if histoire is None:
+            # Mémoire saturée : on repart d'une session vierge
+            print(f"Trop de doublons, nouvelle session ({uniques.rapport()})")
+            sessions += 1
+            uniques = histoires_uniques(sessions)
+            histoire = uniques.histoire()
+        return histoire
+
+    dictionnaire = None
+    if args.affichage == "trames" and args.compression:
+        from .dictionnaire import deriver_dictionnaire
+
+        # Le dictionnaire est celui du croquis : il ne suit pas les
+        # rechargements de la grammaire, dont les nouveaux mots passent en clair
+        dictionnaire = deriver_dictionnaire(grammaire_compilee())
+
+        def produire():
+            histoire = generer()
+            return dictionnaire.coder(convertir_lcd(histoire)), trames(histoire)
+    elif args.affichage == "trames":
+        # Le découpage se fait aussi en tâche de fond, avant l'appui
+        def produire():
+            return trames(generer())
+    else:
+        produire = generer
+
+    reserve = ReserveHistoires(produire, args.reserve, args.cadence).demarrer()
+
+    surveillance = None
+    if args.recharger is not None:
+        import logging
+
+        from .surveillance import SurveillanceGrammaire
+
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+        # Les histoires en réserve viennent de l'ancienne grammaire
+        surveillance = SurveillanceGrammaire(args.grammaire or (), args.recharger,
+                                             lambda grammaire: reserve.vider()).demarrer()
+
+    fichier_metriques = None
+    if args.metriques or args.fichier_metriques:
+        from .metriques import FichierMetriques, exposition, servir_metriques
+
+        def collecter():
+            return exposition(cartes, reserve, surveillance, fichier_metriques)
+
+        try:
+            if args.metriques:
+                adresse, _, port = args.metriques.rpartition(":")
+                serveur = servir_metriques(collecter, int(port), adresse or "127.0.0.1")
+                print(f"Métriques sur http://{serveur.server_address[0]}:{serveur.server_address[1]}/metrics")
+            if args.fichier_metriques:
+                fichier_metriques = FichierMetriques(collecter, args.fichier_metriques).demarrer()
+        except (OSError, ValueError) as erreur:
+            parser.error(f"métriques : {erreur}")
+
+    try:
+        # Les anciens croquis, qui reçoivent le texte brut, ne connaissent pas
+        # les paquets et restent à la vitesse de départ
+        vitesse = args.baud if args.affichage == "trames" else None
+        asyncio.run(gestionnaire.servir(reserve, vitesse, dictionnaire))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if surveillance is not None:
+            surveillance.arreter()
+        if fichier_metriques is not None:
+            fichier_metriques.arreter()
+        for carte in cartes:
+            print(carte)
+        terminer_profil()
+
+    return 0
@@ -0,0 +1,286 @@
+# coding: utf-8
+
+"""
+Découverte des cartes Arduino et reconnexion automatique
+
+Le gestionnaire scrute régulièrement les ports : chemins et motifs donnés
+par --port, et ports USB dont les identifiants de fabricant et de produit
+(VID:PID) correspondent à ceux donnés par --usb. Chaque carte trouvée est
+servie par sa propre tâche, qui la reconnecte quand elle réapparaît après
+une déconnexion (câble débranché, carte redémarrée) : la session continue,
+avec la même réserve d'histoires, au lieu de s'arrêter.
+
+Une carte USB est reconnue à son numéro de série (ou, à défaut, à sa place
+sur le bus USB), même si elle revient sous un autre nom de port. La
+scrutation est rapide (toutes les 100 ms), et seules les ouvertures ratées
+d'un port présent sont espacées de plus en plus : une carte rebranchée est
+servie dès que son port réapparaît.
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import asyncio
+import glob
+import os
+import time
+
+import serial
+
+from .serie import Carte, servir_carte
+
+
+# Moulinettes
+# ==============================================================================
+
+# Durée entre deux scrutations des ports, en secondes
+SCRUTATION = 0.1
+
+# Attente après une ouverture ratée, doublée à chaque échec jusqu'au maximum
+RECONNEXION_MIN = 0.05
+RECONNEXION_MAX = 2.0
+
+
+# Ports USB
+# ------------------------------------------------------------------------------
+
+def lire_usb(texte):
+    '''
+    Identifiants USB donnes sur la ligne de commande
+
+    Parametres
+    ----------
+    texte: string
+           "VID:PID" ou "VID", en hexadecimal (par exemple "2341:0043")
+
+    Retourne
+    --------
+    identifiants: tuple
+                  (vid, pid), pid valant None pour tous les produits du
+                  fabricant
+    '''
+
+    vid, _, pid = texte.partition(":")
+    try:
+        return int(vid, 16), int(pid, 16) if pid else None
+    except ValueError:
+        raise ValueError(f"Identifiants USB invalides : {texte!r} (attendu VID:PID en hexadécimal)") from None
+
+
+def ports_usb(identifiants):
+    '''
+    Ports USB dont les identifiants correspondent
+
+    Parametres
+    ----------
+    identifiants: list
+                  Couples (vid, pid) renvoyes par lire_usb()
+
+    Retourne
+    --------
+    ports: dict
+           Identite de la carte -> port ; l'identite est (vid, pid, numero
+           de serie), ou (vid, pid, place sur le bus) si la carte n'a pas
+           de numero de serie
+    '''
+
+    # Import tardif : la liste des ports n'est utile qu'avec --usb
+    from serial.tools import list_ports
+
+    ports = {}
+    for infos in list_ports.comports():
+        if infos.vid is None:
+            continue
+        if any(infos.vid == vid and pid in (None, infos.pid) for vid, pid in identifiants):
+            ports[(infos.vid, infos.pid, infos.serial_number or infos.location or infos.device)] = infos.device
+    return ports
+
+
+def _peripheriques():
+    # Noms des fichiers de /dev, qui changent quand un port apparaît ou
+    # disparaît (None sans /dev, sous Windows)
+    try:
+        return frozenset(os.listdir("/dev"))
+    except OSError:
+        return None
+
+
+def ports_presents(motifs):
+    '''
+    Ports designes par des chemins ou des motifs, s'ils existent
+
+    Parametres
+    ----------
+    motifs: list
+            Chemins de ports ou motifs glob (par exemple /dev/ttyACM*)
+
+    Retourne
+    --------
+    ports: list
+           Ports presents, sans doublon, dans l'ordre des motifs (sous
+           Windows, ou les ports COM ne sont pas des fichiers, les chemins
+           sont toujours consideres presents)
+    '''
+
+    ports = []
+    for motif in motifs:
+        if glob.has_magic(motif):
+            trouves = sorted(glob.glob(motif))
+        elif os.name == "nt" or os.path.exists(motif):
+            trouves = [motif]
+        else:
+            trouves = []
+        ports.extend(p for p in trouves if p not in ports)
+    return ports
+
+
+# Gestionnaire des cartes
+# ------------------------------------------------------------------------------
+
+class GestionnaireCartes:
+    '''
+    Decouvre les cartes, les sert et les reconnecte
+
+    Parametres
+    ----------
+    ouvrir: function
+            Fonction ouvrant un port (par exemple avec serial.Serial) et
+            renvoyant la connexion ; elle leve OSError ou
+            serial.SerialException en cas d'echec
+    motifs: list
+            Chemins de ports ou motifs glob
+    usb: list
+         Couples (vid, pid) renvoyes par lire_usb()
+    '''
+
+    def __init__(self, ouvrir, motifs=(), usb=()):
+        self.ouvrir = ouvrir
+        self.motifs = list(motifs)
+        self.usb = list(usb)
+        # Cartes déjà vues, déconnectées comprises : leurs compteurs
+        # survivent aux reconnexions
+        self.cartes = []
+        self._identites = {}
+        self._presentes = {}
+        self._peripheriques = None
+        self._ports_usb = {}
+
+    def scruter(self):
+        '''
+        Ports presents, par identite de carte
+
+        Retourne
+        --------
+        ports: dict
+               Identite -> port ; un port designe par --port a pour
+               identite son chemin
+        '''
+
+        ports = {}
+        if self.usb:
+            # La liste des ports USB coûte près d'une milliseconde : elle
+            # n'est refaite que si /dev a changé
+            peripheriques = _peripheriques()
+            if peripheriques is None or peripheriques != self._peripheriques:
+                self._ports_usb = ports_usb(self.usb)
+                self._peripheriques = peripheriques
+            ports.update(self._ports_usb)
+        usb = set(ports.values())
+        for port in ports_presents(self.motifs):
+            if port not in usb:
+                ports[port] = port
+        return ports
+
+    def _mettre_a_jour(self, ports, taches, reserve, vitesse, dictionnaire):
+        for identite, port in ports.items():
+            carte = self._identites.get(identite)
+            if carte is None:
+                carte = self._identites[identite] = Carte(port, None)
+                self.cartes.append(carte)
+                self._presentes[identite] = asyncio.Event()
+                taches.append(asyncio.create_task(self._superviser(carte, identite, reserve, vitesse, dictionnaire)))
+            # Une carte USB peut revenir sous un autre nom de port
+            if not carte.connectee:
+                carte.port = port
+            self._presentes[identite].set()
+        for identite, presente in self._presentes.items():
+            if identite not in ports:
+                presente.clear()
+
+    async def _superviser(self, carte, identite, reserve, vitesse, dictionnaire):
+        presente = self._presentes[identite]
+        delai = RECONNEXION_MIN
+        perte = None
+        while True:
+            if not presente.is_set():
+                # Le port a disparu : il sera ouvert dès son retour
+                await presente.wait()
+                delai = RECONNEXION_MIN
+            try:
+                carte.arduino = self.ouvrir(carte.port)
+            except (OSError, serial.SerialException) as erreur:
+                carte.erreurs[type(erreur).__name__] += 1
+                if delai == RECONNEXION_MIN:
+                    print(f"Impossible de se connecter sur {carte.port}, nouvel essai dans {delai:.2f} s : {erreur}")
+                await asyncio.sleep(delai)
+                delai = min(2 * delai, RECONNEXION_MAX)
+                continue
+
+            if perte is None:
+                print(f"Arduino connectée sur {carte.port} !")
+            else:
+                duree = time.monotonic() - perte
+                carte.retablissements.observer(duree)
+                print(f"Arduino reconnectée sur {carte.port}, {1000 * duree:.0f} ms après la déconnexion")
+
+            debut = time.monotonic()
+            try:
+                await servir_carte(carte, reserve, vitesse, dictionnaire)
+            finally:
+                try:
+                    carte.arduino.close()
+                except (OSError, serial.SerialException):
+                    pass
+            perte = time.monotonic()
+
+            # Une carte qui tombe aussitôt connectée n'est pas rouverte en
+            # boucle : l'attente ne repart du minimum qu'après une session
+            # d'une certaine durée
+            if perte - debut > RECONNEXION_MAX:
+                delai = RECONNEXION_MIN
+            else:
+                await asyncio.sleep(delai)
+                delai = min(2 * delai, RECONNEXION_MAX)
+
+    async def servir(self, reserve, vitesse=None, dictionnaire=None):
+        '''
+        Sert les cartes presentes et a venir, sans jamais s'arreter
+
+        Parametres
+        ----------
+        reserve: ReserveHistoires
+                 Reserve d'histoires partagee entre toutes les cartes, et
+                 gardee d'une connexion a l'autre
+        vitesse: int
+                 Vitesse a negocier avec chaque carte, en bauds
+        dictionnaire: Dictionnaire
+                      Dictionnaire des histoires codees
+        '''
+
+        taches = []
+        attente = False
+        try:
+            while True:
+                ports = self.scruter()
+                self._mettre_a_jour(ports, taches, reserve, vitesse, dictionnaire)
+                if not self.cartes and not attente:
+                    print("En attente d'une carte Arduino...")
+                    attente = True
+                for tache in taches:
+                    if tache.done() and not tache.cancelled() and tache.exception() is not None:
+                        raise tache.exception()
+                await asyncio.sleep(SCRUTATION)
+        finally:
+            for tache in taches:
+                tache.cancel()
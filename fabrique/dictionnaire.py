@@ -0,0 +1,293 @@
+# coding: utf-8
+
+"""
+Dictionnaire de compression des histoires pour la liaison série
+
+Les histoires reprennent sans cesse les mêmes morceaux : débuts des modèles
+(« Il etait une fois »), liaisons (« . Un jour, »), noms, adjectifs et verbes
+de la grammaire. Le dictionnaire donne aux plus rentables d'entre eux un code
+d'un octet, choisi parmi les octets que fabrique.ecran ne produit jamais. Une
+histoire codée tient en un seul paquet, qu'Arduino développe au fil du
+défilement grâce à la même table, gardée en mémoire flash (PROGMEM) dans le
+fichier dictionnaire.h généré par histoires.py --dictionnaire.
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import heapq
+import zlib
+
+
+# Moulinettes
+# ==============================================================================
+
+# Codes des mots : octets absents de la ROM A00 telle que l'utilise
+# convertir_lcd() (0x80-0xDE, puis les caractères de contrôle 0x01-0x1F)
+CODES = bytes(range(0x80, 0xDF)) + bytes(range(0x01, 0x20))
+
+# Nombre de textes de la grammaire pris en compte pour choisir les mots : les
+# textes les moins fréquents ne changent rien au choix et le ralentiraient
+TEXTES_MAX = 5000
+
+
+# Fréquence des textes de la grammaire
+# ------------------------------------------------------------------------------
+
+def _frequences(grammaire, racine):
+    # Nombre moyen d'apparitions de chaque noeud par histoire, quand chaque
+    # règle choisit ses alternatives au hasard, et probabilité qu'il ouvre
+    # l'histoire (son premier caractère est alors en majuscule)
+    nb_regles = grammaire.nb_regles
+    limite = grammaire.limite
+
+    def enfants(noeud):
+        if noeud < nb_regles:
+            return [grammaire.alternatives[i] for i in grammaire.plages[noeud]]
+        if noeud < limite:
+            return []
+        debut, fin = grammaire.bornes[noeud - limite]
+        return grammaire.enfants[debut:fin]
+
+    # Ordre topologique (la grammaire a été vérifiée sans cycle)
+    ordre = []
+    vus = set()
+    pile = [(grammaire.indices[racine], False)]
+    while pile:
+        noeud, termine = pile.pop()
+        if termine:
+            ordre.append(noeud)
+        elif noeud not in vus:
+            vus.add(noeud)
+            pile.append((noeud, True))
+            pile.extend((e, False) for e in enfants(noeud) if e not in vus)
+
+    apparitions = dict.fromkeys(ordre, 0.0)
+    premiers = dict.fromkeys(ordre, 0.0)
+    apparitions[grammaire.indices[racine]] = premiers[grammaire.indices[racine]] = 1.0
+    for noeud in reversed(ordre):
+        suivants = enfants(noeud)
+        if noeud < nb_regles:
+            for e in suivants:
+                apparitions[e] += apparitions[noeud] / len(suivants)
+                premiers[e] += premiers[noeud] / len(suivants)
+        elif suivants:
+            for e in suivants:
+                apparitions[e] += apparitions[noeud]
+            # Les enfants sont rangés à l'envers : le premier est le dernier
+            premiers[suivants[-1]] += premiers[noeud]
+
+    return {grammaire.terminaux[n - nb_regles]: (apparitions[n], premiers[n])
+            for n in ordre if nb_regles <= n < limite}
+
+
+def _textes(grammaire, racine):
+    # Textes tels qu'ils apparaissent dans les histoires, avec leur poids :
+    # précédés de l'espace qui les sépare du texte précédent (que
+    # corrections() retire devant une virgule ou un point), ou en majuscule
+    # au début de l'histoire
+    from .ecran import convertir_lcd
+
+    textes = []
+    for terminal, (apparitions, premiers) in _frequences(grammaire, racine).items():
+        texte = convertir_lcd(terminal)
+        if texte[:1] not in (b",", b"."):
+            texte = b" " + texte
+        textes.append((texte, apparitions - premiers))
+        if premiers:
+            debut = convertir_lcd(terminal[0].capitalize() + terminal[1:])
+            textes.append((debut, premiers))
+
+    textes.sort(key=lambda t: -t[1] * len(t[0]))
+    return textes[:TEXTES_MAX]
+
+
+# Dictionnaire
+# ------------------------------------------------------------------------------
+
+def _indexer(mots):
+    # Mots rangés par premier octet, les plus longs d'abord
+    index = {}
+    for code, mot in zip(CODES, mots):
+        index.setdefault(mot[0], []).append((mot, code))
+    for candidats in index.values():
+        candidats.sort(key=lambda m: -len(m[0]))
+    return index
+
+
+def _coder(texte, index):
+    codee = bytearray()
+    i = 0
+    while i < len(texte):
+        for mot, code in index.get(texte[i], ()):
+            if texte.startswith(mot, i):
+                codee.append(code)
+                i += len(mot)
+                break
+        else:
+            codee.append(texte[i])
+            i += 1
+    return bytes(codee)
+
+
+class Dictionnaire:
+    '''
+    Mots codes sur un octet pour la liaison serie
+
+    Parametres
+    ----------
+    mots: list
+          Mots (bytes dans le jeu de caracteres de l'ecran, voir
+          fabrique.ecran), au plus len(CODES) ; le i-ieme recoit le code
+          CODES[i]
+    '''
+
+    def __init__(self, mots):
+        if len(mots) > len(CODES):
+            raise ValueError(f"{len(mots)} mots, au plus {len(CODES)} dans un dictionnaire")
+        self.mots = list(mots)
+        self.identifiant = zlib.crc32(b"\0".join(self.mots)) & 0xFFFF
+        self._index = _indexer(self.mots)
+        self._developpes = {code: mot for code, mot in zip(CODES, self.mots)}
+
+    def coder(self, texte):
+        '''
+        Remplace les mots du dictionnaire par leurs codes
+
+        Parametres
+        ----------
+        texte: bytes
+               Texte dans le jeu de caracteres de l'ecran (convertir_lcd())
+
+        Retourne
+        --------
+        codee: bytes
+               Texte code, le mot le plus long etant choisi a chaque position
+        '''
+
+        return _coder(texte, self._index)
+
+    def developper(self, codee):
+        '''
+        Remplace les codes par leurs mots, comme le fait le croquis
+
+        Parametres
+        ----------
+        codee: bytes
+               Texte renvoye par coder()
+
+        Retourne
+        --------
+        texte: bytes
+               Texte d'origine
+        '''
+
+        developpes = self._developpes
+        return b"".join(developpes.get(octet) or bytes([octet]) for octet in codee)
+
+    def entete(self):
+        '''
+        Fichier d'en-tete C du dictionnaire, pour le croquis
+
+        Retourne
+        --------
+        entete: string
+                Identifiant, nombre de mots, texte des mots mis bout a
+                bout et debut de chacun, en memoire flash (PROGMEM)
+        '''
+
+        def chaine(mot):
+            # Échappements octaux : un échappement hexadécimal avalerait les
+            # chiffres hexadécimaux qui le suivent
+            return "".join(chr(o) if 0x20 <= o < 0x7F and o not in b'"\\?' else f"\\{o:03o}" for o in mot)
+
+        debuts = [0]
+        for mot in self.mots:
+            debuts.append(debuts[-1] + len(mot))
+
+        lignes = [
+            "// Dictionnaire de compression des histoires (voir fabrique/dictionnaire.py)",
+            "// Généré par python histoires.py --dictionnaire : ne pas modifier à la main,",
+            "// mais le régénérer quand la grammaire change",
+            "",
+            f"const unsigned int idDictionnaire = 0x{self.identifiant:04X};",
+            f"const byte nbMots = {len(self.mots)};",
+            "",
+            "const char texteMots[] PROGMEM =",
+        ]
+        lignes.extend(f'    "{chaine(mot)}"' for mot in self.mots)
+        lignes[-1] += ";" if self.mots else '    "";'
+        lignes.append("const unsigned int debutsMots[] PROGMEM = {")
+        lignes.extend(f"    {', '.join(map(str, debuts[i:i + 12]))}," for i in range(0, len(debuts), 12))
+        lignes.append("};")
+        return "\n".join(lignes) + "\n"
+
+
+def deriver_dictionnaire(grammaire, racine="AVENTURES", taille=len(CODES)):
+    '''
+    Choisit les mots du dictionnaire d'apres la grammaire compilee
+
+    Les mots candidats sont les suites de mots des textes de la grammaire.
+    Ils sont ajoutes un a un, en prenant chaque fois celui qui retire le
+    plus d'octets a une histoire moyenne compte tenu des mots deja choisis.
+
+    Parametres
+    ----------
+    grammaire: GrammaireCompilee
+               Grammaire des histoires
+    racine: string
+            Regle des histoires
+    taille: int
+            Nombre de mots, au plus len(CODES)
+
+    Retourne
+    --------
+    dictionnaire: Dictionnaire
+                  Dictionnaire, toujours le meme pour une meme grammaire
+    '''
+
+    textes = _textes(grammaire, racine)
+
+    contenants = {}
+    for k, (texte, _) in enumerate(textes):
+        mots = texte.split(b" ")
+        for i in range(len(mots)):
+            for j in range(i + 1, len(mots) + 1):
+                candidat = b" ".join(mots[i:j])
+                if i > 0:
+                    candidat = b" " + candidat
+                if len(candidat) >= 2:
+                    contenants.setdefault(candidat, set()).add(k)
+
+    # Choix glouton paresseux : le gain d'un mot ne peut que baisser quand
+    # d'autres sont choisis, il n'est recalculé que s'il arrive en tête
+    tas = [(-sum(textes[k][1] for k in ks) * (len(c) - 1), c) for c, ks in contenants.items()]
+    heapq.heapify(tas)
+
+    index = {}
+    couts = [len(texte) * poids for texte, poids in textes]
+    mots = []
+    while tas and len(mots) < taille:
+        _, candidat = heapq.heappop(tas)
+
+        essai = index.setdefault(candidat[0], [])
+        essai.append((candidat, CODES[len(mots)]))
+        essai.sort(key=lambda m: -len(m[0]))
+        nouveaux = {k: len(_coder(textes[k][0], index)) * textes[k][1] for k in contenants[candidat]}
+        essai.remove((candidat, CODES[len(mots)]))
+
+        gain = sum(couts[k] - cout for k, cout in nouveaux.items())
+        if gain <= 0:
+            continue
+        if tas and gain < -tas[0][0]:
+            heapq.heappush(tas, (-gain, candidat))
+            continue
+
+        essai.append((candidat, CODES[len(mots)]))
+        essai.sort(key=lambda m: -len(m[0]))
+        for k, cout in nouveaux.items():
+            couts[k] = cout
+        mots.append(candidat)
+
+    return Dictionnaire(mots)
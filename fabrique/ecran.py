@@ -0,0 +1,152 @@
+# coding: utf-8
+
+"""
+Rendu des histoires pour l'écran LCD
+
+L'histoire est découpée sur l'ordinateur en trames de la largeur de l'écran,
+déjà converties dans le jeu de caractères du contrôleur HD44780 (ROM A00, la
+plus courante). Chaque trame est envoyée dans un paquet (voir
+fabrique.protocole) au moment où elle doit s'afficher : Arduino n'a plus qu'à
+écrire 16 octets à l'écran, sans garder l'histoire en mémoire ni faire
+défiler la mémoire d'affichage, limitée à 40 caractères par ligne.
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import unicodedata
+
+
+# Moulinettes
+# ==============================================================================
+
+# Nombre de caractères de l'écran (lcd.begin(16, 1) dans le croquis)
+LARGEUR_ECRAN = 16
+
+# Rythme du défilement, le même que celui de l'ancien croquis : le début de
+# l'histoire reste affiché une seconde, puis le texte avance d'un caractère
+# toutes les 200 ms, et la fin reste affichée deux secondes
+PAUSE_DEBUT = 1.0
+PAS_DEFILEMENT = 0.2
+PAUSE_FIN = 2.0
+
+# Jeu de caractères de l'écran
+# ------------------------------------------------------------------------------
+
+# Caractères présents dans la ROM A00 du HD44780 hors ASCII, et caractères
+# ASCII que cette ROM affiche autrement (0x5C est un yen, 0x7E une flèche)
+_ROM_A00 = {
+    "ä": 0xE1, "ß": 0xE2, "µ": 0xE4, "ñ": 0xEE, "ö": 0xEF, "ü": 0xF5,
+    "°": 0xDF, "π": 0xF7, "÷": 0xFD,
+}
+_REMPLACEMENTS = {
+    "\\": "/", "~": "-", "œ": "oe", "Œ": "OE", "æ": "ae", "Æ": "AE",
+    "’": "'", "‘": "'", "«": '"', "»": '"', "“": '"', "”": '"',
+    "–": "-", "—": "-", "…": "...", "\u00a0": " ",
+}
+
+# Conversion déjà calculée de chaque caractère rencontré
+_conversions = {}
+
+
+def _convertir(caractere):
+    if caractere in _ROM_A00:
+        return bytes([_ROM_A00[caractere]])
+    if caractere in _REMPLACEMENTS:
+        return _REMPLACEMENTS[caractere].encode("ascii")
+    if " " <= caractere <= "}":
+        return caractere.encode("ascii")
+
+    # Lettre accentuée : la lettre sans ses accents (é -> e, Ç -> C)
+    base = unicodedata.normalize("NFD", caractere)[0]
+    if " " <= base <= "}":
+        return base.encode("ascii")
+    return b" " if unicodedata.category(caractere)[0] in "CZ" else b"?"
+
+
+def convertir_lcd(texte):
+    '''
+    Convertit un texte dans le jeu de caracteres de l'ecran
+
+    Parametres
+    ----------
+    texte: string or bytes
+           Texte a afficher (bytes : texte encode en UTF-8, comme le
+           renvoie corrections())
+
+    Retourne
+    --------
+    octets: bytes
+            Codes des caracteres de la ROM A00 du HD44780 ; les lettres
+            accentuees absentes de la ROM perdent leurs accents
+    '''
+
+    if isinstance(texte, bytes):
+        texte = texte.decode()
+
+    if texte.isascii() and "\\" not in texte and "~" not in texte and texte.isprintable():
+        return texte.encode("ascii")
+
+    morceaux = []
+    for caractere in texte:
+        if caractere not in _conversions:
+            _conversions[caractere] = _convertir(caractere)
+        morceaux.append(_conversions[caractere])
+    return b"".join(morceaux)
+
+
+# Découpage en trames
+# ------------------------------------------------------------------------------
+
+def trames(histoire, largeur=LARGEUR_ECRAN):
+    '''
+    Decoupe une histoire en trames a afficher l'une apres l'autre
+
+    Parametres
+    ----------
+    histoire: bytes
+              Histoire corrigee (voir corrections())
+    largeur: int
+             Nombre de caracteres de l'ecran
+
+    Retourne
+    --------
+    trames: list
+            (trame, duree) : trame de largeur octets, et duree en secondes
+            pendant laquelle elle reste affichee
+    '''
+
+    return decouper(convertir_lcd(histoire), largeur)
+
+
+def decouper(texte, largeur=LARGEUR_ECRAN):
+    '''
+    Decoupe un texte deja converti pour l'ecran, comme trames()
+
+    C'est aussi le defilement que fait le croquis d'une histoire recue
+    d'un seul paquet (voir fabrique.dictionnaire).
+
+    Parametres
+    ----------
+    texte: bytes
+           Texte dans le jeu de caracteres de l'ecran (convertir_lcd())
+    largeur: int
+             Nombre de caracteres de l'ecran
+
+    Retourne
+    --------
+    trames: list
+            (trame, duree), comme trames()
+    '''
+
+    if len(texte) <= largeur:
+        return [(texte.ljust(largeur), PAUSE_FIN)]
+
+    resultat = [(texte[:largeur], PAUSE_DEBUT)]
+    for debut in range(1, len(texte) - largeur + 1):
+        resultat.append((texte[debut:debut + largeur], PAS_DEFILEMENT))
+
+    trame, duree = resultat[-1]
+    resultat[-1] = (trame, duree + PAUSE_FIN)
+    return resultat
@@ -0,0 +1,258 @@
+# coding: utf-8
+
+"""
+Génération d'histoires en lot, sans Arduino
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import random
+import sys
+
+from . import moteur
+from .moteur import corrections, grammaire_compilee, grammaire_source
+
+
+# Moulinettes
+# ==============================================================================
+
+# Génération en lot
+# ------------------------------------------------------------------------------
+
+# Un lot est découpé en tranches de taille fixe, chacune tirée avec sa propre
+# graine dérivée de celle du lot : le résultat ne dépend donc pas du nombre de
+# processus qui se partagent les tranches.
+TAILLE_TRANCHE = 4096
+
+
+def graine_tranche(seed, tranche):
+    '''
+    Graine reproductible d'une tranche, derivee de la graine du lot
+
+    Parametres
+    ----------
+    seed: int
+          Graine du lot
+    tranche: int
+             Numero de la tranche dans le lot
+
+    Retourne
+    --------
+    graine: string
+            Graine a donner a random.Random (hachee par sha512, donc
+            identique d'un processus a l'autre)
+    '''
+
+    return f"{seed}/{tranche}"
+
+
+def generer_tranche(seed, tranche, n, uniforme=False):
+    '''
+    Génère les histoires d'une tranche
+
+    Parametres
+    ----------
+    seed: int
+          Graine du lot
+    tranche: int
+             Numero de la tranche dans le lot
+    n: int
+       Nombre d'histoires de la tranche
+    uniforme: bool
+              Tire les histoires uniformement (voir lancement())
+
+    Retourne
+    --------
+    histoires: list
+               Histoires corrigees de la tranche
+    '''
+
+    rng = random.Random(graine_tranche(seed, tranche))
+
+    if moteur._profil is not None:
+        histoire = moteur._profil.histoire
+        grammaire = grammaire_compilee()
+        return [histoire(grammaire, "AVENTURES", rng, uniforme) for _ in range(n)]
+
+    if uniforme:
+        tirer = grammaire_compilee().tirer_uniforme
+        return [corrections(tirer("AVENTURES", rng)) for _ in range(n)]
+
+    choix = rng.choice
+    developper = grammaire_compilee().developper
+    return [corrections(developper("AVENTURES", choix)) for _ in range(n)]
+
+
+def taille_tampon():
+    '''
+    Taille de tampon d'ecriture qui contient toujours une tranche entiere
+
+    Retourne
+    --------
+    taille: int
+            Nombre d'octets, d'apres la longueur maximale d'une histoire
+            calculee par l'analyse de la grammaire
+    '''
+
+    longueur = grammaire_compilee().longueur_max("AVENTURES")
+    return TAILLE_TRANCHE * (longueur + 1)
+
+
+def _tranche_texte(tache):
+    # Exécutée dans les processus du pool : on ne renvoie qu'un seul bloc
+    # d'octets pour limiter le coût des échanges entre processus
+    histoires = generer_tranche(*tache)
+    histoires.append(b"")
+    return b"\n".join(histoires)
+
+
+def taches_lot(n, seed, uniforme=False):
+    '''
+    Découpe un lot en tranches
+
+    Parametres
+    ----------
+    n: int
+       Nombre d'histoires a generer
+    seed: int
+          Graine du lot
+    uniforme: bool
+              Tire les histoires uniformement (voir lancement())
+
+    Retourne
+    --------
+    taches: generator
+            Arguments (seed, tranche, taille, uniforme) a passer a
+            generer_tranche()
+    '''
+
+    for tranche, debut in enumerate(range(0, n, TAILLE_TRANCHE)):
+        yield seed, tranche, min(TAILLE_TRANCHE, n - debut), uniforme
+
+
+def generer_lot(n, seed=None, uniforme=False):
+    '''
+    Génère un lot d'histoires sans passer par Arduino
+
+    Parametres
+    ----------
+    n: int
+       Nombre d'histoires a generer
+    seed: int
+          Graine du generateur aleatoire (le lot est alors reproductible)
+    uniforme: bool
+              Tire les histoires uniformement (voir lancement())
+
+    Retourne
+    --------
+    histoires: generator
+               Histoires corrigees
+    '''
+
+    if seed is None:
+        seed = random.randrange(2 ** 64)
+
+    for tache in taches_lot(n, seed, uniforme):
+        yield from generer_tranche(*tache)
+
+
+def _plage_texte(tache):
+    # Comme _tranche_texte, pour une plage de l'énumération des tirages
+    debut, n = tache
+    histoires = [corrections(t) for t in grammaire_compilee().enumerer(debut, debut + n)]
+    histoires.append(b"")
+    return b"\n".join(histoires)
+
+
+def ecrire_lot(n, sortie, seed=None, workers=1, debut=None, uniforme=False):
+    '''
+    Écrit un lot d'histoires, une par ligne, par tranches
+
+    Parametres
+    ----------
+    n: int
+       Nombre d'histoires a generer
+    sortie: file
+            Flux binaire dans lequel ecrire les histoires
+    seed: int
+          Graine du generateur aleatoire
+    workers: int
+             Nombre de processus generant les tranches en parallele (0 pour
+             un processus par coeur) ; la sortie est identique quel que soit
+             ce nombre
+    debut: int
+           Si precise, ecrit les tirages numerotes debut a debut + n - 1
+           (voir GrammaireCompilee.enumerer) au lieu de tirages aleatoires,
+           en s'arretant au dernier tirage de la grammaire
+    uniforme: bool
+              Tire les histoires uniformement (voir lancement()) ; sans
+              effet sur les tirages numerotes, refuse avec debut
+    '''
+
+    if debut is not None:
+        if debut < 0:
+            raise ValueError(f"Numéro de tirage négatif : {debut}")
+        if uniforme:
+            raise ValueError("debut et uniforme ne se combinent pas : les tirages numérotés ne sont pas aléatoires")
+        # La dernière plage d'un découpage en parts égales peut dépasser le
+        # nombre de tirages : elle s'arrête au dernier
+        fin = min(debut + n, grammaire_compilee().compter())
+        fonction = _plage_texte
+        taches = ((d, min(TAILLE_TRANCHE, fin - d))
+                  for d in range(debut, fin, TAILLE_TRANCHE))
+    else:
+        if seed is None:
+            seed = random.randrange(2 ** 64)
+        fonction = _tranche_texte
+        taches = taches_lot(n, seed, uniforme)
+
+    if workers == 1:
+        for tache in taches:
+            sortie.write(fonction(tache))
+        return
+
+    # Import tardif : seuls les lots parallèles en ont besoin
+    import multiprocessing
+
+    # Chaque processus doit utiliser la même grammaire que celui-ci, même
+    # s'il ne l'hérite pas par fork
+    with multiprocessing.Pool(workers or None,
+                              initializer=moteur.choisir_grammaire,
+                              initargs=(moteur._fichiers_grammaire,)) as pool:
+        # imap rend les tranches dans l'ordre, quel que soit le processus
+        # qui les a générées
+        for texte in pool.imap(fonction, taches):
+            sortie.write(texte)
+
+
+# Dénombrement des histoires
+# ------------------------------------------------------------------------------
+
+def _texte_modele(modele):
+    # Une séquence peut en contenir d'autres : elles s'enchaînent à plat,
+    # comme dans l'histoire
+    if isinstance(modele, list):
+        return " ".join(_texte_modele(element) for element in modele)
+    return modele
+
+
+def denombrement(sortie=sys.stdout):
+    '''
+    Affiche le nombre d'histoires possibles et la part de chaque modele
+
+    Parametres
+    ----------
+    sortie: file
+            Flux texte dans lequel ecrire le rapport
+    '''
+
+    grammaire = grammaire_compilee()
+
+    total = grammaire.compter("AVENTURES")
+    print(f"Histoires possibles : {total}", file=sortie)
+
+    contributions = grammaire.contributions("AVENTURES")
+    for i, (modele, nombre) in enumerate(zip(grammaire_source()["AVENTURES"], contributions)):
+        print(f"{i:4d} {nombre:>20d} {100 * nombre / total:6.2f} %  {_texte_modele(modele)}", file=sortie)
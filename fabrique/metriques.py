@@ -0,0 +1,315 @@
+# coding: utf-8
+
+"""
+Métriques du service des cartes, au format texte de Prometheus
+
+Les compteurs sont de simples attributs des objets qui les tiennent (Carte,
+ReserveHistoires, SurveillanceGrammaire), et les durées sont rangées dans des
+Histogramme : les enregistrer ne prend ni verrou ni entrée-sortie, et ne
+ralentit donc pas la boucle qui sert les cartes. Chaque métrique n'est
+modifiée que par un seul thread. Les métriques ne sont mises en forme qu'à la
+demande, dans un autre thread : par un petit serveur HTTP (servir_metriques)
+ou en réécrivant périodiquement un fichier pour le collecteur « textfile » de
+node_exporter (FichierMetriques).
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import bisect
+import collections
+import os
+import threading
+
+
+# Moulinettes
+# ==============================================================================
+
+# Bornes des histogrammes, en secondes
+BORNES_GENERATION = (0.00001, 0.00002, 0.00005, 0.0001, 0.0002, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.1, 1.0)
+BORNES_ECRITURE = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 5.0)
+BORNES_RECONNEXION = (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+# Histogrammes
+# ------------------------------------------------------------------------------
+
+class Histogramme:
+    '''
+    Repartition de durees par intervalles fixes, a la maniere de Prometheus
+
+    Parametres
+    ----------
+    bornes: tuple
+            Bornes superieures des intervalles, croissantes (une derniere
+            borne infinie est ajoutee)
+    '''
+
+    def __init__(self, bornes):
+        self.bornes = tuple(bornes)
+        self.comptes = [0] * (len(self.bornes) + 1)
+        self.somme = 0.0
+
+    def observer(self, valeur):
+        '''
+        Ajoute une valeur
+
+        Parametres
+        ----------
+        valeur: float
+                Duree en secondes
+        '''
+
+        self.comptes[bisect.bisect_left(self.bornes, valeur)] += 1
+        self.somme += valeur
+
+    @property
+    def nombre(self):
+        return sum(self.comptes)
+
+
+# Mise en forme
+# ------------------------------------------------------------------------------
+
+def _echapper(valeur):
+    return str(valeur).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _etiquettes(etiquettes):
+    if not etiquettes:
+        return ""
+    return "{" + ",".join(f'{nom}="{_echapper(valeur)}"' for nom, valeur in etiquettes.items()) + "}"
+
+
+def _valeur(valeur):
+    return repr(float(valeur)) if isinstance(valeur, float) else str(valeur)
+
+
+class _Texte:
+    # Lignes du format texte de Prometheus, une famille de métriques après
+    # l'autre
+    def __init__(self):
+        self.lignes = []
+
+    def famille(self, nom, nature, aide):
+        self.lignes.append(f"# HELP {nom} {aide}")
+        self.lignes.append(f"# TYPE {nom} {nature}")
+
+    def valeur(self, nom, valeur, **etiquettes):
+        self.lignes.append(f"{nom}{_etiquettes(etiquettes)} {_valeur(valeur)}")
+
+    def histogramme(self, nom, histogramme, **etiquettes):
+        cumul = 0
+        comptes = list(histogramme.comptes)
+        for borne, compte in zip(histogramme.bornes + (float("inf"),), comptes):
+            cumul += compte
+            le = "+Inf" if borne == float("inf") else repr(borne)
+            self.valeur(f"{nom}_bucket", cumul, **etiquettes, le=le)
+        self.valeur(f"{nom}_sum", histogramme.somme, **etiquettes)
+        self.valeur(f"{nom}_count", cumul, **etiquettes)
+
+
+def exposition(cartes, reserve=None, surveillance=None, fichier=None):
+    '''
+    Metriques au format texte de Prometheus
+
+    Parametres
+    ----------
+    cartes: list
+            Cartes servies (fabrique.serie.Carte)
+    reserve: ReserveHistoires
+             Reserve d'histoires, pour la duree de generation
+    surveillance: SurveillanceGrammaire
+                  Surveillance de la grammaire, pour les rechargements
+    fichier: FichierMetriques
+             Fichier des metriques, pour ses erreurs d'ecriture
+
+    Retourne
+    --------
+    texte: string
+           Metriques, version 0.0.4 du format texte
+    '''
+
+    cartes = list(cartes)
+    texte = _Texte()
+
+    compteurs = [
+        ("fabrique_appuis_total", "appuis", "Appuis sur le bouton"),
+        ("fabrique_histoires_servies_total", "histoires", "Histoires envoyées en entier"),
+        ("fabrique_histoires_abandonnees_total", "abandons", "Histoires abandonnées faute d'acquittement"),
+        ("fabrique_paquets_renvoyes_total", "retransmissions", "Paquets renvoyés faute d'acquittement"),
+        ("fabrique_octets_envoyes_total", "octets", "Octets écrits sur le port série"),
+        ("fabrique_connexions_total", "connexions", "Connexions à la carte, la première comprise"),
+    ]
+    for nom, attribut, aide in compteurs:
+        texte.famille(nom, "counter", aide)
+        for carte in cartes:
+            texte.valeur(nom, getattr(carte, attribut), port=carte.port)
+
+    texte.famille("fabrique_carte_connectee", "gauge", "1 si la carte est servie, 0 sinon")
+    for carte in cartes:
+        texte.valeur("fabrique_carte_connectee", int(carte.connectee), port=carte.port)
+
+    texte.famille("fabrique_erreurs_total", "counter", "Erreurs par origine et par type")
+    for carte in cartes:
+        for nature, nombre in sorted(dict(carte.erreurs).items()):
+            texte.valeur("fabrique_erreurs_total", nombre, origine=carte.port, type=nature)
+    if reserve is not None:
+        for nature, nombre in sorted(dict(reserve.erreurs).items()):
+            texte.valeur("fabrique_erreurs_total", nombre, origine="generation", type=nature)
+    if surveillance is not None:
+        for nature, nombre in sorted(dict(surveillance.erreurs).items()):
+            texte.valeur("fabrique_erreurs_total", nombre, origine="grammaire", type=nature)
+    if fichier is not None:
+        for nature, nombre in sorted(dict(fichier.erreurs).items()):
+            texte.valeur("fabrique_erreurs_total", nombre, origine="metriques", type=nature)
+
+    texte.famille("fabrique_ecriture_serie_secondes", "histogram",
+                  "Durée d'une écriture sur le port série, jusqu'au départ du dernier octet")
+    for carte in cartes:
+        texte.histogramme("fabrique_ecriture_serie_secondes", carte.ecritures, port=carte.port)
+
+    texte.famille("fabrique_reconnexion_secondes", "histogram",
+                  "Durée entre la perte d'une carte et sa reconnexion")
+    for carte in cartes:
+        texte.histogramme("fabrique_reconnexion_secondes", carte.retablissements, port=carte.port)
+
+    if reserve is not None:
+        texte.famille("fabrique_generation_secondes", "histogram", "Durée de génération d'une histoire")
+        texte.histogramme("fabrique_generation_secondes", reserve.generation)
+        texte.famille("fabrique_reserve_histoires", "gauge", "Histoires prêtes dans la réserve")
+        texte.valeur("fabrique_reserve_histoires", len(reserve))
+
+    if surveillance is not None:
+        texte.famille("fabrique_rechargements_total", "counter", "Rechargements réussis de la grammaire")
+        texte.valeur("fabrique_rechargements_total", surveillance.rechargements)
+
+    return "\n".join(texte.lignes) + "\n"
+
+
+# Publication
+# ------------------------------------------------------------------------------
+
+def servir_metriques(collecter, port, adresse="127.0.0.1"):
+    '''
+    Sert les metriques en HTTP (GET /metrics), dans un thread a part
+
+    Parametres
+    ----------
+    collecter: function
+               Fonction sans argument renvoyant les metriques (par exemple
+               lambda: exposition(cartes, reserve))
+    port: int
+          Port TCP d'ecoute (0 pour un port libre)
+    adresse: string
+             Adresse d'ecoute (par defaut, la machine seulement)
+
+    Retourne
+    --------
+    serveur: http.server.ThreadingHTTPServer
+             Serveur demarre ; server_address donne le port choisi et
+             shutdown() l'arrete
+    '''
+
+    # Imports tardifs : inutiles sans --metriques
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Requete(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            corps = collecter().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(corps)))
+            self.end_headers()
+            self.wfile.write(corps)
+
+        def log_message(self, format, *args):
+            pass
+
+    serveur = ThreadingHTTPServer((adresse, port), Requete)
+    serveur.daemon_threads = True
+    threading.Thread(target=serveur.serve_forever, name="metriques", daemon=True).start()
+    return serveur
+
+
+class FichierMetriques:
+    '''
+    Thread qui reecrit periodiquement les metriques dans un fichier
+
+    Le fichier est ecrit a cote puis renomme : le collecteur ne lit jamais
+    un fichier a moitie ecrit. Une ecriture ratee (disque plein, dossier
+    demonte...) est comptee dans erreurs et retentee a la periode suivante.
+
+    Parametres
+    ----------
+    collecter: function
+               Fonction sans argument renvoyant les metriques
+    fichier: string
+             Fichier a ecrire (extension .prom pour node_exporter)
+    periode: float
+             Duree en secondes entre deux ecritures
+    '''
+
+    def __init__(self, collecter, fichier, periode=15.0):
+        self.collecter = collecter
+        self.fichier = fichier
+        self.periode = periode
+        self._arret = threading.Event()
+        self._thread = threading.Thread(target=self._ecrire_toujours, name="metriques", daemon=True)
+        # Erreurs d'écriture par type, tenues par le thread
+        self.erreurs = collections.Counter()
+
+    def ecrire(self):
+        '''
+        Ecrit les metriques tout de suite
+        '''
+
+        temporaire = f"{self.fichier}.{os.getpid()}.tmp"
+        try:
+            with open(temporaire, "w", encoding="utf-8") as sortie:
+                sortie.write(self.collecter())
+            os.replace(temporaire, self.fichier)
+        except OSError:
+            try:
+                os.remove(temporaire)
+            except OSError:
+                pass
+            raise
+
+    def _essayer(self):
+        try:
+            self.ecrire()
+        except OSError as erreur:
+            self.erreurs[type(erreur).__name__] += 1
+            print(f"Écriture des métriques impossible : {erreur}")
+
+    def _ecrire_toujours(self):
+        while not self._arret.wait(self.periode):
+            self._essayer()
+
+    def demarrer(self):
+        '''
+        Ecrit les metriques une premiere fois et lance le thread
+
+        Retourne
+        --------
+        fichier: FichierMetriques
+                 Le fichier lui-meme
+        '''
+
+        self.ecrire()
+        self._thread.start()
+        return self
+
+    def arreter(self):
+        '''
+        Arrête le thread, apres une derniere ecriture
+        '''
+
+        self._arret.set()
+        self._thread.join()
+        self._essayer()
@@ -0,0 +1,636 @@
+# coding: utf-8
+
+"""
+Génération d'une histoire à partir de la grammaire
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import bisect
+import random
+
+
+# Moulinettes
+# ==============================================================================
+
+# Génération d'une histoire
+# ------------------------------------------------------------------------------
+
+def generation(grammaire, regle):
+    '''
+    Génère une histoire à partir de la grammaire
+
+    Parametres
+    ----------
+    grammaire: dict
+               Grammaire contenant les regles a suivre
+    regle: string
+           Regle contenue dans la grammaire
+
+    Retourne
+    --------
+    regle: string
+           Regle contenue dans la grammaire
+    texte: string
+           Texte final apres parcours de toutes les regles
+    '''
+
+    if isinstance(regle, list):
+        regles = (generation(grammaire, p) for p in regle)
+        texte = " ".join(p for p in regles if p)
+        return texte
+    elif regle in grammaire:
+        return generation(grammaire, random.choice(grammaire[regle]))
+    else:
+        return regle
+
+
+# Grammaire compilée
+# ------------------------------------------------------------------------------
+
+class GrammaireCompilee:
+    '''
+    Grammaire transformee une fois pour toutes en tables indexees par des
+    entiers, pour generer des histoires sans recursion ni recherche par nom
+
+    Chaque noeud recoit un identifiant entier :
+    - de 0 a nb_regles - 1 : les regles de la grammaire ;
+    - de nb_regles a limite - 1 : les terminaux (textes non vides) ;
+    - a partir de limite : les sequences, dont les enfants sont ranges a
+      l'envers dans un tableau plat pour etre empiles directement.
+
+    Les alternatives de toutes les regles sont rangees dans un seul tableau
+    plat ; plages[regle] donne l'intervalle qui leur correspond. Le tirage
+    se fait avec random.choice sur cet intervalle, ce qui consomme le
+    generateur aleatoire exactement comme generation().
+
+    Les longueurs extremes du texte de chaque regle, calculees par l'analyse
+    statique (voir fabrique.analyse), sont gardees avec les tables.
+
+    Parametres
+    ----------
+    grammaire: dict
+               Grammaire contenant les regles a suivre
+    longueurs: dict
+               Longueurs deja calculees par fabrique.analyse.longueurs()
+               (calculees ici si None)
+    '''
+
+    def __init__(self, grammaire, longueurs=None):
+        self.regles = list(grammaire)
+        self.indices = {regle: i for i, regle in enumerate(self.regles)}
+        self.nb_regles = len(self.regles)
+
+        self.terminaux = []
+        self._terminaux = {}
+        sequences = []
+
+        def noeud(element):
+            # Une regle est toujours designee par son nom
+            if isinstance(element, list):
+                enfants = []
+                for p in element:
+                    enfant = noeud(p)
+                    # Les sequences vides (dont le texte "") ne produisent rien
+                    if enfant[0] != "sequence" or enfant[1]:
+                        enfants.append(enfant)
+                if len(enfants) == 1:
+                    return enfants[0]
+                if enfants and all(e[0] == "terminal" for e in enfants):
+                    return ("terminal", " ".join(e[1] for e in enfants))
+                return ("sequence", enfants)
+            elif element in self.indices:
+                return ("regle", self.indices[element])
+            elif element:
+                return ("terminal", element)
+            else:
+                return ("sequence", [])
+
+        arbres = [[noeud(a) for a in grammaire[regle]] for regle in self.regles]
+
+        def identifiant(arbre):
+            nature, valeur = arbre
+            if nature == "regle":
+                return valeur
+            elif nature == "terminal":
+                if valeur not in self._terminaux:
+                    self._terminaux[valeur] = len(self.terminaux)
+                    self.terminaux.append(valeur)
+                return self.nb_regles + self._terminaux[valeur]
+            else:
+                sequences.append([identifiant(e) for e in valeur])
+                return -len(sequences)
+
+        alternatives = []
+        self.plages = []
+        for arbre in arbres:
+            debut = len(alternatives)
+            alternatives.extend(identifiant(a) for a in arbre)
+            self.plages.append(range(debut, len(alternatives)))
+
+        # Les sequences sont numerotees apres les terminaux, dont le nombre
+        # n'est connu qu'a la fin du parcours
+        self.limite = self.nb_regles + len(self.terminaux)
+
+        def renumerote(i):
+            return self.limite - i - 1 if i < 0 else i
+
+        self.alternatives = [renumerote(i) for i in alternatives]
+        self.enfants = []
+        self.bornes = []
+        for enfants in sequences:
+            debut = len(self.enfants)
+            self.enfants.extend(renumerote(i) for i in reversed(enfants))
+            self.bornes.append((debut, len(self.enfants)))
+
+        if longueurs is None:
+            from .analyse import longueurs as calculer_longueurs
+            longueurs = calculer_longueurs(grammaire)
+        self.longueurs = [longueurs[regle] for regle in self.regles]
+
+        self._preparer_denombrement()
+
+    def _preparer_denombrement(self):
+        # Dénombrement, calculé à la demande (voir compter())
+        self.nombres = [None] * (self.limite + len(self.bornes))
+        self.cumuls = [None] * self.nb_regles
+
+    def tables(self):
+        '''
+        Tables de la grammaire compilee, en types simples
+
+        Retourne
+        --------
+        tables: dict
+                Listes, tuples, chaines et entiers uniquement, que marshal
+                sait ecrire (voir fabrique.cache)
+        '''
+
+        return {
+            "regles": self.regles,
+            "terminaux": self.terminaux,
+            "alternatives": self.alternatives,
+            "plages": [(p.start, p.stop) for p in self.plages],
+            "enfants": self.enfants,
+            "bornes": self.bornes,
+            "longueurs": self.longueurs,
+        }
+
+    @classmethod
+    def depuis_tables(cls, tables):
+        '''
+        Reconstruit une grammaire compilee sans la recompiler
+
+        Parametres
+        ----------
+        tables: dict
+                Tables renvoyees par tables()
+
+        Retourne
+        --------
+        grammaire: GrammaireCompilee
+                   Grammaire identique a celle dont viennent les tables
+        '''
+
+        grammaire = cls.__new__(cls)
+        grammaire.regles = tables["regles"]
+        grammaire.indices = {regle: i for i, regle in enumerate(grammaire.regles)}
+        grammaire.nb_regles = len(grammaire.regles)
+        grammaire.terminaux = tables["terminaux"]
+        grammaire._terminaux = {t: i for i, t in enumerate(grammaire.terminaux)}
+        grammaire.limite = grammaire.nb_regles + len(grammaire.terminaux)
+        grammaire.alternatives = tables["alternatives"]
+        grammaire.plages = [range(debut, fin) for debut, fin in tables["plages"]]
+        grammaire.enfants = tables["enfants"]
+        grammaire.bornes = [tuple(b) for b in tables["bornes"]]
+        grammaire.longueurs = [None if b is None else tuple(b) for b in tables["longueurs"]]
+        grammaire._preparer_denombrement()
+        return grammaire
+
+    def longueur_max(self, regle="AVENTURES"):
+        '''
+        Longueur maximale d'une histoire, sans la recalculer
+
+        Parametres
+        ----------
+        regle: string
+               Regle de depart
+
+        Retourne
+        --------
+        longueur: int
+                  Nombre maximal d'octets d'une histoire corrigee (point
+                  final compris), ou None si la regle est recursive
+        '''
+
+        bornes = self.longueurs[self.indices[regle]]
+        return None if bornes is None else bornes[1] + 1
+
+    def developper(self, regle="AVENTURES", choix=None):
+        '''
+        Genere un texte a partir d'une regle, avec une pile explicite
+
+        Parametres
+        ----------
+        regle: string
+               Regle contenue dans la grammaire
+        choix: function
+               Fonction de tirage (par defaut random.choice)
+
+        Retourne
+        --------
+        texte: string
+               Texte identique a celui de generation() pour la meme graine
+        '''
+
+        if regle not in self.indices:
+            return regle
+
+        if choix is None:
+            choix = random.choice
+
+        nb_regles = self.nb_regles
+        limite = self.limite
+        terminaux = self.terminaux
+        alternatives = self.alternatives
+        plages = self.plages
+        enfants = self.enfants
+        bornes = self.bornes
+
+        morceaux = []
+        pile = [self.indices[regle]]
+        while pile:
+            noeud = pile.pop()
+            if noeud < nb_regles:
+                pile.append(alternatives[choix(plages[noeud])])
+            elif noeud < limite:
+                morceaux.append(terminaux[noeud - nb_regles])
+            else:
+                debut, fin = bornes[noeud - limite]
+                pile.extend(enfants[debut:fin])
+
+        return " ".join(morceaux)
+
+    def _denombrer(self, racine):
+        # Parcours en profondeur avec une pile explicite : un noeud n'est
+        # compté qu'une fois tous ses descendants comptés. Les nombres sont
+        # des entiers Python, donc sans limite de taille.
+        nombres = self.nombres
+        en_cours = set()
+        pile = [racine]
+        while pile:
+            noeud = pile[-1]
+            if nombres[noeud] is not None:
+                pile.pop()
+                continue
+
+            if noeud < self.nb_regles:
+                descendants = [self.alternatives[i] for i in self.plages[noeud]]
+            elif noeud < self.limite:
+                nombres[noeud] = 1
+                pile.pop()
+                continue
+            else:
+                debut, fin = self.bornes[noeud - self.limite]
+                descendants = self.enfants[debut:fin]
+
+            restants = [d for d in descendants if nombres[d] is None]
+            if restants:
+                if noeud in en_cours:
+                    regles = [self.regles[n] for n in en_cours if n < self.nb_regles]
+                    raise ValueError(f"Grammaire récursive, dénombrement infini : {', '.join(sorted(regles))}")
+                en_cours.add(noeud)
+                pile.extend(restants)
+                continue
+
+            en_cours.discard(noeud)
+            pile.pop()
+            if noeud < self.nb_regles:
+                cumul = [0]
+                for d in descendants:
+                    cumul.append(cumul[-1] + nombres[d])
+                self.cumuls[noeud] = cumul
+                nombres[noeud] = cumul[-1]
+            else:
+                nombre = 1
+                for d in descendants:
+                    nombre *= nombres[d]
+                nombres[noeud] = nombre
+
+        return nombres[racine]
+
+    def compter(self, regle="AVENTURES"):
+        '''
+        Nombre de tirages distincts possibles a partir d'une regle
+
+        Deux tirages differents peuvent donner le meme texte (par exemple
+        un adjectif vide et le modele sans adjectif) : le nombre obtenu est
+        celui des chemins de generation, qui majore le nombre de textes.
+
+        Parametres
+        ----------
+        regle: string
+               Regle contenue dans la grammaire
+
+        Retourne
+        --------
+        nombre: int
+                Nombre de tirages, calcule une seule fois par noeud
+        '''
+
+        if regle not in self.indices:
+            return 1
+        return self._denombrer(self.indices[regle])
+
+    def contributions(self, regle="AVENTURES"):
+        '''
+        Nombre de tirages apportes par chacune des alternatives d'une regle
+
+        Parametres
+        ----------
+        regle: string
+               Regle contenue dans la grammaire
+
+        Retourne
+        --------
+        nombres: list
+                 Nombre de tirages par alternative, dans l'ordre de la
+                 grammaire
+        '''
+
+        self.compter(regle)
+        cumul = self.cumuls[self.indices[regle]]
+        return [fin - debut for debut, fin in zip(cumul, cumul[1:])]
+
+    def histoire_numero(self, k, regle="AVENTURES"):
+        '''
+        Texte du k-ieme tirage, sans developper les autres
+
+        Les tirages sont numerotes dans l'ordre des alternatives de la
+        grammaire ; dans une sequence, le dernier element varie le plus vite.
+
+        Parametres
+        ----------
+        k: int
+           Numero du tirage, entre 0 et compter(regle) - 1
+        regle: string
+               Regle contenue dans la grammaire
+
+        Retourne
+        --------
+        texte: string
+               Texte correspondant, avant corrections
+        '''
+
+        if not 0 <= k < self.compter(regle):
+            raise IndexError(f"Tirage {k} hors de l'intervalle [0, {self.compter(regle)}[")
+
+        if regle not in self.indices:
+            return regle
+
+        nb_regles = self.nb_regles
+        limite = self.limite
+        nombres = self.nombres
+
+        morceaux = []
+        pile = [(self.indices[regle], k)]
+        while pile:
+            noeud, k = pile.pop()
+            if noeud < nb_regles:
+                cumul = self.cumuls[noeud]
+                i = bisect.bisect_right(cumul, k) - 1
+                pile.append((self.alternatives[self.plages[noeud][i]], k - cumul[i]))
+            elif noeud < limite:
+                morceaux.append(self.terminaux[noeud - nb_regles])
+            else:
+                # Les enfants sont rangés à l'envers : le premier traité
+                # est le dernier de la séquence, celui qui varie le plus vite
+                debut, fin = self.bornes[noeud - limite]
+                for enfant in self.enfants[debut:fin]:
+                    k, reste = divmod(k, nombres[enfant])
+                    pile.append((enfant, reste))
+
+        return " ".join(morceaux)
+
+    def enumerer(self, debut=0, fin=None, regle="AVENTURES"):
+        '''
+        Enumere paresseusement une plage de tirages
+
+        Parametres
+        ----------
+        debut: int
+               Numero du premier tirage
+        fin: int
+             Numero suivant le dernier tirage (par defaut, tous les tirages)
+        regle: string
+               Regle contenue dans la grammaire
+
+        Retourne
+        --------
+        textes: generator
+                Textes des tirages debut a fin - 1, avant corrections
+        '''
+
+        if fin is None:
+            fin = self.compter(regle)
+
+        for k in range(debut, fin):
+            yield self.histoire_numero(k, regle)
+
+    def tirer_uniforme(self, regle="AVENTURES", rng=random):
+        '''
+        Tire un texte uniformement parmi tous les tirages possibles
+
+        Contrairement a developper(), ou chaque alternative a la meme
+        chance d'etre choisie quel que soit le nombre de textes qu'elle
+        produit, chaque alternative est ici ponderee par son nombre de
+        tirages (voir compter()).
+
+        Parametres
+        ----------
+        regle: string
+               Regle contenue dans la grammaire
+        rng: random.Random
+             Generateur aleatoire (par defaut celui du module random)
+
+        Retourne
+        --------
+        texte: string
+               Texte tire, avant corrections
+        '''
+
+        return self.histoire_numero(rng.randrange(self.compter(regle)), regle)
+
+
+# Grammaire compilée à la première utilisation, puis gardée pour toutes les
+# suivantes : l'import du module reste quasi instantané
+_grammaire_compilee = None
+
+# Fichiers de grammaire choisis par choisir_grammaire(), HISTOIRES sinon
+_fichiers_grammaire = ()
+
+
+def choisir_grammaire(fichiers=()):
+    '''
+    Remplace la grammaire HISTOIRES par celle de fichiers
+
+    La grammaire n'est chargee qu'a la premiere histoire demandee.
+
+    Parametres
+    ----------
+    fichiers: list
+              Fichiers de grammaire (voir fabrique.chargement), ou liste
+              vide pour revenir a HISTOIRES
+    '''
+
+    global _grammaire_compilee, _fichiers_grammaire
+
+    _fichiers_grammaire = tuple(fichiers)
+    _grammaire_compilee = None
+
+
+def grammaire_source():
+    '''
+    Grammaire choisie, telle qu'ecrite dans sa source
+
+    Retourne
+    --------
+    grammaire: dict
+               HISTOIRES, ou la grammaire chargee depuis les fichiers
+               choisis par choisir_grammaire()
+    '''
+
+    if _fichiers_grammaire:
+        from .chargement import charger_grammaire
+        return charger_grammaire(*_fichiers_grammaire)
+
+    from .grammaire import HISTOIRES
+    return HISTOIRES
+
+
+def installer_grammaire(grammaire):
+    '''
+    Remplace la grammaire compilee utilisee par toutes les fonctions de
+    generation
+
+    Le remplacement est une simple affectation : une histoire en cours de
+    generation garde la grammaire avec laquelle elle a commence.
+
+    Parametres
+    ----------
+    grammaire: GrammaireCompilee
+               Nouvelle grammaire
+    '''
+
+    global _grammaire_compilee
+
+    _grammaire_compilee = grammaire
+
+
+# Profil alimenté par la génération (voir fabrique.profilage), None sinon
+_profil = None
+
+
+def installer_profil(profil):
+    '''
+    Active ou desactive le profil de la generation
+
+    Parametres
+    ----------
+    profil: Profil
+            Profil alimente par toutes les histoires generees ensuite, ou
+            None pour revenir a la generation sans instrumentation
+    '''
+
+    global _profil
+
+    _profil = profil
+
+
+def grammaire_compilee():
+    '''
+    Grammaire choisie, compilee au premier appel
+
+    Les tables sont lues dans le cache sur disque si la grammaire n'a pas
+    change depuis la derniere compilation (voir fabrique.cache).
+
+    Retourne
+    --------
+    grammaire: GrammaireCompilee
+               Grammaire compilee, partagee par tous les appelants
+    '''
+
+    global _grammaire_compilee
+
+    if _grammaire_compilee is None:
+        from . import cache
+        if _fichiers_grammaire:
+            _grammaire_compilee = cache.grammaire_fichiers(_fichiers_grammaire)
+        else:
+            _grammaire_compilee = cache.grammaire_histoires()
+    return _grammaire_compilee
+
+
+# Corrections éventuelles pour que le texte paraisse naturel
+# ------------------------------------------------------------------------------
+
+def corrections(texte):
+    '''
+    Corrections typographiques sur l'histoire
+
+    Parametres
+    ----------
+    texte: string
+           Texte issu des regles de la grammaire
+
+    Retourne
+    --------
+    histoire: string
+              Histoire corrigee et prete a etre affichee
+    '''
+
+    # Motifs littéraux : str.replace fait exactement ce que faisait re.sub,
+    # sans passer par le moteur d'expressions régulières
+    texte = texte.replace("' ", "'").replace(" ,", ",").replace(" .", ".")
+
+    # Point final, placé comme re.sub(r"$", ".", texte) le ferait
+    if texte.endswith("\n"):
+        texte = texte[:-1] + ".\n."
+    else:
+        texte += "."
+
+    histoire = texte[0].capitalize() + texte[1:]
+
+    return histoire.encode()
+
+
+# Lancement
+# ------------------------------------------------------------------------------
+
+def lancement(uniforme=False):
+    '''
+    Fonction d'exécution des histoires
+
+    Parametres
+    ----------
+    uniforme: bool
+              Tire l'histoire uniformement parmi toutes les histoires
+              possibles plutot que regle par regle
+
+    Retourne
+    --------
+    histoire: string
+              Histoire corrigee et prete a etre affichee
+    '''
+
+    if _profil is not None:
+        return _profil.histoire(grammaire_compilee(), "AVENTURES", uniforme=uniforme)
+
+    if uniforme:
+        texte = grammaire_compilee().tirer_uniforme("AVENTURES")
+    else:
+        texte = grammaire_compilee().developper("AVENTURES")
+    histoire = corrections(texte)
+    return histoire
@@ -0,0 +1,285 @@
+# coding: utf-8
+
+"""
+Profil de la génération des histoires, à activer à la demande
+
+Un profil installé par installer_profil() (voir fabrique.moteur) remplace le
+développement des histoires par une copie instrumentée de
+GrammaireCompilee.developper(), qui consomme le générateur aléatoire de la
+même façon : les histoires restent identiques pour une même graine. Il
+compte, pour chaque règle, ses développements, le temps passé à la
+développer (ses sous-règles comprises) et le nombre de fois que chacune de
+ses alternatives a été choisie, ainsi que la profondeur d'imbrication des
+règles et la taille de chaque histoire.
+
+Sans profil installé, la génération ne paie qu'un test par histoire. Le
+profil, lui, ralentit nettement la génération : les durées mesurées
+comprennent la lecture de l'horloge et servent à comparer les règles entre
+elles plutôt qu'à chiffrer la génération sans profil.
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import collections
+import random
+import threading
+import time
+
+from .moteur import corrections
+
+
+# Moulinettes
+# ==============================================================================
+
+# Compteurs d'une grammaire compilée
+# ------------------------------------------------------------------------------
+
+class _Compteurs:
+    # Compteurs indexés comme les tables d'une grammaire compilée : une
+    # grammaire rechargée a les siens, réunis par nom de règle dans le rapport
+    def __init__(self, grammaire):
+        self.grammaire = grammaire
+        self.durees = [0.0] * grammaire.nb_regles
+        self.choix = [[0] * len(plage) for plage in grammaire.plages]
+
+
+class _Accumulateur:
+    # Compteurs d'un thread : chaque thread qui génère alimente les siens,
+    # sous un verrou qu'il ne partage qu'avec la lecture du profil, et ne
+    # ralentit donc pas les autres
+    def __init__(self):
+        self.histoires = 0
+        self.uniformes = 0
+        self.duree_developpement = 0.0
+        self.duree_corrections = 0.0
+        self.tailles = collections.Counter()
+        self.profondeurs = collections.Counter()
+        self.compteurs = {}
+        self.verrou = threading.Lock()
+
+
+# Profil
+# ------------------------------------------------------------------------------
+
+class Profil:
+    '''
+    Compteurs de la generation des histoires
+
+    Un meme profil peut etre alimente par plusieurs threads (reserve
+    d'histoires, requetes du service HTTP) et lu pendant ce temps : chaque
+    thread a ses propres compteurs, reunis par regles() et exporter().
+    '''
+
+    def __init__(self):
+        self._locaux = threading.local()
+        self._accumulateurs = []
+        self._verrou = threading.Lock()
+
+    def _accumulateur(self):
+        accumulateur = getattr(self._locaux, "accumulateur", None)
+        if accumulateur is None:
+            accumulateur = self._locaux.accumulateur = _Accumulateur()
+            with self._verrou:
+                self._accumulateurs.append(accumulateur)
+        return accumulateur
+
+    def _releves(self):
+        # Accumulateurs de tous les threads, chacun lu sous son verrou
+        with self._verrou:
+            accumulateurs = list(self._accumulateurs)
+        for accumulateur in accumulateurs:
+            with accumulateur.verrou:
+                yield accumulateur
+
+    def _developper(self, compteurs, regle, choix):
+        # Copie de GrammaireCompilee.developper() : une règle développée
+        # empile, sous l'alternative choisie, un marqueur négatif dépilé une
+        # fois tous ses descendants développés
+        grammaire = compteurs.grammaire
+        if regle not in grammaire.indices:
+            return regle, 0
+
+        nb_regles = grammaire.nb_regles
+        limite = grammaire.limite
+        terminaux = grammaire.terminaux
+        alternatives = grammaire.alternatives
+        plages = grammaire.plages
+        enfants = grammaire.enfants
+        bornes = grammaire.bornes
+        durees = compteurs.durees
+        comptes = compteurs.choix
+        horloge = time.perf_counter
+
+        morceaux = []
+        debuts = []
+        profondeur = profondeur_max = 0
+        pile = [grammaire.indices[regle]]
+        while pile:
+            noeud = pile.pop()
+            if noeud < 0:
+                durees[-1 - noeud] += horloge() - debuts.pop()
+                profondeur -= 1
+            elif noeud < nb_regles:
+                profondeur += 1
+                if profondeur > profondeur_max:
+                    profondeur_max = profondeur
+                debuts.append(horloge())
+                plage = plages[noeud]
+                i = choix(plage)
+                comptes[noeud][i - plage.start] += 1
+                pile.append(-1 - noeud)
+                pile.append(alternatives[i])
+            elif noeud < limite:
+                morceaux.append(terminaux[noeud - nb_regles])
+            else:
+                debut, fin = bornes[noeud - limite]
+                pile.extend(enfants[debut:fin])
+
+        return " ".join(morceaux), profondeur_max
+
+    def histoire(self, grammaire, regle="AVENTURES", rng=random, uniforme=False):
+        '''
+        Genere une histoire en alimentant le profil
+
+        Parametres
+        ----------
+        grammaire: GrammaireCompilee
+                   Grammaire des histoires
+        regle: string
+               Regle de depart
+        rng: random.Random
+             Generateur aleatoire (par defaut celui du module random)
+        uniforme: bool
+                  Tire l'histoire uniformement (voir lancement()) : seules
+                  la taille et les durees sont alors comptees
+
+        Retourne
+        --------
+        histoire: bytes
+                  Histoire corrigee, identique a celle obtenue sans profil
+        '''
+
+        horloge = time.perf_counter
+        accumulateur = self._accumulateur()
+        with accumulateur.verrou:
+            debut = horloge()
+            if uniforme:
+                texte = grammaire.tirer_uniforme(regle, rng)
+                accumulateur.uniformes += 1
+            else:
+                compteurs = accumulateur.compteurs.get(grammaire)
+                if compteurs is None:
+                    compteurs = accumulateur.compteurs[grammaire] = _Compteurs(grammaire)
+                texte, profondeur = self._developper(compteurs, regle, rng.choice)
+                accumulateur.profondeurs[profondeur] += 1
+            milieu = horloge()
+            histoire = corrections(texte)
+            accumulateur.duree_developpement += milieu - debut
+            accumulateur.duree_corrections += horloge() - milieu
+            accumulateur.histoires += 1
+            accumulateur.tailles[len(histoire)] += 1
+        return histoire
+
+    def regles(self):
+        '''
+        Compteurs de chaque regle, toutes grammaires confondues
+
+        Retourne
+        --------
+        regles: dict
+                Nom de la regle -> (developpements, duree en secondes,
+                nombre de choix de chaque alternative)
+        '''
+
+        regles = {}
+        for accumulateur in self._releves():
+            for compteurs in accumulateur.compteurs.values():
+                noms = compteurs.grammaire.regles
+                for nom, duree, choix in zip(noms, compteurs.durees, compteurs.choix):
+                    if nom in regles and len(regles[nom][2]) == len(choix):
+                        _, avant, anciens = regles[nom]
+                        choix = [a + c for a, c in zip(anciens, choix)]
+                        duree += avant
+                    regles[nom] = (sum(choix), duree, list(choix))
+        return {nom: valeurs for nom, valeurs in regles.items() if valeurs[0]}
+
+    def exporter(self):
+        '''
+        Profil en types simples, a ecrire en JSON
+
+        Retourne
+        --------
+        profil: dict
+                Compteurs globaux, tailles et profondeurs (listes de paires
+                [valeur, nombre d'histoires]) et compteurs de chaque regle
+        '''
+
+        regles = self.regles()
+        total = _Accumulateur()
+        for accumulateur in self._releves():
+            total.histoires += accumulateur.histoires
+            total.uniformes += accumulateur.uniformes
+            total.duree_developpement += accumulateur.duree_developpement
+            total.duree_corrections += accumulateur.duree_corrections
+            total.tailles.update(accumulateur.tailles)
+            total.profondeurs.update(accumulateur.profondeurs)
+        return {
+            "histoires": total.histoires,
+            "uniformes": total.uniformes,
+            "duree_developpement_s": total.duree_developpement,
+            "duree_corrections_s": total.duree_corrections,
+            "tailles": sorted(total.tailles.items()),
+            "profondeurs": sorted(total.profondeurs.items()),
+            "regles": {nom: {"developpements": n, "duree_s": duree, "choix": choix}
+                       for nom, (n, duree, choix) in regles.items()},
+        }
+
+    def rapport(self, lignes=20):
+        '''
+        Resume du profil
+
+        Parametres
+        ----------
+        lignes: int
+                Nombre de regles affichees, les plus couteuses d'abord
+                (None pour toutes)
+
+        Retourne
+        --------
+        rapport: string
+                 Tailles, profondeurs et durees, puis une ligne par regle :
+                 developpements par histoire, duree, part de la duree de
+                 developpement et choix de l'alternative la moins et la plus
+                 tiree
+        '''
+
+        donnees = self.exporter()
+        n = donnees["histoires"]
+        if not n:
+            return "Profil : aucune histoire générée"
+
+        tailles = collections.Counter(dict(donnees["tailles"]))
+        texte = [f"Profil : {n} histoires ({donnees['uniformes']} tirées uniformément), "
+                 f"{1e6 * donnees['duree_developpement_s'] / n:.1f} µs de développement et "
+                 f"{1e6 * donnees['duree_corrections_s'] / n:.1f} µs de corrections par histoire",
+                 f"Taille : {min(tailles)} à {max(tailles)} octets, "
+                 f"{sum(t * k for t, k in tailles.items()) / n:.1f} en moyenne"]
+        if donnees["profondeurs"]:
+            profondeurs = dict(donnees["profondeurs"])
+            nombre = sum(profondeurs.values())
+            texte.append(f"Profondeur des règles : {sum(p * k for p, k in profondeurs.items()) / nombre:.1f} "
+                         f"en moyenne, {max(profondeurs)} au plus")
+
+        regles = sorted(donnees["regles"].items(), key=lambda r: -r[1]["duree_s"])
+        if regles:
+            total = donnees["duree_developpement_s"] or 1
+            texte.append(f"{'Règle':<24} {'par histoire':>12} {'durée':>10} {'part':>7}  choix des alternatives")
+            for nom, regle in regles[:lignes]:
+                choix = regle["choix"]
+                texte.append(f"{nom:<24} {regle['developpements'] / n:12.2f} {1000 * regle['duree_s']:8.2f} ms "
+                             f"{100 * regle['duree_s'] / total:6.1f} %  {len(choix)} : {min(choix)} à {max(choix)}")
+            if lignes is not None and len(regles) > lignes:
+                texte.append(f"... et {len(regles) - lignes} autres règles")
+        return "\n".join(texte)
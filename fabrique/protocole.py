@@ -0,0 +1,213 @@
+# coding: utf-8
+
+"""
+Protocole série entre l'ordinateur et Arduino
+
+Chaque message de l'ordinateur est un paquet :
+
+    STX | type | longueur | charge (longueur octets) | CRC-8
+
+Le CRC-8 (polynôme 0x07) porte sur le type, la longueur et la charge.
+Arduino répond à chaque paquet par ACK s'il est intact, par NAK sinon ; sans
+réponse dans le délai, ou après un NAK, l'ordinateur renvoie le paquet. La
+longueur étant connue, Arduino sait qu'un paquet est complet dès son dernier
+octet, sans attendre de délai de fin de lecture.
+
+Dans l'autre sens, Arduino envoie un octet REPOS à la fin de son démarrage,
+puis un octet APPUI à chaque appui sur le bouton, et rien d'autre que les
+acquittements. Le croquis d'origine (--affichage texte) envoyait l'état du
+bouton, REPOS ou APPUI, toutes les 100 ms.
+
+La liaison démarre à VITESSE_INITIALE. Pour l'accélérer, l'ordinateur envoie
+un paquet VITESSE portant la nouvelle vitesse (4 octets, petit-boutiste) ;
+Arduino l'acquitte à l'ancienne vitesse puis change. L'ordinateur change à
+son tour et renvoie le même paquet, à la nouvelle vitesse : sans cette
+confirmation dans la seconde, Arduino revient à VITESSE_INITIALE.
+
+Avec un dictionnaire (voir fabrique.dictionnaire), l'ordinateur envoie à la
+connexion un paquet DICTIONNAIRE portant l'identifiant du sien (2 octets) :
+Arduino l'acquitte si c'est aussi le sien, le refuse sinon. Chaque histoire
+est alors envoyée codée, d'un seul paquet HISTOIRE, et Arduino la fait
+défiler lui-même.
+"""
+
+
+# Moulinettes
+# ==============================================================================
+
+# Octets de contrôle
+STX = 0x02
+ACK = 0x06
+NAK = 0x15
+
+# Fin du démarrage et appui sur le bouton, envoyés par Arduino
+REPOS = 0x00
+APPUI = 0x01
+
+# Types de paquets
+TRAME = ord("T")
+FIN = ord("F")
+VITESSE = ord("V")
+HISTOIRE = ord("H")
+DICTIONNAIRE = ord("D")
+
+# Vitesse de la liaison au démarrage du croquis, en bauds
+VITESSE_INITIALE = 9600
+
+# Taille maximale de la charge d'un paquet, et d'une histoire codée (taille
+# du tampon du croquis)
+CHARGE_MAX = 255
+CHARGE_HISTOIRE = 128
+
+# Délai d'attente de l'acquittement, en secondes, compté une fois le paquet
+# parti (le temps de transmission dépend de la vitesse), et nombre d'envois
+# d'un paquet avant d'abandonner
+DELAI_ACQUITTEMENT = 0.25
+ESSAIS = 5
+
+# Attente maximale de l'octet REPOS de fin de démarrage, en secondes : une
+# carte qui ne redémarre pas à l'ouverture du port ne l'envoie pas
+DELAI_DEMARRAGE = 2.0
+
+
+# Somme de contrôle
+# ------------------------------------------------------------------------------
+
+def _table_crc8(polynome=0x07):
+    table = []
+    for octet in range(256):
+        crc = octet
+        for _ in range(8):
+            crc = ((crc << 1) ^ polynome if crc & 0x80 else crc << 1) & 0xFF
+        table.append(crc)
+    return bytes(table)
+
+
+_CRC8 = _table_crc8()
+
+
+def crc8(octets):
+    '''
+    CRC-8 (polynome 0x07, valeur initiale 0) d'une suite d'octets
+
+    Parametres
+    ----------
+    octets: bytes
+            Octets a controler
+
+    Retourne
+    --------
+    crc: int
+         Somme de controle sur un octet
+    '''
+
+    crc = 0
+    for octet in octets:
+        crc = _CRC8[crc ^ octet]
+    return crc
+
+
+# Paquets
+# ------------------------------------------------------------------------------
+
+def duree_transmission(taille, vitesse):
+    '''
+    Temps passe sur la ligne par des octets
+
+    Parametres
+    ----------
+    taille: int
+            Nombre d'octets
+    vitesse: int
+             Vitesse de la liaison, en bauds
+
+    Retourne
+    --------
+    duree: float
+           Duree en secondes (10 bits par octet : depart, 8 bits, arret)
+    '''
+
+    return 10 * taille / vitesse
+
+
+def paquet(type_paquet, charge=b""):
+    '''
+    Construit un paquet pret a envoyer
+
+    Parametres
+    ----------
+    type_paquet: int
+                 Type du paquet (TRAME, FIN...)
+    charge: bytes
+            Contenu du paquet, au plus CHARGE_MAX octets
+
+    Retourne
+    --------
+    paquet: bytes
+            Paquet complet, de STX au CRC
+    '''
+
+    if len(charge) > CHARGE_MAX:
+        raise ValueError(f"Charge de {len(charge)} octets, au plus {CHARGE_MAX} par paquet")
+    entete = bytes([type_paquet, len(charge)])
+    return bytes([STX]) + entete + charge + bytes([crc8(entete + charge)])
+
+
+class LecteurPaquets:
+    '''
+    Decodage incremental des paquets, cote Arduino (pour le simulateur)
+
+    Les octets recus sont donnes a lire() au fil de l'eau ; les octets qui
+    precedent un STX sont ignores, comme le fait le croquis.
+
+    Parametres
+    ----------
+    charge_max: int or dict
+                Longueur de charge au-dela de laquelle l'entete est tenue
+                pour abimee : le paquet est refuse aussitot et la lecture
+                reprend au STX suivant, au lieu d'avaler les paquets
+                suivants comme charge ({type: longueur} pour une longueur
+                par type de paquet, CHARGE_MAX pour les autres types)
+    '''
+
+    def __init__(self, charge_max=CHARGE_MAX):
+        self.charge_max = charge_max if isinstance(charge_max, dict) else {}
+        self.charge_defaut = CHARGE_MAX if isinstance(charge_max, dict) else charge_max
+        self.tampon = bytearray()
+
+    def lire(self, octets):
+        '''
+        Ajoute des octets recus et renvoie les paquets completes
+
+        Parametres
+        ----------
+        octets: bytes
+                Octets recus
+
+        Retourne
+        --------
+        paquets: list
+                 (type, charge) de chaque paquet intact, ou None a la
+                 place d'un paquet dont le CRC est faux
+        '''
+
+        self.tampon += octets
+        paquets = []
+        while True:
+            debut = self.tampon.find(STX)
+            if debut < 0:
+                self.tampon.clear()
+                return paquets
+            del self.tampon[:debut]
+            if len(self.tampon) >= 3 and self.tampon[2] > self.charge_max.get(self.tampon[1], self.charge_defaut):
+                del self.tampon[:1]
+                paquets.append(None)
+                continue
+            if len(self.tampon) < 3 or len(self.tampon) < 4 + self.tampon[2]:
+                return paquets
+
+            longueur = self.tampon[2]
+            contenu = bytes(self.tampon[1:3 + longueur])
+            crc = self.tampon[3 + longueur]
+            del self.tampon[:4 + longueur]
+            paquets.append((contenu[0], contenu[2:]) if crc8(contenu) == crc else None)
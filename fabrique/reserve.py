@@ -0,0 +1,186 @@
+# coding: utf-8
+
+"""
+Réserve d'histoires prêtes à envoyer, remplie en tâche de fond
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import collections
+import queue
+import threading
+import time
+
+from .metriques import BORNES_GENERATION, Histogramme
+
+
+# Moulinettes
+# ==============================================================================
+
+def _reveiller(attente):
+    # Appelée dans la boucle asyncio de celui qui attend
+    if not attente.done():
+        attente.set_result(None)
+
+
+# Réserve d'histoires prêtes à envoyer
+# ------------------------------------------------------------------------------
+
+class ReserveHistoires:
+    '''
+    File bornee d'histoires prêtes a envoyer, remplie en tache de fond
+
+    Un thread produit les histoires a l'avance : a l'appui sur le bouton, il
+    ne reste qu'a en retirer une de la file, sans attendre la generation.
+
+    Parametres
+    ----------
+    produire: function
+              Fonction sans argument renvoyant une histoire encodee
+              (par exemple lancement)
+    profondeur: int
+                Nombre maximal d'histoires gardees en reserve
+    cadence: float
+             Nombre maximal d'histoires produites par seconde (None pour
+             remplir la file aussi vite que possible)
+    '''
+
+    def __init__(self, produire, profondeur=8, cadence=None):
+        self.produire = produire
+        self.file = queue.Queue(maxsize=profondeur)
+        self.intervalle = 1 / cadence if cadence else 0
+        self._arret = threading.Event()
+        # Incrémentée par vider() : une histoire produite avant ne doit pas
+        # entrer dans la réserve après
+        self._version = 0
+        self._verrou = threading.Lock()
+        self._thread = threading.Thread(target=self._remplir, name="reserve-histoires", daemon=True)
+        # Attentes des boucles asyncio (voir prendre()), réveillées à chaque
+        # histoire déposée
+        self._attentes = set()
+        # Métriques (voir fabrique.metriques), tenues par le thread
+        self.generation = Histogramme(BORNES_GENERATION)
+        self.erreurs = collections.Counter()
+
+    def __len__(self):
+        return self.file.qsize()
+
+    def _remplir(self):
+        while not self._arret.is_set():
+            version = self._version
+            debut = time.perf_counter()
+            try:
+                histoire = self.produire()
+            except Exception as erreur:
+                # Une histoire ratée ne doit pas tarir la réserve : l'erreur
+                # est comptée et la production reprend un peu plus tard
+                self.erreurs[type(erreur).__name__] += 1
+                print(f"Erreur de génération : {erreur!r}")
+                self._arret.wait(1.0)
+                continue
+            self.generation.observer(time.perf_counter() - debut)
+            while not self._arret.is_set():
+                try:
+                    with self._verrou:
+                        if version == self._version:
+                            self.file.put(histoire, timeout=0.1)
+                    self._signaler()
+                    break
+                except queue.Full:
+                    pass
+            if self.intervalle:
+                self._arret.wait(self.intervalle)
+
+    def _signaler(self):
+        for boucle, attente in list(self._attentes):
+            try:
+                boucle.call_soon_threadsafe(_reveiller, attente)
+            except RuntimeError:
+                # Boucle déjà fermée
+                pass
+
+    def demarrer(self):
+        '''
+        Lance le thread de remplissage
+
+        Retourne
+        --------
+        reserve: ReserveHistoires
+                 La reserve elle-meme
+        '''
+
+        self._thread.start()
+        return self
+
+    def arreter(self):
+        '''
+        Arrête le thread de remplissage
+        '''
+
+        self._arret.set()
+        self._thread.join()
+
+    def vider(self):
+        '''
+        Jette les histoires en reserve, par exemple apres un changement de
+        grammaire ; celle en cours de production est jetee aussi
+        '''
+
+        with self._verrou:
+            self._version += 1
+            while True:
+                try:
+                    self.file.get_nowait()
+                except queue.Empty:
+                    break
+
+    def histoire(self, timeout=None):
+        '''
+        Retire une histoire de la reserve
+
+        Parametres
+        ----------
+        timeout: float
+                 Duree maximale d'attente si la reserve est vide
+
+        Retourne
+        --------
+        histoire: bytes
+                  Histoire prête a envoyer
+        '''
+
+        return self.file.get(timeout=timeout)
+
+    async def prendre(self):
+        '''
+        Retire une histoire de la reserve depuis une boucle asyncio
+
+        Retourne
+        --------
+        histoire: bytes
+                  Histoire prête a envoyer ; si la reserve est vide,
+                  l'attente se fait dans la boucle, sans occuper de thread,
+                  et peut etre annulee sans perdre d'histoire
+        '''
+
+        # Déjà chargé puisqu'une boucle tourne : l'import ne coûte rien ici,
+        # alors qu'en tête de module il ralentirait l'import de la réserve
+        import asyncio
+
+        boucle = asyncio.get_running_loop()
+        while True:
+            try:
+                return self.file.get_nowait()
+            except queue.Empty:
+                pass
+            attente = (boucle, boucle.create_future())
+            self._attentes.add(attente)
+            try:
+                # Une histoire déposée avant l'inscription n'a réveillé
+                # personne : la file est relue avant d'attendre
+                if self.file.empty():
+                    await attente[1]
+            finally:
+                self._attentes.discard(attente)
@@ -0,0 +1,462 @@
+# coding: utf-8
+
+"""
+Communication avec les cartes Arduino
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import asyncio
+import collections
+import threading
+import time
+
+import serial
+
+from .protocole import (ACK, APPUI, CHARGE_HISTOIRE, DELAI_ACQUITTEMENT, DELAI_DEMARRAGE, DICTIONNAIRE, ESSAIS,
+                        FIN, HISTOIRE, NAK, TRAME, VITESSE, paquet)
+from .metriques import BORNES_ECRITURE, BORNES_RECONNEXION, Histogramme
+
+
+# Moulinettes
+# ==============================================================================
+
+# Service de plusieurs cartes Arduino
+# ------------------------------------------------------------------------------
+
+class Carte:
+    '''
+    Une carte Arduino servie par servir_carte(), et son etat ; le
+    gestionnaire des cartes (fabrique.connexions.GestionnaireCartes) la
+    garde d'une connexion a l'autre
+
+    Parametres
+    ----------
+    port: string
+          Port sur lequel se trouve la carte
+    arduino: serial.Serial
+             Connexion avec la carte (ou tout objet ayant les memes
+             methodes read, write et in_waiting)
+    '''
+
+    def __init__(self, port, arduino):
+        self.port = port
+        self.arduino = arduino
+        self.appuis = 0
+        self.histoires = 0
+        self.abandons = 0
+        self.retransmissions = 0
+        self.octets = 0
+        self.connexions = 0
+        self.connectee = False
+        self.dernier_appui = None
+        # Métriques (voir fabrique.metriques) : erreurs par type, durées
+        # des écritures sur le port et des reconnexions
+        self.erreurs = collections.Counter()
+        self.ecritures = Histogramme(BORNES_ECRITURE)
+        self.retablissements = Histogramme(BORNES_RECONNEXION)
+        # La carte a le même dictionnaire que l'ordinateur
+        self.compression = False
+        # Files remplies par lire_carte(), créées dans la boucle asyncio
+        self.appuis_recus = None
+        self.acquittements = None
+        self.vivante = None
+
+    def __str__(self):
+        texte = f"{self.port} : {self.appuis} appuis, {self.histoires} histoires"
+        if self.abandons:
+            texte += f", {self.abandons} histoires abandonnées"
+        if self.retransmissions:
+            texte += f", {self.retransmissions} paquets renvoyés"
+        return texte
+
+    def recevoir(self, octets):
+        '''
+        Repartit des octets recus entre les appuis et les acquittements
+
+        Parametres
+        ----------
+        octets: bytes
+                Octets lus sur le port
+        '''
+
+        self.vivante.set()
+        if ACK in octets or NAK in octets:
+            for octet in octets:
+                if octet == ACK or octet == NAK:
+                    self.acquittements.put_nowait(octet)
+        if APPUI in octets:
+            self.appuis_recus.put_nowait(None)
+
+    def erreur(self, erreur):
+        '''
+        Transmet une erreur de lecture a ceux qui attendent la carte
+
+        Parametres
+        ----------
+        erreur: Exception
+                Erreur a relever dans appuis() et envoyer()
+        '''
+
+        self.appuis_recus.put_nowait(erreur)
+        self.acquittements.put_nowait(erreur)
+
+
+async def octets_recus(carte):
+    '''
+    Octets recus d'une carte, au fil de leur arrivee
+
+    Si le port a un descripteur de fichier (ports serie et pseudo-terminaux
+    sous Linux et macOS), la boucle asyncio est prevenue directement de
+    l'arrivee d'octets, et la lecture se fait sans attente (timeout=0).
+    Sinon, un thread dedie a la carte attend les octets avec une lecture
+    bloquante et les transmet a la boucle.
+
+    Parametres
+    ----------
+    carte: Carte
+           Carte a lire
+
+    Retourne
+    --------
+    octets: async generator
+            Blocs d'octets, tels que lus sur le port
+    '''
+
+    loop = asyncio.get_running_loop()
+    arduino = carte.arduino
+
+    try:
+        fd = arduino.fileno()
+        arrivee = asyncio.Event()
+        loop.add_reader(fd, arrivee.set)
+    except (AttributeError, NotImplementedError, OSError, ValueError):
+        fd = None
+
+    if fd is None:
+        blocs = asyncio.Queue()
+
+        def surveiller():
+            try:
+                while True:
+                    octets = arduino.read(max(1, arduino.in_waiting))
+                    loop.call_soon_threadsafe(blocs.put_nowait, octets)
+            except Exception as erreur:
+                loop.call_soon_threadsafe(blocs.put_nowait, erreur)
+
+        arduino.timeout = None
+        threading.Thread(target=surveiller, name=f"lecture-{carte.port}", daemon=True).start()
+        while True:
+            octets = await blocs.get()
+            if isinstance(octets, Exception):
+                raise octets
+            yield octets
+
+    arduino.timeout = 0
+    try:
+        while True:
+            await arrivee.wait()
+            arrivee.clear()
+            octets = arduino.read(max(1, arduino.in_waiting))
+            if octets:
+                yield octets
+    finally:
+        loop.remove_reader(fd)
+
+
+async def lire_carte(carte):
+    '''
+    Lit une carte en continu et repartit ce qu'elle envoie
+
+    La lecture tourne a cote de l'envoi des histoires : les acquittements
+    sont recus pendant qu'une histoire est envoyee.
+
+    Parametres
+    ----------
+    carte: Carte
+           Carte a lire
+    '''
+
+    try:
+        async for octets in octets_recus(carte):
+            carte.recevoir(octets)
+    except (OSError, serial.SerialException) as erreur:
+        carte.erreur(erreur)
+
+
+async def appuis(carte):
+    '''
+    Appuis successifs sur le bouton d'une carte
+
+    Parametres
+    ----------
+    carte: Carte
+           Carte dont on surveille le bouton, lue par lire_carte()
+
+    Retourne
+    --------
+    appuis: async generator
+            Un element par appui
+    '''
+
+    while True:
+        signal = await carte.appuis_recus.get()
+        if signal is not None:
+            raise signal
+        yield
+
+
+# Envoi des histoires
+# ------------------------------------------------------------------------------
+
+async def ecrire(carte, donnees):
+    '''
+    Ecrit des octets d'un seul bloc et attend qu'ils soient partis
+
+    L'attente (tcdrain) se fait dans un thread, pour ne pas bloquer la
+    boucle qui sert les autres cartes. Si le port a ete ouvert avec un
+    write_timeout, une ecriture bloquee leve serial.SerialTimeoutException.
+
+    Parametres
+    ----------
+    carte: Carte
+           Carte destinataire
+    donnees: bytes
+             Octets a envoyer
+    '''
+
+    debut = time.perf_counter()
+    carte.arduino.write(donnees)
+    await asyncio.get_running_loop().run_in_executor(None, carte.arduino.flush)
+    carte.ecritures.observer(time.perf_counter() - debut)
+    carte.octets += len(donnees)
+
+
+async def transmettre(carte, donnees):
+    '''
+    Envoie un paquet et attend son acquittement, en le renvoyant si besoin
+
+    Parametres
+    ----------
+    carte: Carte
+           Carte destinataire, lue par lire_carte()
+    donnees: bytes
+             Paquet construit par fabrique.protocole.paquet()
+
+    Retourne
+    --------
+    acquitte: bool
+              False si la carte n'a pas acquitte le paquet apres ESSAIS
+              envois
+    '''
+
+    for _ in range(ESSAIS):
+        # Un acquittement arrivé en retard pour un envoi précédent ne vaut
+        # pas pour celui-ci
+        while not carte.acquittements.empty():
+            reponse = carte.acquittements.get_nowait()
+            if isinstance(reponse, Exception):
+                raise reponse
+
+        await ecrire(carte, donnees)
+        try:
+            reponse = await asyncio.wait_for(carte.acquittements.get(), DELAI_ACQUITTEMENT)
+        except asyncio.TimeoutError:
+            reponse = None
+
+        if isinstance(reponse, Exception):
+            raise reponse
+        if reponse == ACK:
+            return True
+        carte.retransmissions += 1
+
+    return False
+
+
+async def envoyer(carte, histoire):
+    '''
+    Envoie une histoire a une carte
+
+    Parametres
+    ----------
+    carte: Carte
+           Carte destinataire
+    histoire: bytes, list or tuple
+              Texte brut pour les anciens croquis qui font defiler le
+              texte eux-memes, trames (trame, duree) rendues par
+              fabrique.ecran.trames(), envoyees chacune dans un paquet au
+              moment de l'afficher, ou (histoire codee, trames) : l'histoire
+              codee par fabrique.dictionnaire est envoyee d'un seul paquet
+              aux cartes qui ont le dictionnaire, les trames aux autres
+    '''
+
+    if isinstance(histoire, bytes):
+        await ecrire(carte, histoire)
+        return
+
+    if isinstance(histoire, tuple):
+        codee, histoire = histoire
+        if carte.compression and len(codee) <= CHARGE_HISTOIRE:
+            # La carte fait défiler l'histoire elle-même, au même rythme
+            if not await transmettre(carte, paquet(HISTOIRE, codee)):
+                carte.abandons += 1
+                print(f"Histoire abandonnée sur {carte.port} : histoire non acquittée")
+            return
+
+    loop = asyncio.get_running_loop()
+    echeance = loop.time()
+    for trame, duree in histoire:
+        if not await transmettre(carte, paquet(TRAME, trame)):
+            carte.abandons += 1
+            print(f"Histoire abandonnée sur {carte.port} : trame non acquittée")
+            return
+        # Les échéances sont absolues : le temps d'envoi et d'acquittement
+        # ne s'ajoute pas à la durée d'affichage
+        echeance += duree
+        await asyncio.sleep(max(0, echeance - loop.time()))
+    await transmettre(carte, paquet(FIN))
+
+
+# Vitesse de la liaison
+# ------------------------------------------------------------------------------
+
+async def demarrage(carte):
+    '''
+    Attend que la carte ait fini de demarrer
+
+    La carte redemarre a l'ouverture du port et envoie un octet REPOS une
+    fois prete ; les paquets envoyes avant seraient perdus. Une carte qui ne
+    redemarre pas a l'ouverture (ou un ancien croquis deja lance) n'envoie
+    rien : on ne l'attend pas plus de DELAI_DEMARRAGE.
+
+    Parametres
+    ----------
+    carte: Carte
+           Carte lue par lire_carte()
+    '''
+
+    try:
+        await asyncio.wait_for(carte.vivante.wait(), DELAI_DEMARRAGE)
+    except asyncio.TimeoutError:
+        pass
+
+
+async def negocier(carte, vitesse):
+    '''
+    Passe la liaison a une autre vitesse, des deux cotes
+
+    La carte acquitte le paquet VITESSE a l'ancienne vitesse et change ; le
+    port change ensuite et renvoie le paquet a la nouvelle vitesse pour
+    confirmer. Si la confirmation n'est pas acquittee, le port revient a
+    l'ancienne vitesse, comme la carte le fait d'elle-meme.
+
+    Parametres
+    ----------
+    carte: Carte
+           Carte lue par lire_carte()
+    vitesse: int
+             Vitesse voulue, en bauds
+
+    Retourne
+    --------
+    vitesse: int
+             Vitesse de la liaison a l'issue de la negociation
+    '''
+
+    arduino = carte.arduino
+    ancienne = arduino.baudrate
+    if vitesse == ancienne:
+        return ancienne
+
+    await demarrage(carte)
+
+    demande = paquet(VITESSE, vitesse.to_bytes(4, "little"))
+    if not await transmettre(carte, demande):
+        return ancienne
+
+    # Laisse à la carte le temps de finir d'envoyer l'ACK et de changer
+    await asyncio.sleep(0.01)
+    arduino.baudrate = vitesse
+    if await transmettre(carte, demande):
+        # Des octets reçus pendant le changement ont pu être mal lus
+        carte.appuis_recus = asyncio.Queue()
+        return vitesse
+
+    arduino.baudrate = ancienne
+    return ancienne
+
+
+async def reconnaitre_dictionnaire(carte, dictionnaire):
+    '''
+    Demande a une carte si elle a le meme dictionnaire
+
+    Parametres
+    ----------
+    carte: Carte
+           Carte lue par lire_carte()
+    dictionnaire: Dictionnaire
+                  Dictionnaire de l'ordinateur
+
+    Retourne
+    --------
+    reconnu: bool
+             True si la carte a acquitte l'identifiant du dictionnaire
+    '''
+
+    await demarrage(carte)
+    renvois = carte.retransmissions
+    reconnu = await transmettre(carte, paquet(DICTIONNAIRE, dictionnaire.identifiant.to_bytes(2, "little")))
+    # Le refus d'un autre dictionnaire n'est pas une erreur de transmission
+    carte.retransmissions = renvois
+    return reconnu
+
+
+async def servir_carte(carte, reserve, vitesse=None, dictionnaire=None):
+    '''
+    Envoie une histoire a une carte a chaque appui sur son bouton
+
+    Parametres
+    ----------
+    carte: Carte
+           Carte a servir
+    reserve: ReserveHistoires
+             Reserve d'histoires partagee entre toutes les cartes
+    vitesse: int
+             Vitesse a negocier avec la carte, en bauds (None pour garder
+             celle de l'ouverture du port, par exemple pour un ancien
+             croquis qui ne connait pas les paquets)
+    dictionnaire: Dictionnaire
+                  Dictionnaire des histoires codees ; les cartes qui ne
+                  l'ont pas recoivent les trames
+    '''
+
+    carte.appuis_recus = asyncio.Queue()
+    carte.acquittements = asyncio.Queue()
+    carte.vivante = asyncio.Event()
+    lecture = asyncio.create_task(lire_carte(carte))
+    carte.connexions += 1
+    carte.connectee = True
+
+    try:
+        if vitesse is not None:
+            obtenue = await negocier(carte, vitesse)
+            if obtenue != vitesse:
+                print(f"{carte.port} : {vitesse} bauds refusés, la liaison reste à {obtenue} bauds")
+        if dictionnaire is not None:
+            carte.compression = await reconnaitre_dictionnaire(carte, dictionnaire)
+            if not carte.compression:
+                print(f"{carte.port} : dictionnaire différent, histoires envoyées en trames")
+
+        async for _ in appuis(carte):
+            carte.appuis += 1
+            carte.dernier_appui = time.monotonic()
+            await envoyer(carte, await reserve.prendre())
+            carte.histoires += 1
+    except (OSError, serial.SerialException) as erreur:
+        carte.erreurs[type(erreur).__name__] += 1
+        print(f"Erreur sur {carte.port}, carte déconnectée : {erreur}")
+    finally:
+        carte.connectee = False
+        lecture.cancel()
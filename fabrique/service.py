@@ -0,0 +1,149 @@
+# coding: utf-8
+
+"""
+Service HTTP des histoires, pour d'autres programmes que la carte Arduino
+
+GET /histoire
+    Une histoire, prise dans une réserve générée à l'avance (voir
+    fabrique.reserve) : {"histoire": "..."}.
+
+GET /histoires?n=1000[&seed=42][&uniforme=1]
+    Un lot de n histoires, tableau JSON envoyé au fil de sa génération
+    (réponse « chunked »), tranche par tranche : même un très grand lot ne
+    tient jamais entier en mémoire. Avec seed, le lot est celui de
+    python histoires.py --batch n --seed 42.
+
+format=texte renvoie le texte brut à la place du JSON, une histoire par
+ligne. Les connexions restent ouvertes d'une requête à l'autre (HTTP/1.1),
+et chaque client est servi par son propre thread.
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import json
+import queue
+import random
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .lot import generer_tranche, taches_lot
+
+
+# Moulinettes
+# ==============================================================================
+
+# Nombre maximal d'histoires d'un lot
+LOT_MAX = 10_000_000
+
+# Attente maximale d'une histoire quand la réserve est vide, en secondes
+ATTENTE_MAX = 5.0
+
+
+class _Requete(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "PetiteFabrique"
+    # En-têtes et corps partent d'un seul envoi, sans attendre l'acquittement
+    # du paquet précédent (algorithme de Nagle)
+    disable_nagle_algorithm = True
+    wbufsize = 64 * 1024
+
+    def log_message(self, format, *args):
+        pass
+
+    def _repondre(self, corps, type_contenu, code=200):
+        self.send_response(code)
+        self.send_header("Content-Type", type_contenu)
+        self.send_header("Content-Length", str(len(corps)))
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def _erreur(self, code, message):
+        self._repondre(json.dumps({"erreur": message}, ensure_ascii=False).encode(),
+                       "application/json; charset=utf-8", code)
+
+    def do_GET(self):
+        adresse = urlsplit(self.path)
+        parametres = {cle: valeurs[-1] for cle, valeurs in parse_qs(adresse.query).items()}
+        texte = parametres.get("format") == "texte"
+
+        if adresse.path == "/histoire":
+            try:
+                histoire = self.server.reserve.histoire(timeout=ATTENTE_MAX)
+            except queue.Empty:
+                self._erreur(503, "réserve d'histoires vide")
+                return
+            if texte:
+                self._repondre(histoire + b"\n", "text/plain; charset=utf-8")
+            else:
+                self._repondre(json.dumps({"histoire": histoire.decode()}, ensure_ascii=False).encode(),
+                               "application/json; charset=utf-8")
+        elif adresse.path == "/histoires":
+            try:
+                n = int(parametres.get("n", "1"))
+                seed = int(parametres["seed"]) if "seed" in parametres else random.randrange(2 ** 64)
+            except ValueError:
+                self._erreur(400, "n et seed doivent être des entiers")
+                return
+            if not 0 <= n <= LOT_MAX:
+                self._erreur(400, f"n doit être compris entre 0 et {LOT_MAX}")
+                return
+            uniforme = parametres.get("uniforme", self.server.uniforme) not in (False, "0", "")
+            try:
+                self._lot(n, seed, uniforme, texte)
+            except (BrokenPipeError, ConnectionResetError):
+                # Client parti au milieu du lot
+                self.close_connection = True
+        else:
+            self._erreur(404, "chemins : /histoire, /histoires?n=N")
+
+    def _morceau(self, donnees):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(donnees), donnees))
+        self.wfile.flush()
+
+    def _lot(self, n, seed, uniforme, texte):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8" if texte else "application/json; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        premier = True
+        if not texte:
+            self._morceau(b"[")
+        for tache in taches_lot(n, seed, uniforme):
+            histoires = generer_tranche(*tache)
+            if texte:
+                histoires.append(b"")
+                self._morceau(b"\n".join(histoires))
+            else:
+                morceau = ",\n".join(json.dumps(h.decode(), ensure_ascii=False) for h in histoires).encode()
+                self._morceau(morceau if premier else b",\n" + morceau)
+            premier = False
+        if not texte:
+            self._morceau(b"]\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class ServiceHistoires(ThreadingHTTPServer):
+    '''
+    Serveur HTTP des histoires
+
+    Parametres
+    ----------
+    adresse: tuple
+             (adresse, port) d'ecoute, port 0 pour un port libre
+    reserve: ReserveHistoires
+             Reserve demarree des histoires de GET /histoire
+    uniforme: bool
+              Tire les lots uniformement par defaut (voir lancement())
+    '''
+
+    daemon_threads = True
+    # Beaucoup de clients peuvent se connecter en même temps
+    request_queue_size = 128
+
+    def __init__(self, adresse, reserve, uniforme=False):
+        self.reserve = reserve
+        self.uniforme = uniforme
+        super().__init__(adresse, _Requete)
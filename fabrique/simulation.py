@@ -0,0 +1,411 @@
+# coding: utf-8
+
+"""
+Cartes Arduino simulées sur des pseudo-terminaux
+
+Chaque CarteSimulee ouvre un pseudo-terminal et s'y comporte comme le croquis
+petite-fabrique-a-histoires.ino : octet de fin de démarrage, appuis, paquets
+décodés et acquittés (voir fabrique.protocole), négociation de la vitesse et
+du dictionnaire, défilement des histoires codées. Le croquis d'origine, qui
+envoyait l'état du bouton toutes les 100 ms et lisait l'histoire avec
+Serial.readString(), est aussi simulé : la lecture ne se termine qu'après une
+seconde sans octet reçu.
+
+Le temps de transmission des octets reçus est simulé à la vitesse de la
+liaison ; celui des octets envoyés par la carte (un octet par message) est
+négligé. Les cartes ne bloquent jamais : simuler() en fait tourner autant
+qu'il faut dans un seul processus, ce qui permet d'essayer histoires.py et de
+mesurer ses délais sans aucune carte (voir outils/simulateur.py et
+outils/latence.py). Réservé aux systèmes qui ont des pseudo-terminaux (Linux,
+macOS).
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import collections
+import os
+import pty
+import random
+import select
+import termios
+import time
+import tty
+
+from .ecran import LARGEUR_ECRAN, decouper
+from .protocole import (ACK, APPUI, CHARGE_HISTOIRE, DICTIONNAIRE, FIN, HISTOIRE, NAK, REPOS, TRAME, VITESSE,
+                        VITESSE_INITIALE, LecteurPaquets, duree_transmission)
+
+
+# Moulinettes
+# ==============================================================================
+
+# Rythme du croquis : lecture du bouton toutes les 100 ms, abandon de
+# l'histoire après 5 s sans paquet (Serial.setTimeout(5000)), et fin de
+# Serial.readString() après 1 s sans octet pour le croquis d'origine
+PERIODE = 0.1
+DELAI_LECTURE = 5.0
+DELAI_READSTRING = 1.0
+
+# Délai de confirmation d'une nouvelle vitesse
+DELAI_CONFIRMATION = 1.0
+
+_VITESSES = {getattr(termios, nom): int(nom[1:]) for nom in dir(termios)
+             if nom[:1] == "B" and nom[1:].isdigit() and int(nom[1:]) > 0}
+
+
+def vitesse_hote(maitre):
+    '''
+    Vitesse reglee par histoires.py sur un pseudo-terminal
+
+    Parametres
+    ----------
+    maitre: int
+            Descripteur du cote maitre du pseudo-terminal
+
+    Retourne
+    --------
+    vitesse: int
+             Vitesse en bauds, ou None si elle ne fait pas partie des
+             vitesses standard (elle est alors supposee juste)
+    '''
+
+    return _VITESSES.get(termios.tcgetattr(maitre)[5])
+
+
+def brouiller(octets, taux, hasard):
+    '''
+    Inverse un bit des octets recus avec une probabilite donnee
+
+    Parametres
+    ----------
+    octets: bytes
+            Octets recus
+    taux: float
+          Probabilite d'abimer un bloc d'octets
+    hasard: random.Random
+            Generateur aleatoire
+
+    Retourne
+    --------
+    octets: bytes
+            Octets, dont un bit est peut-etre faux
+    '''
+
+    if not octets or hasard.random() >= taux:
+        return octets
+    abimes = bytearray(octets)
+    abimes[hasard.randrange(len(abimes))] ^= 1 << hasard.randrange(8)
+    return bytes(abimes)
+
+
+# Carte simulée
+# ------------------------------------------------------------------------------
+
+class CarteSimulee:
+    '''
+    Carte Arduino simulee sur un pseudo-terminal
+
+    La carte est pilotee par simuler() : lire() lui donne les octets
+    arrives sur le pseudo-terminal, avancer() fait ce que le croquis ferait
+    a un instant donne et renvoie l'instant de sa prochaine action.
+
+    Parametres
+    ----------
+    croquis: string
+             "paquets" pour le croquis actuel, "texte" pour le croquis
+             d'origine, qui recoit le texte brut avec Serial.readString()
+    appuis: int
+            Nombre d'appuis a simuler (None : sans limite)
+    attente: function
+             Fonction sans argument donnant la duree en secondes entre la
+             fin d'une histoire et l'appui suivant
+    premier_appui: float
+                   Duree en secondes avant le premier appui
+    dictionnaire: Dictionnaire
+                  Dictionnaire du croquis (None pour un croquis qui n'a pas
+                  celui de histoires.py)
+    erreurs: float
+             Probabilite d'abimer un bloc d'octets recus
+    graine: int
+            Graine des erreurs injectees
+    journal: function
+             Fonction appelee avec chaque evenement a afficher (trames,
+             changements de vitesse...), ou None
+    '''
+
+    def __init__(self, croquis="paquets", appuis=None, attente=lambda: 1.0, premier_appui=1.0,
+                 dictionnaire=None, erreurs=0.0, graine=None, journal=None):
+        if croquis not in ("paquets", "texte"):
+            raise ValueError(f"Croquis inconnu : {croquis}")
+        self.croquis = croquis
+        self.appuis = appuis
+        self.attente = attente
+        self.dictionnaire = dictionnaire
+        self.erreurs = erreurs
+        self.hasard = random.Random(graine)
+        self.journal = journal
+
+        self.maitre, self.esclave = pty.openpty()
+        tty.setraw(self.maitre)
+        tty.setraw(self.esclave)
+        self.port = os.ttyname(self.esclave)
+
+        # Comme le croquis : une histoire codée remplit son propre tampon,
+        # toute autre charge celui d'une trame
+        self.lecteur = LecteurPaquets({TRAME: LARGEUR_ECRAN, FIN: LARGEUR_ECRAN, VITESSE: LARGEUR_ECRAN,
+                                       DICTIONNAIRE: LARGEUR_ECRAN, HISTOIRE: CHARGE_HISTOIRE})
+        self.vitesse = VITESSE_INITIALE
+        self.confirmation = None
+        # L'ouverture d'un pseudo-terminal ne redémarre pas la carte : elle
+        # répète son octet de fin de démarrage jusqu'à ce que histoires.py
+        # lui parle, pour qu'il ne soit pas perdu avant l'ouverture du port
+        self.reconnue = False
+        self.recus = collections.deque()
+        self.fin_reception = 0.0
+
+        self.debut = time.monotonic()
+        self.prochain_etat = self.debut + PERIODE
+        self.prochain_appui = self.debut + premier_appui
+        # Histoire en cours : instant de l'appui, du dernier octet reçu, et
+        # fin de l'affichage quand la carte fait défiler l'histoire elle-même
+        self.appui = None
+        self.derniere_reception = None
+        self.affichee = False
+        self.fin_affichage = None
+        self.texte = bytearray()
+
+        self.latences = []
+        self.trames = 0
+        self.octets = 0
+        self.refuses = 0
+        self.histoires = 0
+        self.abandons = 0
+
+    def _noter(self, instant, message):
+        if self.journal is not None:
+            self.journal(f"{instant - self.debut:7.2f}  {message}")
+
+    def _envoyer(self, octet):
+        # Tant que les vitesses diffèrent, histoires.py ne lit que du bruit
+        hote = vitesse_hote(self.maitre)
+        os.write(self.maitre, bytes([octet if hote in (None, self.vitesse) else 0xFF]))
+
+    @property
+    def terminee(self):
+        '''
+        Plus d'appui a faire ni d'histoire en cours
+        '''
+
+        return self.appuis == 0 and self.appui is None and self.fin_affichage is None
+
+    def fileno(self):
+        return self.maitre
+
+    def fermer(self):
+        '''
+        Ferme le pseudo-terminal
+        '''
+
+        os.close(self.maitre)
+        os.close(self.esclave)
+
+    def lire(self, maintenant):
+        '''
+        Lit les octets arrives sur le pseudo-terminal
+
+        Les octets ne sont traites par avancer() qu'une fois leur temps de
+        transmission ecoule.
+
+        Parametres
+        ----------
+        maintenant: float
+                    Instant de la lecture (time.monotonic())
+        '''
+
+        octets = os.read(self.maitre, 4096)
+        if vitesse_hote(self.maitre) not in (None, self.vitesse):
+            return
+        self.fin_reception = max(maintenant, self.fin_reception) + duree_transmission(len(octets), self.vitesse)
+        self.recus.append((self.fin_reception, octets))
+
+    def avancer(self, maintenant):
+        '''
+        Fait ce que le croquis ferait jusqu'a un instant donne
+
+        Parametres
+        ----------
+        maintenant: float
+                    Instant courant (time.monotonic())
+
+        Retourne
+        --------
+        echeance: float
+                  Instant de la prochaine action de la carte
+        '''
+
+        while self.recus and self.recus[0][0] <= maintenant:
+            arrivee, octets = self.recus.popleft()
+            self._recevoir(brouiller(octets, self.erreurs, self.hasard), arrivee)
+
+        if self.confirmation is not None and maintenant >= self.confirmation[1]:
+            self._noter(maintenant, f"{self.vitesse} bauds non confirmés, retour à {self.confirmation[0]}")
+            self.vitesse, self.confirmation = self.confirmation[0], None
+
+        if self.fin_affichage is not None and maintenant >= self.fin_affichage:
+            self._terminer(self.fin_affichage)
+
+        if self.appui is not None and self.croquis == "texte" \
+                and maintenant - self.derniere_reception >= DELAI_READSTRING:
+            self._lire_texte(self.derniere_reception + DELAI_READSTRING)
+        elif self.appui is not None and maintenant - self.derniere_reception > DELAI_LECTURE:
+            self._noter(maintenant, "histoire abandonnée, plus rien reçu")
+            self.abandons += 1
+            self.appui = None
+            self.prochain_appui = maintenant + self.attente()
+
+        libre = self.appui is None and self.fin_affichage is None and self.confirmation is None
+        if libre and maintenant >= self.prochain_etat:
+            if self.appuis != 0 and maintenant >= self.prochain_appui:
+                if self.appuis is not None:
+                    self.appuis -= 1
+                self.appui = self.derniere_reception = maintenant
+                self.affichee = False
+                self.texte.clear()
+                self._envoyer(APPUI)
+            elif self.croquis == "texte" or not self.reconnue:
+                self._envoyer(REPOS)
+            self.prochain_etat = maintenant + PERIODE
+
+        # Le bouton n'est lu que par une carte libre
+        libre = self.appui is None and self.fin_affichage is None and self.confirmation is None
+        echeances = [self.prochain_etat] if libre else []
+        if self.recus:
+            echeances.append(self.recus[0][0])
+        if self.confirmation is not None:
+            echeances.append(self.confirmation[1])
+        if self.fin_affichage is not None:
+            echeances.append(self.fin_affichage)
+        if self.appui is not None:
+            delai = DELAI_READSTRING if self.croquis == "texte" else DELAI_LECTURE
+            echeances.append(self.derniere_reception + delai)
+        return min(echeances)
+
+    def _afficher(self, instant, texte):
+        # Le premier caractère de l'histoire apparaît à l'écran
+        if not self.affichee:
+            self.latences.append(instant - self.appui)
+            self.affichee = True
+        self.trames += 1
+        self._noter(instant, f"|{texte.decode('latin-1')}|")
+
+    def _defiler(self, instant, texte):
+        # La carte fait défiler l'histoire elle-même, sans rien envoyer
+        # jusqu'à la fin du défilement
+        defilement = decouper(texte)
+        self._afficher(instant, defilement[0][0])
+        self.trames += len(defilement) - 1
+        self._noter(instant, f"... {texte.decode('latin-1')}")
+        self.appui = None
+        self.fin_affichage = instant + sum(duree for _, duree in defilement)
+
+    def _terminer(self, instant):
+        self.histoires += 1
+        self.appui = self.fin_affichage = None
+        self.prochain_etat = instant
+        self.prochain_appui = instant + self.attente()
+
+    def _lire_texte(self, instant):
+        # Fin de Serial.readString() : le croquis d'origine fait défiler le
+        # texte reçu (une chaîne vide s'il n'a rien reçu dans la seconde)
+        texte = bytes(self.texte)
+        self.octets += len(texte)
+        if texte:
+            self._defiler(instant, texte)
+        else:
+            self.abandons += 1
+            self.appui = None
+            self.prochain_appui = instant + self.attente()
+
+    def _recevoir(self, octets, instant):
+        if self.croquis == "texte":
+            # Le croquis d'origine ne lit le port qu'après un appui
+            if self.appui is not None:
+                self.texte += octets
+                self.derniere_reception = instant
+            return
+
+        self.octets += len(octets)
+        self.reconnue = True
+        if self.appui is not None:
+            self.derniere_reception = instant
+
+        for recu in self.lecteur.lire(octets):
+            if recu is None:
+                self.refuses += 1
+                self._envoyer(NAK)
+                continue
+
+            type_paquet, charge = recu
+            if type_paquet == DICTIONNAIRE:
+                # Un autre dictionnaire est refusé, comme par le croquis
+                connu = self.dictionnaire is not None \
+                    and charge == self.dictionnaire.identifiant.to_bytes(2, "little")
+                self._envoyer(ACK if connu else NAK)
+                continue
+            self._envoyer(ACK)
+
+            if type_paquet == VITESSE and len(charge) == 4:
+                demandee = int.from_bytes(charge, "little")
+                if demandee == self.vitesse:
+                    self.confirmation = None
+                else:
+                    self.confirmation = (self.vitesse, instant + DELAI_CONFIRMATION)
+                    self.vitesse = demandee
+                    self._noter(instant, f"passage à {self.vitesse} bauds")
+            elif self.appui is None:
+                # Renvoi d'un paquet dont l'acquittement s'est perdu
+                continue
+            elif type_paquet == TRAME:
+                self._afficher(instant, charge)
+            elif type_paquet == FIN:
+                self._terminer(instant)
+            elif type_paquet == HISTOIRE and self.dictionnaire is not None:
+                self._defiler(instant, self.dictionnaire.developper(charge))
+
+
+# Boucle de simulation
+# ------------------------------------------------------------------------------
+
+def simuler(cartes, duree=None, trames=None):
+    '''
+    Fait tourner des cartes simulees jusqu'a la fin de leurs appuis
+
+    Parametres
+    ----------
+    cartes: list
+            Cartes simulees
+    duree: float
+           Duree maximale de la simulation, en secondes
+    trames: int
+            Nombre de trames affichees (toutes cartes confondues) apres
+            lequel la simulation s'arrete
+    '''
+
+    fin = None if duree is None else time.monotonic() + duree
+    while not all(carte.terminee for carte in cartes):
+        if trames is not None and sum(carte.trames for carte in cartes) >= trames:
+            return
+
+        maintenant = time.monotonic()
+        if fin is not None and maintenant >= fin:
+            return
+        echeance = min(carte.avancer(maintenant) for carte in cartes)
+        if fin is not None:
+            echeance = min(echeance, fin)
+
+        prets = select.select(cartes, [], [], max(0, echeance - time.monotonic()))[0]
+        maintenant = time.monotonic()
+        for carte in prets:
+            carte.lire(maintenant)
@@ -0,0 +1,184 @@
+# coding: utf-8
+
+"""
+Rechargement de la grammaire à chaud, sans redémarrer la session
+
+Un thread surveille les fichiers de la grammaire. Quand l'un d'eux change,
+la nouvelle grammaire est compilée dans ce thread, loin de la boucle qui
+répond à Arduino, puis installée d'une seule affectation : les histoires en
+cours de génération ou d'envoi ne sont pas touchées et le port série n'est
+jamais rouvert. Si la nouvelle grammaire est invalide, l'ancienne reste en
+place.
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import collections
+import logging
+import os
+import threading
+import time
+
+from .moteur import installer_grammaire
+
+logger = logging.getLogger(__name__)
+
+
+# Moulinettes
+# ==============================================================================
+
+# Surveillance des fichiers de la grammaire
+# ------------------------------------------------------------------------------
+
+class SurveillanceGrammaire:
+    '''
+    Thread qui recharge la grammaire quand ses fichiers changent
+
+    Les fichiers sont interroges periodiquement (date de modification et
+    taille), ce qui ne demande aucune dependance et fonctionne partout.
+
+    Parametres
+    ----------
+    fichiers: list
+              Fichiers de grammaire choisis par choisir_grammaire() ; si la
+              liste est vide, fabrique/grammaire.py est surveille
+    periode: float
+             Duree en secondes entre deux verifications
+    rechargee: function
+               Fonction appelee avec la nouvelle GrammaireCompilee apres
+               chaque rechargement (par exemple pour vider la reserve)
+    '''
+
+    def __init__(self, fichiers=(), periode=1.0, rechargee=None):
+        self.fichiers = tuple(fichiers)
+        self.surveilles = self.fichiers or (os.path.join(os.path.dirname(__file__), "grammaire.py"),)
+        self.periode = periode
+        self.rechargee = rechargee
+        self.rechargements = 0
+        self.erreurs = collections.Counter()
+        self._etats = self._etat()
+        self._verification = time.time()
+        self._arret = threading.Event()
+        self._thread = threading.Thread(target=self._surveiller, name="surveillance-grammaire", daemon=True)
+
+    def _etat(self):
+        etats = []
+        for chemin in self.surveilles:
+            try:
+                infos = os.stat(chemin)
+                etats.append((infos.st_mtime_ns, infos.st_size))
+            except OSError:
+                etats.append(None)
+        return etats
+
+    def _compiler(self):
+        from . import cache, grammaire
+
+        if self.fichiers:
+            return cache.grammaire_fichiers(self.fichiers)
+
+        # Le module est exécuté dans un espace de noms neuf : importlib.reload
+        # garderait l'ancienne HISTOIRES si la nouvelle source n'en définit pas
+        with open(self.surveilles[0], "rb") as fichier:
+            source = fichier.read()
+        espace = {}
+        exec(compile(source, self.surveilles[0], "exec"), espace)
+        if "HISTOIRES" not in espace:
+            raise ValueError(f"HISTOIRES absente de {self.surveilles[0]}")
+        histoires = espace["HISTOIRES"]
+
+        compilee = cache.charger("histoires", source, lambda: histoires)
+        grammaire.HISTOIRES = histoires
+        return compilee
+
+    def recharger(self, modification=None):
+        '''
+        Compile la grammaire surveillee et l'installe
+
+        Parametres
+        ----------
+        modification: float
+                      Date (time.time()) de la modification des fichiers,
+                      pour journaliser le delai de rechargement
+
+        Retourne
+        --------
+        recharge: bool
+                  False si la nouvelle grammaire est invalide et que
+                  l'ancienne est restee en place
+        '''
+
+        debut = time.perf_counter()
+        try:
+            grammaire = self._compiler()
+            if "AVENTURES" not in grammaire.indices:
+                raise ValueError("règle AVENTURES absente")
+        except Exception as erreur:
+            # Une faute de frappe dans la grammaire ne doit pas arrêter la
+            # session : on garde l'ancienne et on attend la correction
+            self.erreurs[type(erreur).__name__] += 1
+            logger.error("Grammaire non rechargée, la précédente reste en place : %s", erreur)
+            return False
+        compilation = time.perf_counter() - debut
+
+        installer_grammaire(grammaire)
+        if self.rechargee is not None:
+            self.rechargee(grammaire)
+        self.rechargements += 1
+
+        message = f"Grammaire rechargée : compilation {1000 * compilation:.1f} ms"
+        if modification is not None:
+            message += f", {1000 * (time.time() - modification):.0f} ms après la modification"
+        logger.info(message)
+        return True
+
+    def _surveiller(self):
+        while not self._arret.wait(self.periode):
+            verification, self._verification = self._verification, time.time()
+            etats = self._etat()
+            if etats == self._etats:
+                continue
+
+            # Un éditeur écrit souvent en plusieurs fois : on attend que les
+            # fichiers ne bougent plus avant de compiler
+            while True:
+                time.sleep(min(0.05, self.periode))
+                stables = self._etat()
+                if stables == etats:
+                    break
+                etats = stables
+
+            changes = [e for e, avant in zip(etats, self._etats) if e != avant and e is not None]
+            self._etats = etats
+            if not changes:
+                # Fichier supprimé : on attend qu'il réapparaisse
+                continue
+
+            # La date de modification n'est pas toujours fiable (système de
+            # fichiers, copie qui la conserve) : le changement n'a de toute
+            # façon pas pu avoir lieu avant la vérification précédente
+            modification = max(mtime for mtime, _ in changes) / 1e9
+            self.recharger(max(modification, verification))
+
+    def demarrer(self):
+        '''
+        Lance le thread de surveillance
+
+        Retourne
+        --------
+        surveillance: SurveillanceGrammaire
+                      La surveillance elle-meme
+        '''
+
+        self._thread.start()
+        return self
+
+    def arreter(self):
+        '''
+        Arrête le thread de surveillance
+        '''
+
+        self._arret.set()
+        self._thread.join()
@@ -0,0 +1,273 @@
+# coding: utf-8
+
+"""
+Génération d'histoires sans doublons
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import hashlib
+import itertools
+import math
+import random
+
+from . import moteur
+from .lot import TAILLE_TRANCHE
+from .moteur import corrections, grammaire_compilee
+
+
+# Moulinettes
+# ==============================================================================
+
+# Histoires sans doublons
+# ------------------------------------------------------------------------------
+
+def empreinte(histoire):
+    '''
+    Empreinte de 64 bits d'une histoire
+
+    Parametres
+    ----------
+    histoire: bytes
+              Histoire corrigee
+
+    Retourne
+    --------
+    empreinte: int
+               Empreinte blake2b tronquee a 64 bits
+    '''
+
+    return int.from_bytes(hashlib.blake2b(histoire, digest_size=8).digest(), "little")
+
+
+class EmpreintesExactes:
+    '''
+    Mémoire des histoires deja vues, par leurs empreintes de 64 bits
+
+    Seules les empreintes sont conservees, pas les histoires. Deux histoires
+    differentes n'ont la meme empreinte qu'avec une probabilite de l'ordre
+    de n² / 2^65 pour n histoires.
+    '''
+
+    def __init__(self):
+        self.empreintes = set()
+
+    def __len__(self):
+        return len(self.empreintes)
+
+    def ajouter(self, histoire):
+        '''
+        Retient une histoire
+
+        Parametres
+        ----------
+        histoire: bytes
+                  Histoire corrigee
+
+        Retourne
+        --------
+        nouvelle: bool
+                  False si l'histoire avait deja ete vue
+        '''
+
+        e = empreinte(histoire)
+        if e in self.empreintes:
+            return False
+        self.empreintes.add(e)
+        return True
+
+
+class FiltreBloom:
+    '''
+    Mémoire approchee des histoires deja vues, de taille fixe
+
+    Une histoire jamais vue peut etre prise a tort pour un doublon, avec
+    une probabilite taux_faux_positifs tant que le filtre contient moins de
+    capacite histoires ; une histoire deja vue est toujours reconnue.
+
+    Parametres
+    ----------
+    capacite: int
+              Nombre d'histoires que le filtre doit pouvoir retenir
+    taux_faux_positifs: float
+                        Probabilite de faux positif visee a pleine capacite
+    '''
+
+    def __init__(self, capacite, taux_faux_positifs=0.001):
+        if not 0 < taux_faux_positifs < 1:
+            raise ValueError(f"Taux de faux positifs hors de ]0, 1[ : {taux_faux_positifs}")
+        capacite = max(1, capacite)
+        self.nb_bits = max(8, math.ceil(-capacite * math.log(taux_faux_positifs) / math.log(2) ** 2))
+        self.nb_hachages = max(1, round(self.nb_bits / capacite * math.log(2)))
+        self.bits = bytearray((self.nb_bits + 7) // 8)
+        self.nombre = 0
+
+    def __len__(self):
+        return self.nombre
+
+    def ajouter(self, histoire):
+        '''
+        Retient une histoire
+
+        Parametres
+        ----------
+        histoire: bytes
+                  Histoire corrigee
+
+        Retourne
+        --------
+        nouvelle: bool
+                  False si l'histoire a (probablement) deja ete vue
+        '''
+
+        # Double hachage : les k positions sont h1 + i * h2
+        h = hashlib.blake2b(histoire, digest_size=16).digest()
+        h1 = int.from_bytes(h[:8], "little")
+        h2 = int.from_bytes(h[8:], "little") | 1
+
+        bits = self.bits
+        nouvelle = False
+        for i in range(self.nb_hachages):
+            position = (h1 + i * h2) % self.nb_bits
+            octet, masque = position >> 3, 1 << (position & 7)
+            if not bits[octet] & masque:
+                bits[octet] |= masque
+                nouvelle = True
+
+        if nouvelle:
+            self.nombre += 1
+        return nouvelle
+
+
+class HistoiresUniques:
+    '''
+    Générateur d'histoires qui ne rend jamais deux fois la meme histoire
+
+    Les histoires sont produites comme par lancement(), puis filtrees par
+    une memoire des histoires deja vues (EmpreintesExactes ou FiltreBloom,
+    ou tout objet ayant une methode ajouter(histoire) -> bool).
+
+    Le taux de doublons est mesure par fenetres de tirages. S'il depasse le
+    seuil, le tirage est elargi a l'ensemble des histoires possibles
+    (tirage uniforme) ; s'il le depasse encore, la generation s'arrete.
+
+    Parametres
+    ----------
+    memoire: object
+             Memoire des histoires deja vues (par defaut EmpreintesExactes)
+    seed: int or string
+          Graine du generateur aleatoire
+    uniforme: bool
+              Tire uniformement des le depart
+    seuil: float
+           Taux de doublons au-dela duquel le tirage est elargi ou arrete
+    fenetre: int
+             Nombre de tirages sur lequel le taux est mesure
+    '''
+
+    def __init__(self, memoire=None, seed=None, uniforme=False, seuil=0.5, fenetre=1000):
+        self.memoire = memoire if memoire is not None else EmpreintesExactes()
+        self.rng = random.Random(seed)
+        self.uniforme = uniforme
+        self.seuil = seuil
+        self.fenetre = fenetre
+        self.tirages = 0
+        self.doublons = 0
+        self.epuise = False
+        self._tirages_fenetre = 0
+        self._doublons_fenetre = 0
+
+    @property
+    def taux_doublons(self):
+        return self.doublons / self.tirages if self.tirages else 0.0
+
+    def _tirer(self):
+        if moteur._profil is not None:
+            return moteur._profil.histoire(grammaire_compilee(), "AVENTURES", self.rng, self.uniforme)
+        if self.uniforme:
+            texte = grammaire_compilee().tirer_uniforme("AVENTURES", self.rng)
+        else:
+            texte = grammaire_compilee().developper("AVENTURES", self.rng.choice)
+        return corrections(texte)
+
+    def _mesurer(self, doublon):
+        self.tirages += 1
+        self._tirages_fenetre += 1
+        if doublon:
+            self.doublons += 1
+            self._doublons_fenetre += 1
+
+        if self._tirages_fenetre < self.fenetre:
+            return
+
+        if self._doublons_fenetre > self.seuil * self._tirages_fenetre:
+            if self.uniforme:
+                self.epuise = True
+            else:
+                self.uniforme = True
+        self._tirages_fenetre = 0
+        self._doublons_fenetre = 0
+
+    def histoire(self):
+        '''
+        Histoire suivante, jamais rendue auparavant
+
+        Retourne
+        --------
+        histoire: bytes
+                  Histoire corrigee, ou None si les doublons sont devenus
+                  trop frequents
+        '''
+
+        while not self.epuise:
+            histoire = self._tirer()
+            nouvelle = self.memoire.ajouter(histoire)
+            self._mesurer(not nouvelle)
+            if nouvelle:
+                return histoire
+        return None
+
+    def __iter__(self):
+        while True:
+            histoire = self.histoire()
+            if histoire is None:
+                return
+            yield histoire
+
+    def rapport(self):
+        '''
+        Résumé des tirages
+
+        Retourne
+        --------
+        rapport: string
+                 Nombre de tirages, de doublons ecartes et taux de doublons
+        '''
+
+        return (f"{self.tirages} tirages, {self.doublons} doublons écartés "
+                f"({100 * self.taux_doublons:.2f} %), {len(self.memoire)} histoires retenues")
+
+
+def ecrire_uniques(n, sortie, uniques):
+    '''
+    Écrit jusqu'a n histoires sans doublons, une par ligne, par tranches
+
+    Parametres
+    ----------
+    n: int
+       Nombre d'histoires a generer
+    sortie: file
+            Flux binaire dans lequel ecrire les histoires
+    uniques: HistoiresUniques
+             Generateur filtrant les doublons
+    '''
+
+    histoires = itertools.islice(uniques, n)
+    while True:
+        tranche = list(itertools.islice(histoires, TAILLE_TRANCHE))
+        if not tranche:
+            break
+        tranche.append(b"")
+        sortie.write(b"\n".join(tranche))
@@ -0,0 +1,143 @@
+#!/usr/bin/python3
+# coding: utf-8
+
+"""
+Test de charge du service HTTP des histoires (histoires.py --serve)
+
+Des clients, chacun dans son propre processus et avec sa propre connexion
+gardée ouverte, envoient des requêtes à la suite les uns des autres pendant
+--duree secondes. On mesure le nombre de requêtes servies par seconde et la
+durée de chaque requête, de l'envoi à la réception complète de la réponse
+(médiane, 99e centile, maximum).
+
+Sans --url, histoires.py --serve est lancé sur un port libre de la machine,
+avec les options données après --.
+
+Usage :
+python outils/charge.py [--clients N] [--duree S] [--chemin /histoire] [-- options]
+python outils/charge.py --chemin "/histoires?n=10000" --clients 2
+python outils/charge.py --url http://127.0.0.1:8000
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import argparse
+import http.client
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+
+# Moulinettes
+# ==============================================================================
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def client(tache):
+    '''
+    Envoie des requetes sur une connexion gardee ouverte
+
+    Parametres
+    ----------
+    tache: tuple
+           (hote, port, chemin, duree en secondes)
+
+    Retourne
+    --------
+    resultats: tuple
+               Durees des requetes reussies (en secondes), nombre
+               d'erreurs et nombre d'octets recus
+    '''
+
+    hote, port, chemin, duree = tache
+    connexion = http.client.HTTPConnection(hote, port)
+    latences = []
+    erreurs = 0
+    octets = 0
+    fin = time.perf_counter() + duree
+    while True:
+        debut = time.perf_counter()
+        if debut >= fin:
+            break
+        try:
+            connexion.request("GET", chemin)
+            reponse = connexion.getresponse()
+            octets += len(reponse.read())
+        except (OSError, http.client.HTTPException):
+            erreurs += 1
+            connexion.close()
+            continue
+        if reponse.status == 200:
+            latences.append(time.perf_counter() - debut)
+        else:
+            erreurs += 1
+    connexion.close()
+    return latences, erreurs, octets
+
+
+def centile(valeurs, rang):
+    return statistics.quantiles(valeurs, n=100, method="inclusive")[rang - 1]
+
+
+# Programme principal
+# ==============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test de charge du service HTTP des histoires")
+    parser.add_argument("--clients", "-n",
+                        type=int, default=8, metavar="N",
+                        help="Nombre de clients simultanés (default: 8)")
+    parser.add_argument("--duree", "-d",
+                        type=float, default=10.0, metavar="S",
+                        help="Durée de la mesure en secondes (default: 10)")
+    parser.add_argument("--chemin",
+                        default="/histoire",
+                        help="Chemin demandé (default: /histoire)")
+    parser.add_argument("--url",
+                        help="Service déjà lancé à tester (par exemple http://127.0.0.1:8000), "
+                             "plutôt que d'en lancer un")
+    parser.add_argument("options",
+                        nargs=argparse.REMAINDER,
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    options = args.options[1:] if args.options[:1] == ["--"] else args.options
+
+    processus = None
+    if args.url:
+        url = urlsplit(args.url)
+    else:
+        arguments = [sys.executable, os.path.join(RACINE, "histoires.py"), "--serve", "127.0.0.1:0"]
+        processus = subprocess.Popen(arguments + options, stdout=subprocess.PIPE, text=True)
+        # Première ligne : « Histoires sur http://adresse:port/histoire »
+        ligne = processus.stdout.readline()
+        if not ligne:
+            sys.exit("histoires.py --serve ne s'est pas lancé")
+        url = urlsplit(ligne.split()[-1])
+
+    try:
+        taches = [(url.hostname, url.port, args.chemin, args.duree)] * args.clients
+        with multiprocessing.Pool(args.clients) as pool:
+            debut = time.perf_counter()
+            resultats = pool.map(client, taches)
+            duree = time.perf_counter() - debut
+    finally:
+        if processus is not None:
+            processus.terminate()
+            processus.wait()
+
+    latences = [latence for l, _, _ in resultats for latence in l]
+    erreurs = sum(e for _, e, _ in resultats)
+    octets = sum(o for _, _, o in resultats)
+    print(f"{args.clients} clients, {len(latences)} requêtes servies sur {args.chemin}, {erreurs} erreurs")
+    print(f"{len(latences) / duree:.0f} requêtes par seconde, {octets / duree / 1e6:.1f} Mo/s")
+    if len(latences) >= 2:
+        print(f"Durée d'une requête : médiane {1000 * centile(latences, 50):.2f} ms, "
+              f"99e centile {1000 * centile(latences, 99):.2f} ms, max {1000 * max(latences):.2f} ms")
@@ -0,0 +1,168 @@
+#!/usr/bin/python3
+# coding: utf-8
+
+"""
+Mesure du temps entre l'import de la fabrique et la première histoire
+
+Chaque mesure est faite dans un nouvel interpréteur Python, comme pour un
+job de génération de courte durée : le temps mesuré comprend l'import du
+paquet, la compilation de la grammaire (ou sa lecture dans le cache) et la
+génération d'une histoire, mais pas le démarrage de l'interpréteur lui-même.
+
+Les mesures sont faites sans cache, puis avec un cache déjà rempli, pour
+l'import du paquet puis pour le script histoires.py (python histoires.py
+--batch 1), dont le lancement ne doit pas importer plus de sous-modules que
+nécessaire. Une
+grammaire synthétique, obtenue en recopiant HISTOIRES plusieurs fois, montre
+ensuite l'écart entre compilation et lecture du cache pour une grammaire de
+plusieurs centaines de règles.
+
+Usage :
+python outils/demarrage.py [--repetitions N] [--facteur K]
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fabrique import HISTOIRES
+from fabrique import cache
+
+
+# Moulinettes
+# ==============================================================================
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MESURE = """
+import time
+debut = time.perf_counter()
+import fabrique
+fabrique.lancement()
+print(time.perf_counter() - debut)
+"""
+
+# Même mesure pour le lanceur, exécuté comme par python histoires.py --batch 1
+MESURE_LANCEUR = """
+import runpy, sys, time
+debut = time.perf_counter()
+sys.argv = ["histoires.py", "--batch", "1"]
+try:
+    runpy.run_path("histoires.py", run_name="__main__")
+except SystemExit:
+    pass
+print(time.perf_counter() - debut)
+"""
+
+
+def mesurer(repetitions, dossier_cache, code=MESURE):
+    '''
+    Mesure le temps jusqu'a la premiere histoire
+
+    Parametres
+    ----------
+    repetitions: int
+                 Nombre d'interpreteurs lances
+    dossier_cache: string
+                   Dossier du cache ("" pour le desactiver)
+    code: string
+          Code Python mesure, qui affiche la duree en derniere ligne
+
+    Retourne
+    --------
+    durees: list
+            Durees mesurees, en secondes
+    '''
+
+    env = dict(os.environ, FABRIQUE_CACHE=dossier_cache)
+
+    durees = []
+    for _ in range(repetitions):
+        sortie = subprocess.run([sys.executable, "-c", code], cwd=RACINE, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        durees.append(float(sortie.splitlines()[-1]))
+    return durees
+
+
+def grammaire_synthetique(facteur):
+    '''
+    Grammaire obtenue en recopiant HISTOIRES, avec des regles renommees
+
+    Parametres
+    ----------
+    facteur: int
+             Nombre de copies
+
+    Retourne
+    --------
+    grammaire: dict
+               Grammaire de facteur * len(HISTOIRES) regles, plus une
+               regle AVENTURES qui choisit l'une des copies
+    '''
+
+    def renommer(element, i):
+        if isinstance(element, list):
+            return [renommer(e, i) for e in element]
+        return f"{element}_{i}" if element in HISTOIRES else f"{element} {i}"
+
+    grammaire = {f"{regle}_{i}": [renommer(a, i) for a in alternatives]
+                 for i in range(facteur) for regle, alternatives in HISTOIRES.items()}
+    grammaire["AVENTURES"] = [f"AVENTURES_{i}" for i in range(facteur)]
+    return grammaire
+
+
+def meilleur_temps(fonction, repetitions=20):
+    debut = time.perf_counter()
+    meilleur = float("inf")
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur
+
+
+def afficher(titre, durees):
+    print(f"{titre} : médiane {1000 * statistics.median(durees):.1f} ms, "
+          f"min {1000 * min(durees):.1f} ms, max {1000 * max(durees):.1f} ms ({len(durees)} mesures)")
+
+
+# Programme principal
+# ==============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Temps entre l'import de la fabrique et la première histoire")
+    parser.add_argument("--repetitions", "-n",
+                        type=int, default=20, metavar="N",
+                        help="Nombre de mesures (default: 20)")
+    parser.add_argument("--facteur", "-k",
+                        type=int, default=10, metavar="K",
+                        help="Nombre de copies de HISTOIRES dans la grammaire synthétique (default: 10)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as dossier:
+        afficher("Import jusqu'à la première histoire, sans cache", mesurer(args.repetitions, ""))
+        mesurer(1, dossier)
+        afficher("Import jusqu'à la première histoire, avec cache", mesurer(args.repetitions, dossier))
+        afficher("histoires.py --batch 1, sans cache", mesurer(args.repetitions, "", MESURE_LANCEUR))
+        afficher("histoires.py --batch 1, avec cache", mesurer(args.repetitions, dossier, MESURE_LANCEUR))
+
+        synthetique = grammaire_synthetique(args.facteur)
+        source = cache.empreinte_source(synthetique).encode()
+        os.environ["FABRIQUE_CACHE"] = dossier
+        cache.charger("synthetique", source, lambda: synthetique)
+
+        # Analyse comprise : c'est ce que le cache évite
+        compilation = meilleur_temps(lambda: cache.compiler(synthetique))
+        lecture = meilleur_temps(lambda: cache.charger("synthetique", source, lambda: synthetique))
+        print(f"Grammaire de {len(synthetique)} règles : compilation {1000 * compilation:.1f} ms, "
+              f"lecture du cache {1000 * lecture:.1f} ms")
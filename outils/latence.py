@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+# coding: utf-8
+
+"""
+Délai entre l'appui et l'affichage, sous une avalanche d'appuis
+
+Des cartes simulées (voir fabrique/simulation.py) sont servies par un seul
+histoires.py. Chacune appuie à nouveau dès la fin de son histoire, après une
+attente tirée au hasard (loi exponentielle de moyenne --attente). On mesure
+le délai entre chaque appui et l'apparition du premier caractère à l'écran
+(médiane, 99e centile, maximum), et le temps processeur de histoires.py
+pendant la mesure.
+
+Par défaut, les histoires viennent d'une petite grammaire dont toutes les
+histoires tiennent sur l'écran : chacune ne reste que deux secondes
+affichée, ce qui multiplie les appuis. --histoires grammaire utilise la
+grammaire de histoires.py.
+
+Usage :
+python outils/latence.py [--cartes N] [--duree S] [--attente S] [--croquis texte] [-- options]
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fabrique import choisir_grammaire, grammaire_compilee
+from fabrique.dictionnaire import deriver_dictionnaire
+from fabrique.simulation import CarteSimulee, simuler
+
+
+# Moulinettes
+# ==============================================================================
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Histoires d'au plus 16 caractères : une seule trame chacune
+COURTES = {
+    "AVENTURES": [["SUJET", "VERBE"]],
+    "SUJET": ["Un chat", "Une pie", "Le loup", "Un ours", "La fee", "Un ogre"],
+    "VERBE": ["dort", "chante", "fuit", "rit", "ment", "danse"],
+}
+
+
+def temps_processeur(pid):
+    '''
+    Temps processeur consomme par un processus en cours
+
+    Parametres
+    ----------
+    pid: int
+         Identifiant du processus
+
+    Retourne
+    --------
+    temps: float
+           Temps utilisateur et systeme en secondes, ou None si /proc n'est
+           pas disponible (le temps n'est alors connu qu'a la fin du
+           processus)
+    '''
+
+    try:
+        with open(f"/proc/{pid}/stat") as fichier:
+            champs = fichier.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(champs[11]) + int(champs[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def centile(valeurs, rang):
+    return statistics.quantiles(valeurs, n=100, method="inclusive")[rang - 1]
+
+
+# Programme principal
+# ==============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Délai entre l'appui et l'affichage, sous une avalanche d'appuis")
+    parser.add_argument("--cartes", "-n",
+                        type=int, default=10, metavar="N",
+                        help="Nombre de cartes simulées (default: 10)")
+    parser.add_argument("--duree", "-d",
+                        type=float, default=30.0, metavar="S",
+                        help="Durée de la mesure en secondes (default: 30)")
+    parser.add_argument("--attente", "-a",
+                        type=float, default=0.05, metavar="S",
+                        help="Attente moyenne entre la fin d'une histoire et l'appui suivant (default: 0.05)")
+    parser.add_argument("--preparation",
+                        type=float, default=2.0, metavar="S",
+                        help="Délai laissé à histoires.py pour démarrer avant les premiers appuis (default: 2)")
+    parser.add_argument("--croquis",
+                        choices=["paquets", "texte"], default="paquets",
+                        help="Croquis simulé : l'actuel, ou celui d'origine qui lit le texte brut "
+                             "avec Serial.readString() (default: paquets)")
+    parser.add_argument("--histoires",
+                        choices=["courtes", "grammaire"], default="courtes",
+                        help="Histoires d'une seule trame, ou celles de la grammaire de histoires.py "
+                             "(default: courtes)")
+    parser.add_argument("--graine",
+                        type=int, default=None,
+                        help="Graine des attentes entre les appuis")
+    parser.add_argument("options",
+                        nargs=argparse.REMAINDER,
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    options = args.options[1:] if args.options[:1] == ["--"] else args.options
+    if args.croquis == "texte":
+        options = ["--affichage", "texte"] + options
+
+    hasard = random.Random(args.graine)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        if args.histoires == "courtes":
+            grammaire = os.path.join(dossier, "courtes.json")
+            with open(grammaire, "w") as fichier:
+                json.dump(COURTES, fichier)
+            options = ["--grammaire", grammaire] + options
+            choisir_grammaire([grammaire])
+
+        # Les cartes ont le dictionnaire de la grammaire servie
+        dictionnaire = deriver_dictionnaire(grammaire_compilee())
+        cartes = [CarteSimulee(args.croquis, attente=lambda: hasard.expovariate(1 / args.attente),
+                               premier_appui=args.preparation + hasard.uniform(0, 0.5), dictionnaire=dictionnaire)
+                  for _ in range(args.cartes)]
+
+        arguments = [sys.executable, os.path.join(RACINE, "histoires.py")]
+        for carte in cartes:
+            arguments += ["--port", carte.port]
+        debut = time.monotonic()
+        processus = subprocess.Popen(arguments + options, stdout=subprocess.DEVNULL)
+
+        try:
+            simuler(cartes, duree=args.preparation)
+            cpu_debut = temps_processeur(processus.pid)
+            debut_mesure = time.monotonic()
+            simuler(cartes, duree=args.duree)
+            cpu_fin = temps_processeur(processus.pid)
+            fin_mesure = time.monotonic()
+        finally:
+            processus.terminate()
+            processus.wait()
+            for carte in cartes:
+                carte.fermer()
+
+    if cpu_debut is None or cpu_fin is None:
+        # Sans /proc : tout le temps de histoires.py, démarrage compris
+        utilisation = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu = utilisation.ru_utime + utilisation.ru_stime
+        fenetre = time.monotonic() - debut
+    else:
+        cpu = cpu_fin - cpu_debut
+        fenetre = fin_mesure - debut_mesure
+
+    latences = [latence for carte in cartes for latence in carte.latences]
+    histoires = sum(carte.histoires for carte in cartes)
+    print(f"{args.cartes} cartes, {len(latences)} appuis servis, {histoires} histoires terminées, "
+          f"{sum(carte.abandons for carte in cartes)} abandonnées, "
+          f"{sum(carte.refuses for carte in cartes)} paquets refusés")
+    if len(latences) >= 2:
+        print(f"Délai entre l'appui et le premier caractère : médiane {1000 * centile(latences, 50):.1f} ms, "
+              f"99e centile {1000 * centile(latences, 99):.1f} ms, max {1000 * max(latences):.1f} ms")
+    print(f"Processeur de histoires.py : {100 * cpu / fenetre:.1f} % d'un cœur "
+          f"({1000 * cpu / max(1, len(latences)):.2f} ms par appui)")
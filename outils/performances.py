@@ -0,0 +1,312 @@
+#!/usr/bin/python3
+# coding: utf-8
+
+"""
+Mesures de performance de la génération des histoires
+
+Chaque mesure chronomètre une fonction seule : generation() (l'expansion
+récursive d'origine), developper() (la grammaire compilée), corrections(),
+lancement(), et l'expansion de quelques règles isolées (SN, SP_A, SP_DE).
+
+Pour des mesures stables, le générateur aléatoire est réinitialisé avec la
+même graine avant chaque tour, et corrections() reprend sa liste de textes
+au début : tous les tours font exactement le même travail. Chaque fonction est d'abord appelée à vide (échauffement, cache de
+la grammaire), puis chronométrée sur plusieurs tours de durée fixe, ramasse-
+miettes arrêté comme avec timeit. Les tours des différentes mesures sont
+entrelacés, et la durée la plus courte des tours (--statistique min) est
+comparée à la référence : c'est la moins sensible aux autres programmes qui
+se partagent le processeur.
+
+Les résultats peuvent être écrits en JSON, puis servir de référence : une
+mesure plus lente que la référence au-delà du seuil est une régression, et le
+programme se termine avec le code 1.
+
+Usage :
+python outils/performances.py --sortie reference.json
+python outils/performances.py --reference reference.json [--seuil 0.10]
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fabrique import HISTOIRES, corrections, generation, grammaire_compilee, lancement
+
+
+# Moulinettes
+# ==============================================================================
+
+# Version du format des résultats
+VERSION = 1
+
+# Règles dont l'expansion est mesurée isolément
+REGLES = ["SN", "SP_A", "SP_DE"]
+
+
+def fonctions_mesurees(graine):
+    '''
+    Fonctions a chronometrer, par nom
+
+    Parametres
+    ----------
+    graine: int
+            Graine des textes donnes a corrections()
+
+    Retourne
+    --------
+    fonctions: dict
+               Nom de la mesure -> fonction sans argument (avec une methode
+               recommencer() si elle a un etat a remettre a zero avant
+               chaque tour, voir preparer_tour())
+    '''
+
+    grammaire = grammaire_compilee()
+
+    # corrections() reçoit à chaque tour les mêmes textes, dans le même ordre
+    random.seed(graine)
+    textes = [grammaire.developper("AVENTURES") for _ in range(256)]
+    position = 0
+
+    def corriger():
+        nonlocal position
+        texte = textes[position]
+        position = (position + 1) % len(textes)
+        return corrections(texte)
+
+    def recommencer():
+        nonlocal position
+        position = 0
+
+    corriger.recommencer = recommencer
+
+    fonctions = {
+        "generation": lambda: generation(HISTOIRES, "AVENTURES"),
+        "developper": lambda: grammaire.developper("AVENTURES"),
+        "corrections": corriger,
+        "lancement": lancement,
+        "lancement_uniforme": lambda: lancement(uniforme=True),
+    }
+    for regle in REGLES:
+        fonctions[f"generation[{regle}]"] = lambda regle=regle: generation(HISTOIRES, regle)
+        fonctions[f"developper[{regle}]"] = lambda regle=regle: grammaire.developper(regle)
+    return fonctions
+
+
+def preparer_tour(fonction, graine):
+    '''
+    Remet a zero ce dont depend une fonction, avant un tour
+
+    Parametres
+    ----------
+    fonction: function
+              Fonction sans argument
+    graine: int
+            Graine du generateur aleatoire
+    '''
+
+    random.seed(graine)
+    recommencer = getattr(fonction, "recommencer", None)
+    if recommencer is not None:
+        recommencer()
+
+
+def calibrer(fonction, graine, duree_tour, echauffement):
+    '''
+    Appelle une fonction a vide, et en deduit le nombre d'appels par tour
+
+    Parametres
+    ----------
+    fonction: function
+              Fonction sans argument
+    graine: int
+            Graine du generateur aleatoire
+    duree_tour: float
+                Duree visee d'un tour, en secondes
+    echauffement: float
+                  Duree des appels a vide, en secondes
+
+    Retourne
+    --------
+    appels: int
+            Nombre d'appels d'un tour
+    '''
+
+    preparer_tour(fonction, graine)
+    appels = 0
+    debut = time.perf_counter()
+    while time.perf_counter() - debut < echauffement or appels == 0:
+        fonction()
+        appels += 1
+    return max(1, int(duree_tour * appels / (time.perf_counter() - debut)))
+
+
+def chronometrer(fonctions, graine, tours, duree_tour, echauffement):
+    '''
+    Chronometre des fonctions
+
+    Les tours des differentes fonctions sont entrelaces : un ralentissement
+    passager de la machine touche toutes les mesures, plutot qu'une seule.
+
+    Parametres
+    ----------
+    fonctions: dict
+               Nom de la mesure -> fonction sans argument
+    graine: int
+            Graine du generateur aleatoire au debut de chaque tour
+    tours: int
+           Nombre de tours chronometres
+    duree_tour: float
+                Duree visee d'un tour, en secondes
+    echauffement: float
+                  Duree des appels a vide, en secondes
+
+    Retourne
+    --------
+    mesures: dict
+             Nom de la mesure -> mediane, minimum et ecart type de la duree
+             d'un appel (en microsecondes), nombre d'appels par tour et
+             nombre de tours
+    '''
+
+    appels = {nom: calibrer(fonction, graine, duree_tour, echauffement) for nom, fonction in fonctions.items()}
+    durees = {nom: [] for nom in fonctions}
+
+    gc_actif = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(tours):
+            for nom, fonction in fonctions.items():
+                par_tour = appels[nom]
+                preparer_tour(fonction, graine)
+                debut = time.perf_counter()
+                for _ in range(par_tour):
+                    fonction()
+                durees[nom].append((time.perf_counter() - debut) / par_tour * 1e6)
+    finally:
+        if gc_actif:
+            gc.enable()
+
+    return {nom: {"mediane_us": statistics.median(d),
+                  "min_us": min(d),
+                  "ecart_type_us": statistics.stdev(d) if len(d) > 1 else 0.0,
+                  "appels": appels[nom],
+                  "tours": tours}
+            for nom, d in durees.items()}
+
+
+def comparer(resultats, reference, seuil, statistique="min_us"):
+    '''
+    Compare des mesures a une reference
+
+    Parametres
+    ----------
+    resultats: dict
+               Resultats de cette execution
+    reference: dict
+               Resultats de reference, au meme format
+    seuil: float
+           Ralentissement tolere (0.10 : 10 %)
+    statistique: string
+                 Duree comparee : "min_us", la moins sensible aux autres
+                 programmes de la machine, ou "mediane_us"
+
+    Retourne
+    --------
+    regressions: list
+                 Noms des mesures plus lentes que la reference au-dela du
+                 seuil
+    '''
+
+    regressions = []
+    for nom, mesure in resultats["mesures"].items():
+        if nom not in reference["mesures"]:
+            print(f"{nom:<24} absente de la référence")
+            continue
+        avant = reference["mesures"][nom][statistique]
+        apres = mesure[statistique]
+        variation = apres / avant - 1
+        verdict = ""
+        if variation > seuil:
+            verdict = "  RÉGRESSION"
+            regressions.append(nom)
+        print(f"{nom:<24} {avant:10.2f} µs -> {apres:10.2f} µs  {100 * variation:+6.1f} %{verdict}")
+    return regressions
+
+
+# Programme principal
+# ==============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mesures de performance de la génération des histoires")
+    parser.add_argument("--sortie", "-o",
+                        metavar="fichier",
+                        help="Fichier JSON dans lequel écrire les résultats")
+    parser.add_argument("--reference", "-r",
+                        metavar="fichier",
+                        help="Résultats JSON de référence auxquels comparer")
+    parser.add_argument("--seuil",
+                        type=float, default=0.10,
+                        help="Ralentissement toléré par rapport à la référence (default: 0.10)")
+    parser.add_argument("--statistique",
+                        choices=["min", "mediane"], default="min",
+                        help="Durée comparée à la référence : la plus courte des tours, ou leur médiane "
+                             "(default: min)")
+    parser.add_argument("--graine", "-s",
+                        type=int, default=42,
+                        help="Graine du générateur aléatoire (default: 42)")
+    parser.add_argument("--tours", "-n",
+                        type=int, default=15,
+                        help="Nombre de tours chronométrés par mesure (default: 15)")
+    parser.add_argument("--duree-tour",
+                        type=float, default=0.02, metavar="S",
+                        help="Durée visée d'un tour, en secondes (default: 0.02)")
+    parser.add_argument("--echauffement",
+                        type=float, default=0.1, metavar="S",
+                        help="Durée des appels à vide avant chaque mesure (default: 0.1)")
+    parser.add_argument("--filtre", "-k",
+                        metavar="texte",
+                        help="Ne fait que les mesures dont le nom contient ce texte")
+    args = parser.parse_args()
+
+    resultats = {
+        "version": VERSION,
+        "python": platform.python_version(),
+        "plateforme": platform.platform(),
+        "graine": args.graine,
+    }
+    fonctions = {nom: fonction for nom, fonction in fonctions_mesurees(args.graine).items()
+                 if not args.filtre or args.filtre in nom}
+    resultats["mesures"] = chronometrer(fonctions, args.graine, args.tours, args.duree_tour, args.echauffement)
+    for nom, mesure in resultats["mesures"].items():
+        print(f"{nom:<24} {mesure['mediane_us']:10.2f} µs  (min {mesure['min_us']:.2f}, "
+              f"écart type {mesure['ecart_type_us']:.2f}, {mesure['appels']} appels x {mesure['tours']} tours)")
+
+    if args.sortie:
+        with open(args.sortie, "w") as sortie:
+            json.dump(resultats, sortie, indent=2)
+            sortie.write("\n")
+
+    if args.reference:
+        with open(args.reference) as fichier:
+            reference = json.load(fichier)
+        if reference.get("version") != VERSION:
+            sys.exit(f"Référence au format {reference.get('version')}, {VERSION} attendu")
+        if reference.get("python") != resultats["python"]:
+            print(f"Attention : référence mesurée avec Python {reference.get('python')}")
+        print()
+        regressions = comparer(resultats, reference, args.seuil, args.statistique + "_us")
+        if regressions:
+            print(f"\n{len(regressions)} régression(s) au-delà de {100 * args.seuil:.0f} % : {', '.join(regressions)}")
+            sys.exit(1)
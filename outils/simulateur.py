@@ -0,0 +1,154 @@
+#!/usr/bin/python3
+# coding: utf-8
+
+"""
+Simulateur de carte Arduino sur un pseudo-terminal
+
+Le simulateur ouvre un pseudo-terminal et s'y comporte comme le croquis
+petite-fabrique-a-histoires.ino (voir fabrique/simulation.py) : il annonce la
+fin de son démarrage, simule des appuis, décode les paquets de
+l'ordinateur, répond ACK ou NAK et affiche les trames reçues. Il permet
+d'essayer le protocole sans carte, et d'y injecter des erreurs de
+transmission pour vérifier les renvois. Avec --croquis texte, il se comporte
+comme le croquis d'origine, qui lisait l'histoire avec Serial.readString().
+
+Le temps de transmission est simulé à la vitesse de la liaison, négociée
+comme sur la carte : --vitesses compare le délai entre l'appui et la première
+trame affichée à plusieurs vitesses.
+
+Usage :
+python outils/simulateur.py [--appuis N] [--erreurs P] [--lancer [-- options]]
+python outils/simulateur.py --lancer --vitesses 9600,115200 --appuis 1 --trames 5
+
+Sans --lancer, le nom du pseudo-terminal est affiché et il suffit de lancer
+python histoires.py --port <pseudo-terminal> dans un autre terminal.
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import argparse
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fabrique import grammaire_compilee
+from fabrique.dictionnaire import deriver_dictionnaire
+from fabrique.ecran import LARGEUR_ECRAN
+from fabrique.protocole import TRAME, duree_transmission, paquet
+from fabrique.simulation import CarteSimulee, simuler
+
+
+# Moulinettes
+# ==============================================================================
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def lancer(ports, options):
+    '''
+    Lance histoires.py sur des cartes simulees
+
+    Parametres
+    ----------
+    ports: list
+           Ports des cartes simulees
+    options: list
+             Options supplementaires de histoires.py
+
+    Retourne
+    --------
+    processus: subprocess.Popen
+               Processus de histoires.py
+    '''
+
+    arguments = [sys.executable, os.path.join(RACINE, "histoires.py")]
+    for port in ports:
+        arguments += ["--port", port]
+    return subprocess.Popen(arguments + options)
+
+
+def resume(carte):
+    texte = (f"{carte.vitesse} bauds : {carte.histoires} histoires, {carte.trames} trames, "
+             f"{carte.octets} octets reçus, {carte.refuses} paquets refusés, {carte.abandons} histoires abandonnées")
+    if carte.latences:
+        texte += (f"\n  délai entre l'appui et la première trame : "
+                  f"min {1000 * min(carte.latences):.1f} ms, max {1000 * max(carte.latences):.1f} ms")
+    trame = duree_transmission(len(paquet(TRAME, bytes(LARGEUR_ECRAN))), carte.vitesse)
+    return texte + f"\n  transmission d'un paquet de trame : {1000 * trame:.2f} ms"
+
+
+# Programme principal
+# ==============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulateur de carte Arduino sur un pseudo-terminal")
+    parser.add_argument("--appuis", "-n",
+                        type=int, default=3, metavar="N",
+                        help="Nombre d'appuis simulés (default: 3)")
+    parser.add_argument("--intervalle",
+                        type=float, default=1.0, metavar="SECONDES",
+                        help="Durée entre la fin d'une histoire et l'appui suivant (default: 1.0)")
+    parser.add_argument("--croquis",
+                        choices=["paquets", "texte"], default="paquets",
+                        help="Croquis simulé : l'actuel, ou celui d'origine qui lit le texte brut "
+                             "avec Serial.readString() (default: paquets)")
+    parser.add_argument("--erreurs",
+                        type=float, default=0.0, metavar="P",
+                        help="Probabilité d'abîmer un bloc d'octets reçus (default: 0)")
+    parser.add_argument("--graine",
+                        type=int, default=None,
+                        help="Graine des erreurs injectées")
+    parser.add_argument("--sans-dictionnaire",
+                        action="store_true",
+                        help="Simule un croquis qui n'a pas le dictionnaire de la grammaire")
+    parser.add_argument("--trames",
+                        type=int, metavar="N",
+                        help="Arrête la simulation après N trames affichées")
+    parser.add_argument("--lancer",
+                        action="store_true",
+                        help="Lance histoires.py sur le pseudo-terminal, avec les options données après --")
+    parser.add_argument("--vitesses",
+                        metavar="BAUDS,...",
+                        help="Avec --lancer, compare les vitesses données en relançant histoires.py pour chacune")
+    parser.add_argument("options",
+                        nargs=argparse.REMAINDER,
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    options = args.options[1:] if args.options[:1] == ["--"] else args.options
+    if args.croquis == "texte":
+        options = ["--affichage", "texte"] + options
+    if args.vitesses:
+        essais = [options + ["--baud", vitesse] for vitesse in args.vitesses.split(",")]
+    else:
+        essais = [options]
+
+    # Le croquis simulé a le dictionnaire de la grammaire intégrée, comme
+    # dictionnaire.h tant qu'il est à jour
+    dictionnaire = None if args.sans_dictionnaire else deriver_dictionnaire(grammaire_compilee())
+
+    cartes = []
+    for essai in essais:
+        carte = CarteSimulee(args.croquis, args.appuis, lambda: args.intervalle, dictionnaire=dictionnaire,
+                             erreurs=args.erreurs, graine=args.graine, journal=print)
+        processus = lancer([carte.port], essai) if args.lancer else None
+        if processus is None:
+            print(f"Carte simulée sur {carte.port}")
+
+        try:
+            simuler([carte], trames=args.trames)
+            cartes.append(carte)
+        except KeyboardInterrupt:
+            break
+        finally:
+            if processus is not None:
+                processus.terminate()
+                processus.wait()
+            carte.fermer()
+
+    for carte in cartes:
+        print(resume(carte))
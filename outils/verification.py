@@ -0,0 +1,229 @@
+#!/usr/bin/python3
+# coding: utf-8
+
+"""
+Vérification des équivalences dont dépend la fabrique
+
+Les optimisations de la génération promettent de ne rien changer aux
+histoires. Ce programme le vérifie, avec des graines fixes, en comparant
+chaque version optimisée à la version d'origine :
+
+- developper : GrammaireCompilee.developper() donne, pour une même graine, le
+  même texte que generation(), l'expansion récursive d'origine, pour chaque
+  règle de la grammaire.
+- corrections : corrections() donne le même résultat que l'enchaînement de
+  re.sub() d'origine, pour des histoires tirées et des cas limites.
+- workers : ecrire_lot() écrit le même lot quel que soit le nombre de
+  processus, en tirage aléatoire, uniforme ou numéroté (--debut).
+
+Le programme se termine avec le code 1 si une vérification échoue, en
+affichant les premiers écarts trouvés. À relancer après toute modification de
+la grammaire ou du moteur.
+
+Usage :
+python outils/verification.py [--nombre N] [--graine G] [--grammaire fichier]
+python outils/verification.py developper
+"""
+
+
+# Bibliothèques
+# ==============================================================================
+
+import argparse
+import io
+import os
+import random
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fabrique import choisir_grammaire, corrections, ecrire_lot, generation, grammaire_compilee, grammaire_source
+from fabrique.lot import TAILLE_TRANCHE
+
+
+# Moulinettes
+# ==============================================================================
+
+# Nombre maximal d'écarts affichés par vérification
+ECARTS_AFFICHES = 5
+
+
+def verifier_developper(nombre, graine):
+    '''
+    Compare developper() a generation() pour chaque regle de la grammaire
+
+    Parametres
+    ----------
+    nombre: int
+            Nombre de graines essayees par regle
+    graine: int
+            Premiere graine
+
+    Retourne
+    --------
+    ecarts: list
+            Descriptions des textes differents
+    '''
+
+    source = grammaire_source()
+    grammaire = grammaire_compilee()
+
+    ecarts = []
+    for regle in source:
+        for g in range(graine, graine + nombre):
+            random.seed(g)
+            attendu = generation(source, regle)
+            random.seed(g)
+            obtenu = grammaire.developper(regle)
+            # Les lots tirent avec leur propre générateur
+            obtenu_rng = grammaire.developper(regle, random.Random(g).choice)
+            if obtenu != attendu or obtenu_rng != attendu:
+                ecarts.append(f"{regle}, graine {g} : {attendu!r} != {obtenu!r}")
+    return ecarts
+
+
+def corrections_origine(texte):
+    # corrections() d'origine, avant son passage à str.replace
+    texte = re.sub("' ", "'", texte)
+    texte = re.sub(" ,", ",", texte)
+    texte = re.sub(r" \.", ".", texte)
+    texte = re.sub(r"$", ".", texte)
+
+    tokens = list(texte)
+    tokens[0] = tokens[0].capitalize()
+
+    histoire = ''.join(tokens)
+
+    return histoire.encode()
+
+
+# Textes où les deux versions pourraient diverger : fin de ligne, motifs
+# collés ou répétés, première lettre accentuée ou non alphabétique
+CAS_LIMITES = ["", "a", ".", " ", "\n", "fin\n", "a\nb\n", "l' arbre , la mer .", "' ' , , . .",
+               "  ,  .", "x .\n", "élan", "ßa", "ǆemal", "1 jour", "aujourd' hui .\n\n"]
+
+
+def verifier_corrections(nombre, graine):
+    '''
+    Compare corrections() a la version d'origine
+
+    Parametres
+    ----------
+    nombre: int
+            Nombre de textes tires avec developper()
+    graine: int
+            Graine du tirage
+
+    Retourne
+    --------
+    ecarts: list
+            Descriptions des histoires differentes
+    '''
+
+    grammaire = grammaire_compilee()
+    choix = random.Random(graine).choice
+    textes = CAS_LIMITES + [grammaire.developper("AVENTURES", choix) for _ in range(nombre)]
+
+    ecarts = []
+    for texte in textes:
+        attendu = corrections_origine(texte)
+        obtenu = corrections(texte)
+        if obtenu != attendu:
+            ecarts.append(f"{texte!r} : {attendu!r} != {obtenu!r}")
+    return ecarts
+
+
+# Nombres de processus comparés au lot écrit par un seul (0 : un par cœur)
+WORKERS = [2, 3, 0]
+
+
+def verifier_workers(nombre, graine):
+    '''
+    Compare les lots ecrits par un et par plusieurs processus
+
+    Parametres
+    ----------
+    nombre: int
+            Nombre d'histoires ajoutees a deux tranches entieres, pour
+            que le lot ait plusieurs tranches dont une incomplete
+    graine: int
+            Graine du lot
+
+    Retourne
+    --------
+    ecarts: list
+            Descriptions des lots differents
+    '''
+
+    n = 2 * TAILLE_TRANCHE + nombre
+    # Une grammaire en fichier peut avoir moins d'histoires numérotées
+    numerotees = max(0, min(n, grammaire_compilee().compter() - graine))
+    modes = {
+        "aléatoire": (n, dict(seed=graine)),
+        "uniforme": (n, dict(seed=graine, uniforme=True)),
+        "numéroté": (numerotees, dict(debut=graine)),
+    }
+
+    ecarts = []
+    for mode, (taille, options) in modes.items():
+        lots = {}
+        for workers in [1] + WORKERS:
+            sortie = io.BytesIO()
+            ecrire_lot(taille, sortie, workers=workers, **options)
+            lots[workers] = sortie.getvalue()
+        lignes = lots[1].count(b"\n")
+        if lignes != taille:
+            ecarts.append(f"lot {mode} : {lignes} histoires au lieu de {taille}")
+        for workers in WORKERS:
+            if lots[workers] != lots[1]:
+                ecarts.append(f"lot {mode} : --workers {workers} donne un autre lot que --workers 1")
+    return ecarts
+
+
+# Nom -> (fonction, description)
+VERIFICATIONS = {
+    "developper": (verifier_developper, "developper() et generation() donnent les mêmes textes"),
+    "corrections": (verifier_corrections, "corrections() et l'enchaînement de re.sub() d'origine concordent"),
+    "workers": (verifier_workers, "ecrire_lot() écrit le même lot quel que soit le nombre de processus"),
+}
+
+
+# Programme principal
+# ==============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vérification des équivalences de la fabrique")
+    parser.add_argument("verifications",
+                        nargs="*", metavar="verification",
+                        help=f"Vérifications à faire, parmi {', '.join(VERIFICATIONS)} (default: toutes)")
+    parser.add_argument("--nombre", "-n",
+                        type=int, default=1000, metavar="N",
+                        help="Nombre de graines essayées (default: 1000)")
+    parser.add_argument("--graine", "-s",
+                        type=int, default=0, metavar="G",
+                        help="Première graine (default: 0)")
+    parser.add_argument("--grammaire", "-g",
+                        action="append", metavar="fichier",
+                        help="Fichier de grammaire à utiliser à la place de la grammaire intégrée")
+    args = parser.parse_args()
+
+    inconnues = [nom for nom in args.verifications if nom not in VERIFICATIONS]
+    if inconnues:
+        parser.error(f"vérifications inconnues : {', '.join(inconnues)}")
+
+    if args.grammaire:
+        choisir_grammaire(args.grammaire)
+
+    echecs = 0
+    for nom in args.verifications or VERIFICATIONS:
+        verifier, description = VERIFICATIONS[nom]
+        ecarts = verifier(args.nombre, args.graine)
+        print(f"{nom} : {'ÉCHEC' if ecarts else 'ok'} ({description})")
+        for ecart in ecarts[:ECARTS_AFFICHES]:
+            print(f"    {ecart}")
+        if len(ecarts) > ECARTS_AFFICHES:
+            print(f"    ... et {len(ecarts) - ECARTS_AFFICHES} autres écarts")
+        echecs += bool(ecarts)
+
+    sys.exit(1 if echecs else 0)
@@ -1,89 +1,311 @@
-/*
- *  La petite fabrique à histoires
- *  Génération d'histoires très courtes affichées sur une écran relié à une Arduino
- *
- *  Dépôt Gitlab : https://gitlab.com/AtelierRaptoria/petite-fabrique-a-histoires
- *
- *  Matériel :
- *  - 1 carte Arduino
- *  - 1 breadboard
- *  - 1 écran LCD
- *  - 1 potentiomère
- *  - 1 bouton poussoir
- *  - 1 résistance 10kΩ
- *  - 1 résistance 220Ω
- *  - câbles
- *
- *  Installation des dépendances Python :
- *  pip install -r requirements.txt
- *
- *  Usage :
- *  1. Câbler vote Arduino comme indiqué sur le schéma
- *  2. Compiler et téléverser le script petite-fabrique-a-histoires.ino sur votre Arduino
- *  3. Lancer le script histoires.py --port <port de votre Arduino>
- *  4. Appuyer sur le bouton poussoir
- *  5. Lire les histoires 😁
-*/
-
-// Bibliothèques
-// =============================================================================
-
-#include <LiquidCrystal.h>
-
-
-// Variables
-// =============================================================================
-
-const int rs = 12, en = 11, d4 = 5, d5 = 4, d6 = 3, d7 = 2;
-LiquidCrystal lcd(rs, en, d4, d5, d6, d7);
-int buttonPin = 8;
-int poussoir = 0;
-
-
-// Moulinettes
-// =============================================================================
-
-void setup() {
-    Serial.begin(9600);
-    pinMode(buttonPin, INPUT);
-    lcd.begin(16, 1);
-}
-
-void loop() {
-    lcd.setCursor(0, 1);
-    poussoir = digitalRead(buttonPin);
-
-    if(poussoir == HIGH) {
-        Serial.write(1);
-        defilementTexte(Serial.readString());
-        delay(2000);
-    } else {
-        Serial.write(0);
-        lcd.clear();
-    }
-
-    delay(100);
-}
-
-void defilementTexte(String texte) {
-    int longueur = texte.length();
-    int lcdWidth = 16;
-
-    if(longueur < lcdWidth) {
-        lcd.print(texte);
-    } else {
-        int idx;
-        for(idx = 0; idx < lcdWidth; idx++) {
-            lcd.print(texte[idx]);
-        }
-
-        delay(1000);
-
-        while(idx < longueur) {
-            lcd.scrollDisplayLeft();
-            lcd.print(texte[idx]);
-            idx = idx + 1;
-            delay(200);
-        }
-    }
-}
+/*
+ *  La petite fabrique à histoires
+ *  Génération d'histoires très courtes affichées sur une écran relié à une Arduino
+ *
+ *  Dépôt Gitlab : https://gitlab.com/AtelierRaptoria/petite-fabrique-a-histoires
+ *
+ *  Matériel :
+ *  - 1 carte Arduino
+ *  - 1 breadboard
+ *  - 1 écran LCD
+ *  - 1 potentiomère
+ *  - 1 bouton poussoir
+ *  - 1 résistance 10kΩ
+ *  - 1 résistance 220Ω
+ *  - câbles
+ *
+ *  Installation des dépendances Python :
+ *  pip install -r requirements.txt
+ *
+ *  Usage :
+ *  1. Câbler vote Arduino comme indiqué sur le schéma
+ *  2. Compiler et téléverser le script petite-fabrique-a-histoires.ino sur votre Arduino
+ *  3. Lancer le script histoires.py --port <port de votre Arduino>
+ *  4. Appuyer sur le bouton poussoir
+ *  5. Lire les histoires 😁
+*/
+
+// Bibliothèques
+// =============================================================================
+
+#include <LiquidCrystal.h>
+
+// Dictionnaire des histoires codées, généré par
+// python histoires.py --dictionnaire dictionnaire.h
+#include "dictionnaire.h"
+
+
+// Variables
+// =============================================================================
+
+const int rs = 12, en = 11, d4 = 5, d5 = 4, d6 = 3, d7 = 2;
+LiquidCrystal lcd(rs, en, d4, d5, d6, d7);
+int buttonPin = 8;
+int poussoir = 0;
+
+// Protocole série (voir fabrique/protocole.py) : chaque message de
+// l'ordinateur est un paquet STX | type | longueur | charge | CRC-8, auquel
+// la carte répond par ACK s'il est intact, par NAK sinon
+const byte STX = 0x02, ACK = 0x06, NAK = 0x15;
+// Dans l'autre sens, la carte n'envoie que la fin de son démarrage et les
+// appuis sur le bouton
+const byte REPOS = 0x00, APPUI = 0x01;
+const byte TRAME = 'T', FIN = 'F', VITESSE = 'V', HISTOIRE = 'H', DICTIONNAIRE = 'D';
+
+// La liaison démarre à 9600 bauds ; histoires.py demande ensuite une vitesse
+// plus élevée (paquet VITESSE)
+const long vitesseInitiale = 9600;
+long vitesse = vitesseInitiale;
+
+// Une trame : les 16 caractères affichés
+const int lcdWidth = 16;
+byte charge[lcdWidth];
+
+// Une histoire codée avec le dictionnaire, reçue d'un seul paquet
+const int tailleHistoireMax = 128;
+byte histoire[tailleHistoireMax];
+
+
+// Moulinettes
+// =============================================================================
+
+void setup() {
+    Serial.begin(vitesseInitiale);
+    // Les trames arrivent au rythme de l'affichage : la fin d'une histoire
+    // reste deux secondes à l'écran avant la trame suivante
+    Serial.setTimeout(5000);
+    pinMode(buttonPin, INPUT);
+    lcd.begin(16, 1);
+    // histoires.py attend cet octet pour savoir que la carte a redémarré
+    // avant de lui envoyer des paquets
+    Serial.write(REPOS);
+}
+
+void loop() {
+    // Paquets reçus hors d'une histoire : changement de vitesse, ou renvoi
+    // d'un paquet dont l'acquittement s'est perdu. Le reste est ignoré, pour
+    // ne pas être pris pour le début de l'histoire suivante.
+    while(Serial.available() > 0) {
+        if(Serial.peek() != STX) {
+            Serial.read();
+            continue;
+        }
+        int longueur = 0;
+        if(lirePaquet(&longueur) == VITESSE && longueur == 4) {
+            changerVitesse();
+        }
+    }
+
+    lcd.setCursor(0, 1);
+    poussoir = digitalRead(buttonPin);
+
+    // Rien n'est envoyé tant que le bouton est relâché
+    if(poussoir == HIGH) {
+        Serial.write(APPUI);
+        afficherTrames();
+    } else {
+        lcd.clear();
+    }
+
+    delay(100);
+}
+
+byte crc8(byte crc, byte octet) {
+    // CRC-8, polynôme 0x07, calculé octet par octet à la réception
+    crc ^= octet;
+    for(int bit = 0; bit < 8; bit++) {
+        crc = (crc & 0x80) ? (crc << 1) ^ 0x07 : crc << 1;
+    }
+    return crc;
+}
+
+int lireOctet() {
+    // -1 si rien n'arrive avant le délai de Serial.setTimeout()
+    byte octet;
+    if(Serial.readBytes(&octet, 1) != 1) {
+        return -1;
+    }
+    return octet;
+}
+
+int lirePaquet(int *longueur) {
+    // Renvoie le type du paquet reçu, 0 s'il est abîmé (NAK envoyé), -1 si
+    // rien n'arrive. La longueur étant connue, le paquet est traité dès son
+    // dernier octet, sans attendre la fin du délai de lecture.
+    int octet;
+    do {
+        octet = lireOctet();
+        if(octet < 0) {
+            return -1;
+        }
+    } while(octet != STX);
+
+    int type = lireOctet();
+    int taille = lireOctet();
+    if(type < 0 || taille < 0) {
+        return -1;
+    }
+    byte *tampon = type == HISTOIRE ? histoire : charge;
+    if(taille > (type == HISTOIRE ? tailleHistoireMax : lcdWidth)) {
+        // Longueur abîmée : lire la charge avalerait les paquets suivants
+        Serial.write(NAK);
+        return 0;
+    }
+    byte crc = crc8(crc8(0, type), taille);
+
+    for(int idx = 0; idx < taille; idx++) {
+        octet = lireOctet();
+        if(octet < 0) {
+            return -1;
+        }
+        tampon[idx] = octet;
+        crc = crc8(crc, octet);
+    }
+
+    octet = lireOctet();
+    if(octet < 0) {
+        return -1;
+    }
+    // Un autre dictionnaire que le nôtre est refusé comme un paquet abîmé :
+    // histoires.py enverra alors des trames
+    bool dictionnaireConnu = taille == 2 && (charge[0] | (unsigned int)charge[1] << 8) == idDictionnaire;
+    if(octet != crc || (type == DICTIONNAIRE && !dictionnaireConnu)) {
+        Serial.write(NAK);
+        return 0;
+    }
+
+    Serial.write(ACK);
+    *longueur = taille;
+    return type;
+}
+
+void changerVitesse() {
+    long demandee = (long)charge[0] | (long)charge[1] << 8 | (long)charge[2] << 16 | (long)charge[3] << 24;
+    if(demandee == vitesse) {
+        // Renvoi d'une confirmation dont l'acquittement s'est perdu
+        return;
+    }
+
+    // L'acquittement doit partir à l'ancienne vitesse avant de changer
+    Serial.flush();
+    Serial.end();
+    Serial.begin(demandee);
+
+    // histoires.py confirme en renvoyant le paquet à la nouvelle vitesse ;
+    // sans confirmation dans la seconde, on revient à l'ancienne
+    Serial.setTimeout(250);
+    unsigned long debut = millis();
+    int longueur = 0;
+    bool confirmee = false;
+    while(!confirmee && millis() - debut < 1000) {
+        confirmee = lirePaquet(&longueur) == VITESSE;
+    }
+    Serial.setTimeout(5000);
+
+    if(confirmee) {
+        vitesse = demandee;
+    } else {
+        Serial.end();
+        Serial.begin(vitesse);
+    }
+}
+
+void afficherTrames() {
+    // L'histoire est découpée et convertie pour l'écran par histoires.py, qui
+    // envoie chaque trame au moment de l'afficher : il n'y a qu'à l'écrire,
+    // sans garder l'histoire en mémoire. Un paquet FIN termine l'histoire.
+    // Une histoire codée arrive d'un seul paquet et défile ici.
+    int longueur = 0;
+    while(true) {
+        int type = lirePaquet(&longueur);
+        if(type < 0 || type == FIN) {
+            return;
+        }
+        if(type == HISTOIRE) {
+            afficherHistoire(longueur);
+            return;
+        }
+        if(type != TRAME) {
+            // Paquet abîmé : l'ordinateur le renvoie
+            continue;
+        }
+
+        lcd.setCursor(0, 0);
+        for(int idx = 0; idx < longueur; idx++) {
+            lcd.write(charge[idx]);
+        }
+    }
+}
+
+int indiceMot(byte code) {
+    // Mot du dictionnaire désigné par un code (CODES dans
+    // fabrique/dictionnaire.py), -1 pour un caractère ordinaire
+    int indice = -1;
+    if(code >= 0x80 && code <= 0xDE) {
+        indice = code - 0x80;
+    } else if(code >= 0x01 && code <= 0x1F) {
+        indice = 0xDF - 0x80 + code - 0x01;
+    }
+    return indice < nbMots ? indice : -1;
+}
+
+int longueurHistoire(int taille) {
+    int longueur = 0;
+    for(int idx = 0; idx < taille; idx++) {
+        int indice = indiceMot(histoire[idx]);
+        if(indice < 0) {
+            longueur++;
+        } else {
+            longueur += pgm_read_word(&debutsMots[indice + 1]) - pgm_read_word(&debutsMots[indice]);
+        }
+    }
+    return longueur;
+}
+
+void ecrireFenetre(int taille, int debut) {
+    // Écrit les lcdWidth caractères de l'histoire développée à partir de
+    // debut, en développant les mots à la volée depuis la mémoire flash
+    lcd.setCursor(0, 0);
+    int position = 0;
+    int ecrits = 0;
+    for(int idx = 0; idx < taille && ecrits < lcdWidth; idx++) {
+        int indice = indiceMot(histoire[idx]);
+        if(indice < 0) {
+            if(position++ >= debut) {
+                lcd.write(histoire[idx]);
+                ecrits++;
+            }
+            continue;
+        }
+        unsigned int fin = pgm_read_word(&debutsMots[indice + 1]);
+        for(unsigned int k = pgm_read_word(&debutsMots[indice]); k < fin && ecrits < lcdWidth; k++) {
+            if(position++ >= debut) {
+                lcd.write(pgm_read_byte(&texteMots[k]));
+                ecrits++;
+            }
+        }
+    }
+    while(ecrits < lcdWidth) {
+        lcd.write(' ');
+        ecrits++;
+    }
+}
+
+void afficherHistoire(int taille) {
+    // Même rythme que les trames de histoires.py (fabrique/ecran.py) : le
+    // début reste une seconde, le texte avance toutes les 200 ms, et la fin
+    // reste deux secondes
+    int longueur = longueurHistoire(taille);
+    ecrireFenetre(taille, 0);
+    if(longueur <= lcdWidth) {
+        delay(2000);
+        return;
+    }
+
+    delay(1000);
+    for(int debut = 1; debut <= longueur - lcdWidth; debut++) {
+        ecrireFenetre(taille, debut);
+        delay(200);
+    }
+    delay(2000);
+}